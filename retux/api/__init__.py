@@ -1,4 +1,8 @@
+from .codec import *  # noqa
 from .error import *  # noqa
+from .etf import *  # noqa
 from .gateway import *  # noqa
 from .http import *  # noqa
+from .session import *  # noqa
+from .shard import *  # noqa
 from .events import *  # noqa
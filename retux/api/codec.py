@@ -0,0 +1,182 @@
+from importlib import import_module
+from json import dumps, loads
+from logging import getLogger
+from typing import Any, Protocol
+
+from ..const import MISSING, NotNeeded
+
+logger = getLogger(__name__)
+
+__all__ = ("_Codec", "JSONCodec", "OrjsonCodec", "MsgspecCodec", "get_codec")
+
+
+class _Codec(Protocol):
+    """
+    Represents a codec for the payloads of the Gateway and REST API.
+
+    ---
+
+    A codec is anything able to turn a payload into Python objects
+    and back again. Codecs may be given to both `GatewayClient` and
+    `HTTPClient` in order to change how their payloads are handled.
+
+    `dumps()` gives back a `str` for text formats such as JSON, and
+    `bytes` for binary formats such as ETF. `dumpb()` always gives
+    back `bytes`.
+    """
+
+    name: str
+    """The name of the codec."""
+
+    def loads(self, data: str | bytes) -> Any:
+        ...
+
+    def dumps(self, obj: Any) -> str | bytes:
+        ...
+
+    def dumpb(self, obj: Any) -> bytes:
+        ...
+
+
+class JSONCodec:
+    """Represents a JSON codec using the standard library. This is always available."""
+
+    __slots__ = ()
+    name: str = "json"
+    """The name of the codec."""
+
+    def loads(self, data: str | bytes) -> Any:
+        """
+        Decodes a payload.
+
+        Parameters
+        ----------
+        data : `str`, `bytes`
+            The payload to decode.
+
+        Returns
+        -------
+        `typing.Any`
+            The decoded payload.
+        """
+        return loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        """
+        Encodes a payload as a string.
+
+        Parameters
+        ----------
+        obj : `typing.Any`
+            The payload to encode.
+
+        Returns
+        -------
+        `str`
+            The encoded payload.
+        """
+        return dumps(obj, separators=(",", ":"))
+
+    def dumpb(self, obj: Any) -> bytes:
+        """
+        Encodes a payload as bytes.
+
+        Parameters
+        ----------
+        obj : `typing.Any`
+            The payload to encode.
+
+        Returns
+        -------
+        `bytes`
+            The encoded payload.
+        """
+        return self.dumps(obj).encode()
+
+
+class OrjsonCodec(JSONCodec):
+    """Represents a JSON codec using `orjson`. This requires `orjson` to be installed."""
+
+    __slots__ = ("_orjson",)
+    name: str = "orjson"
+    """The name of the codec."""
+
+    def __init__(self):
+        self._orjson = import_module("orjson")
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._orjson.loads(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._orjson.dumps(obj).decode()
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+
+class MsgspecCodec(JSONCodec):
+    """Represents a JSON codec using `msgspec`. This requires `msgspec` to be installed."""
+
+    __slots__ = ("_encoder", "_decoder")
+    name: str = "msgspec"
+    """The name of the codec."""
+
+    def __init__(self):
+        json = import_module("msgspec.json")
+        self._encoder = json.Encoder()
+        self._decoder = json.Decoder()
+
+    def loads(self, data: str | bytes) -> Any:
+        return self._decoder.decode(data)
+
+    def dumps(self, obj: Any) -> str:
+        return self._encoder.encode(obj).decode()
+
+    def dumpb(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+_CODECS: dict[str, type[JSONCodec]] = {
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec,
+    JSONCodec.name: JSONCodec,
+}
+"""The codecs available, in the order they are preferred."""
+
+
+def get_codec(codec: NotNeeded[str | _Codec] = MISSING) -> _Codec:
+    """
+    Gets a codec for payloads.
+
+    ---
+
+    When no codec is given, the fastest one installed is picked
+    for you. `orjson` is preferred, followed by `msgspec` and then
+    the standard library.
+
+    ---
+
+    Parameters
+    ----------
+    codec : `str`, `_Codec`, optional
+        The name of the codec to use, or the codec itself.
+
+    Returns
+    -------
+    `_Codec`
+        The codec to use.
+
+    Raises: `ValueError`, `ImportError`
+    """
+    if codec is MISSING:
+        for name, cls in _CODECS.items():
+            try:
+                return cls()
+            except ImportError:
+                logger.debug(f"The {name} codec is not installed, trying the next one.")
+    if not isinstance(codec, str):
+        return codec
+    if codec not in _CODECS:
+        raise ValueError(f"{codec} is not a known codec. Expected one of {', '.join(_CODECS)}.")
+
+    return _CODECS[codec]()
@@ -9,8 +9,10 @@ class HTTPException(Exception):
     """The error code to correlate the exception to."""
     severity: int
     """The severity level to correlate the exception to. This is treated for logging purposes."""
+    status: int | None
+    """The HTTP status code of the response, if one was given back."""
 
-    def __init__(self, payload: dict, severity: int = 0):
+    def __init__(self, payload: dict, severity: int = 0, status: int | None = None):
         """
         Creates a new exception for HTTP requests.
 
@@ -20,11 +22,14 @@ class HTTPException(Exception):
             The error trace stack of the exception.
         severity : `int`, optional
             The severity level to correlate the exception to. This is treated for logging purposes.
+        status : `int`, optional
+            The HTTP status code of the response, if one was given back.
         """
         self.payload = payload
         self.message = self.payload.get("message")
         self.code = self.payload.get("code")
         self.severity = severity
+        self.status = status
 
         self._parse()
 
@@ -49,3 +54,27 @@ class HTTPException(Exception):
         Raises: `HTTPException`
         """
         super().__init__(content)
+
+
+class GatewayException(Exception):
+    """An error occured with the connection to the Gateway that could not be recovered from."""
+
+    code: int | None
+    """The close code the connection was closed with, if any."""
+    message: str
+    """The message body of the exception."""
+
+    def __init__(self, code: int | None, message: str):
+        """
+        Creates a new exception for Gateway connections.
+
+        Parameters
+        ----------
+        code : `int`, optional
+            The close code the connection was closed with, if any.
+        message : `str`
+            The message body of the exception.
+        """
+        self.code = code
+        self.message = message
+        super().__init__(f"{code} -> {message}")
@@ -0,0 +1,289 @@
+from struct import Struct
+from typing import Any, Callable
+from zlib import decompress
+
+__all__ = ("ETFCodec",)
+
+_VERSION = 131
+"""The version byte every ETF payload starts with."""
+
+_NEW_FLOAT_EXT = 70
+_COMPRESSED = 80
+_SMALL_INTEGER_EXT = 97
+_INTEGER_EXT = 98
+_FLOAT_EXT = 99
+_ATOM_EXT = 100
+_SMALL_TUPLE_EXT = 104
+_LARGE_TUPLE_EXT = 105
+_NIL_EXT = 106
+_STRING_EXT = 107
+_LIST_EXT = 108
+_BINARY_EXT = 109
+_SMALL_BIG_EXT = 110
+_LARGE_BIG_EXT = 111
+_SMALL_ATOM_EXT = 115
+_MAP_EXT = 116
+_ATOM_UTF8_EXT = 118
+_SMALL_ATOM_UTF8_EXT = 119
+
+_U16 = Struct(">H")
+_U32 = Struct(">I")
+_I32 = Struct(">i")
+_F64 = Struct(">d")
+
+_ATOMS: dict[str, Any] = {"nil": None, "true": True, "false": False}
+"""The atoms with a Python equivalent. Every other atom is given back as a `str`."""
+
+
+def _atom(data: bytes, pos: int, length: int) -> tuple[Any, int]:
+    name = data[pos : pos + length].decode()
+    return _ATOMS.get(name, name), pos + length
+
+
+def _binary(data: bytes, pos: int, length: int) -> tuple[str | bytes, int]:
+    raw = data[pos : pos + length]
+
+    try:
+        return raw.decode(), pos + length
+    except UnicodeDecodeError:
+        return raw, pos + length
+
+
+def _big(data: bytes, pos: int, length: int) -> tuple[int, int]:
+    sign = data[pos]
+    value = int.from_bytes(data[pos + 1 : pos + 1 + length], "little")
+    return -value if sign else value, pos + 1 + length
+
+
+def _sequence(data: bytes, pos: int, length: int) -> tuple[list, int]:
+    items = []
+    append = items.append
+
+    for _ in range(length):
+        tag = data[pos]
+        item, pos = _DECODERS[tag](data, pos + 1)
+        append(item)
+
+    return items, pos
+
+
+def _decode_map(data: bytes, pos: int) -> tuple[dict, int]:
+    (arity,) = _U32.unpack_from(data, pos)
+    pos += 4
+    items = {}
+
+    for _ in range(arity):
+        key, pos = _DECODERS[data[pos]](data, pos + 1)
+        value, pos = _DECODERS[data[pos]](data, pos + 1)
+        items[key] = value
+
+    return items, pos
+
+
+def _decode_list(data: bytes, pos: int) -> tuple[list, int]:
+    (length,) = _U32.unpack_from(data, pos)
+    items, pos = _sequence(data, pos + 4, length)
+
+    # Proper lists always end with an empty list as their tail,
+    # which is skipped over here.
+    if data[pos] == _NIL_EXT:
+        return items, pos + 1
+
+    tail, pos = _DECODERS[data[pos]](data, pos + 1)
+    items.append(tail)
+    return items, pos
+
+
+def _decode_string(data: bytes, pos: int) -> tuple[str, int]:
+    (length,) = _U16.unpack_from(data, pos)
+    return data[pos + 2 : pos + 2 + length].decode("latin-1"), pos + 2 + length
+
+
+def _decode_float(data: bytes, pos: int) -> tuple[float, int]:
+    return float(data[pos : pos + 31].split(b"\x00", 1)[0]), pos + 31
+
+
+def _decode_compressed(data: bytes, pos: int) -> tuple[Any, int]:
+    (length,) = _U32.unpack_from(data, pos)
+    inflated = decompress(data[pos + 4 :], bufsize=length)
+    value, _ = _DECODERS[inflated[0]](inflated, 1)
+    return value, len(data)
+
+
+def _unknown(data: bytes, pos: int) -> tuple[Any, int]:
+    raise ValueError(f"Unknown ETF tag {data[pos - 1]} at position {pos - 1}.")
+
+
+_DECODERS: list[Callable[[bytes, int], tuple[Any, int]]] = [_unknown] * 256
+"""The decoders of each ETF tag, looked up by the tag itself."""
+
+_DECODERS[_SMALL_INTEGER_EXT] = lambda data, pos: (data[pos], pos + 1)
+_DECODERS[_INTEGER_EXT] = lambda data, pos: (_I32.unpack_from(data, pos)[0], pos + 4)
+_DECODERS[_NEW_FLOAT_EXT] = lambda data, pos: (_F64.unpack_from(data, pos)[0], pos + 8)
+_DECODERS[_FLOAT_EXT] = _decode_float
+_DECODERS[_ATOM_EXT] = lambda data, pos: _atom(data, pos + 2, _U16.unpack_from(data, pos)[0])
+_DECODERS[_ATOM_UTF8_EXT] = _DECODERS[_ATOM_EXT]
+_DECODERS[_SMALL_ATOM_EXT] = lambda data, pos: _atom(data, pos + 1, data[pos])
+_DECODERS[_SMALL_ATOM_UTF8_EXT] = _DECODERS[_SMALL_ATOM_EXT]
+_DECODERS[_BINARY_EXT] = lambda data, pos: _binary(data, pos + 4, _U32.unpack_from(data, pos)[0])
+_DECODERS[_SMALL_BIG_EXT] = lambda data, pos: _big(data, pos + 1, data[pos])
+_DECODERS[_LARGE_BIG_EXT] = lambda data, pos: _big(data, pos + 4, _U32.unpack_from(data, pos)[0])
+_DECODERS[_SMALL_TUPLE_EXT] = lambda data, pos: _sequence(data, pos + 1, data[pos])
+_DECODERS[_LARGE_TUPLE_EXT] = lambda data, pos: _sequence(
+    data, pos + 4, _U32.unpack_from(data, pos)[0]
+)
+_DECODERS[_NIL_EXT] = lambda data, pos: ([], pos)
+_DECODERS[_STRING_EXT] = _decode_string
+_DECODERS[_LIST_EXT] = _decode_list
+_DECODERS[_MAP_EXT] = _decode_map
+_DECODERS[_COMPRESSED] = _decode_compressed
+
+
+def _encode(obj: Any, buffer: bytearray):
+    """
+    Encodes an object into ETF.
+
+    Parameters
+    ----------
+    obj : `typing.Any`
+        The object to encode.
+    buffer : `bytearray`
+        The buffer to write the encoded object into.
+
+    Raises: `TypeError`
+    """
+    if obj is None:
+        buffer += b"w\x03nil"
+    elif obj is True:
+        buffer += b"w\x04true"
+    elif obj is False:
+        buffer += b"w\x05false"
+    elif isinstance(obj, int):
+        if 0 <= obj <= 255:
+            buffer.append(_SMALL_INTEGER_EXT)
+            buffer.append(obj)
+        elif -(2**31) <= obj < 2**31:
+            buffer.append(_INTEGER_EXT)
+            buffer += _I32.pack(obj)
+        else:
+            digits = abs(obj).to_bytes((abs(obj).bit_length() + 7) // 8, "little")
+            buffer.append(_SMALL_BIG_EXT)
+            buffer.append(len(digits))
+            buffer.append(1 if obj < 0 else 0)
+            buffer += digits
+    elif isinstance(obj, float):
+        buffer.append(_NEW_FLOAT_EXT)
+        buffer += _F64.pack(obj)
+    elif isinstance(obj, (str, bytes)):
+        raw = obj.encode() if isinstance(obj, str) else obj
+        buffer.append(_BINARY_EXT)
+        buffer += _U32.pack(len(raw))
+        buffer += raw
+    elif isinstance(obj, dict):
+        buffer.append(_MAP_EXT)
+        buffer += _U32.pack(len(obj))
+
+        for key, value in obj.items():
+            _encode(key, buffer)
+            _encode(value, buffer)
+    elif isinstance(obj, (list, tuple)):
+        if obj:
+            buffer.append(_LIST_EXT)
+            buffer += _U32.pack(len(obj))
+
+            for item in obj:
+                _encode(item, buffer)
+
+        buffer.append(_NIL_EXT)
+    else:
+        raise TypeError(f"{type(obj).__name__} cannot be encoded into ETF.")
+
+
+class ETFCodec:
+    """
+    Represents a codec for ETF, or the "External Term Format" of Erlang.
+
+    ---
+
+    ETF payloads are smaller and faster to decode than JSON ones,
+    and are used by the Gateway when `encoding` is set to `etf`.
+    Snowflakes are given back to us by Discord as integers, and
+    binaries and atoms become `str` objects so that payloads look
+    the same as they do in JSON.
+
+    ---
+
+    This codec is written entirely in Python, and does not need
+    anything else installed.
+    """
+
+    __slots__ = ()
+    name: str = "etf"
+    """The name of the codec."""
+
+    def loads(self, data: bytes) -> Any:
+        """
+        Decodes a payload.
+
+        Parameters
+        ----------
+        data : `bytes`
+            The payload to decode.
+
+        Returns
+        -------
+        `typing.Any`
+            The decoded payload.
+
+        Raises: `ValueError`
+        """
+        if not data or data[0] != _VERSION:
+            raise ValueError("The payload given is not in a known ETF version.")
+
+        value, _ = _DECODERS[data[1]](data, 2)
+        return value
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes a payload.
+
+        ---
+
+        ETF is a binary format, and so this is the same as `dumpb()`.
+        Payloads encoded by this codec are sent in binary frames.
+
+        ---
+
+        Parameters
+        ----------
+        obj : `typing.Any`
+            The payload to encode.
+
+        Returns
+        -------
+        `bytes`
+            The encoded payload.
+
+        Raises: `TypeError`
+        """
+        return self.dumpb(obj)
+
+    def dumpb(self, obj: Any) -> bytes:
+        """
+        Encodes a payload as bytes.
+
+        Parameters
+        ----------
+        obj : `typing.Any`
+            The payload to encode.
+
+        Returns
+        -------
+        `bytes`
+            The encoded payload.
+
+        Raises: `TypeError`
+        """
+        buffer = bytearray((_VERSION,))
+        _encode(obj, buffer)
+        return bytes(buffer)
@@ -2,3 +2,4 @@ from .abc import *  # noqa
 from .connection import *  # noqa
 from .guild import *  # noqa
 from .message import *  # noqa
+from .misc import *  # noqa
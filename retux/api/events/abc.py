@@ -1,10 +1,10 @@
-from attrs import define, field
+from typing import Callable
+
+from attrs import define, field, fields
 
 from ...const import MISSING
 
-from .misc import TypingStart
-from .message import _MessageEvents
-from .guild import _GuildEvents
+__all__ = ("_Event", "_EventTable")
 
 
 @define()
@@ -38,16 +38,117 @@ class _Event:
     """
 
 
-class _EventTable(_MessageEvents, _GuildEvents):
+def _deserializer(event: type[_Event]) -> Callable[..., _Event]:
+    """
+    Builds a deserializer for an event.
+
+    ---
+
+    Discord may send fields that an event does not know about yet,
+    which are left out rather than failing the event. The fields
+    known to the event are worked out once, ahead of time.
+
+    ---
+
+    Parameters
+    ----------
+    event : `type[_Event]`
+        The event to build a deserializer for.
+
+    Returns
+    -------
+    `typing.Callable[..., _Event]`
+        The deserializer of the event. This is given the name of the event,
+        the bot linked to it, and then its data.
+    """
+    names = frozenset(
+        attr.alias for attr in fields(event) if attr.init and attr.alias not in ("name", "bot")
+    )
+
+    def deserialize(name: str, bot: "Bot", *args, **data) -> _Event:  # noqa
+        known = {key: value for key, value in data.items() if key in names}
+        return event(name, bot, *args, **known)
+
+    return deserialize
+
+
+class _EventTable:
     """
     Stores events from the Gateway for potential use dispatching.
+
+    ---
+
+    Every Gateway event is registered by its name when imported,
+    alongside a deserializer built for it ahead of time. Events
+    without a class of their own are registered as `None`, and
+    are dispatched as the raw `dict` given to us by Discord.
     """
 
+    _events: dict[str, type[_Event] | None] = {}
+    """The events of the Gateway, by their name."""
+    _deserializers: dict[type[_Event], Callable[..., _Event]] = {}
+    """The deserializers of each event."""
+
     @classmethod
-    def lookup(self, name: str):
-        if messages := _MessageEvents.lookup(name):
-            return messages
-        elif guilds := _GuildEvents.lookup(name):
-            return guilds
-        if name == "TYPING_START":
-            return TypingStart
+    def register(cls, name: str, event: type[_Event] | None = None):
+        """
+        Registers an event of the Gateway.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event, such as `MESSAGE_CREATE`.
+        event : `type[_Event]`, optional
+            The class of the event. Defaults to none, dispatching the raw data.
+        """
+        cls._events[name] = event
+
+        if event is not None:
+            cls._deserializers[event] = _deserializer(event)
+
+    @classmethod
+    def lookup(cls, name: str) -> type[_Event] | None:
+        """
+        Looks up the class of an event.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event.
+
+        Returns
+        -------
+        `type[_Event]`, optional
+            The class of the event, if it has one.
+        """
+        return cls._events.get(name)
+
+    @classmethod
+    def deserialize(
+        cls, event: type[_Event], name: str, bot: "Bot", *args, **data  # noqa
+    ) -> _Event:
+        """
+        Deserializes the data of an event into its class.
+
+        Parameters
+        ----------
+        event : `type[_Event]`
+            The class of the event.
+        name : `str`
+            The name of the event.
+        bot : `Bot`
+            The bot instance linked to the event.
+        *args
+            The positional data of the event.
+        **data
+            The data of the event. Fields unknown to the class are left out.
+
+        Returns
+        -------
+        `_Event`
+            The deserialized event.
+        """
+        if (deserialize := cls._deserializers.get(event)) is None:
+            deserialize = cls._deserializers[event] = _deserializer(event)
+
+        return deserialize(name, bot, *args, **data)
@@ -2,8 +2,9 @@ from attrs import define, field
 
 from ...client.resources.guild import UnavailableGuild
 from ...client.resources.application import PartialApplication
+from ...utils.converters import dict_c, list_c
 
-from .abc import _Event
+from .abc import _Event, _EventTable
 
 __all__ = ("Ready", "HeartbeatAck", "Resumed", "Reconnect", "InvalidSession")
 
@@ -35,6 +36,8 @@ class Ready(_Event):
         The type of session that the bot has established with the Gateway.
     session_id : `str`
         The ID of the bot's Gateway connection session, used for reconnection.
+    resume_gateway_url : `str`, optional
+        The URL of the Gateway to connect to when resuming the session.
     shard : `list[int]`, optional
         The shards of the Gateway connection, if present.
     application : `PartialApplication`
@@ -53,7 +56,9 @@ class Ready(_Event):
     # TODO: implement User object
     user: dict = field(kw_only=True)
     """The user form of the bot application."""
-    guilds: list[dict] | list[UnavailableGuild] = field(converter=UnavailableGuild, kw_only=True)
+    guilds: list[dict] | list[UnavailableGuild] = field(
+        converter=list_c(dict_c(UnavailableGuild)), kw_only=True
+    )
     """The guilds unavailable to the bot."""
     # TODO: Investigate the guild_join_requests field.
     guild_join_requests: list | None = field(default=None, kw_only=True)
@@ -68,6 +73,8 @@ class Ready(_Event):
     """The type of session that the bot has established with the Gateway."""
     session_id: str = field(kw_only=True)
     """The ID of the bot's Gateway connection session, used for reconnection."""
+    resume_gateway_url: str | None = field(default=None, kw_only=True)
+    """The URL of the Gateway to connect to when resuming the session."""
     # TODO: Investigate the relationships field.
     relationships: list | None = field(default=None, kw_only=True)
     """The relationships associated to the bot application, if present."""
@@ -79,7 +86,9 @@ class Ready(_Event):
     """The presences of the bot application, if present."""
     shard: list[int] | None = field(default=None, kw_only=True)
     """The shards of the Gateway connection, if present."""
-    application: dict | PartialApplication = field(converter=PartialApplication, kw_only=True)
+    application: dict | PartialApplication = field(
+        converter=dict_c(PartialApplication), kw_only=True
+    )
     """The application form of the bot. Contains only `id` and `flags`."""
 
     @property
@@ -108,21 +117,24 @@ class Resumed(_Event):
     """
     Represents when the client has successfully resumed a connection.
 
+    ---
+
+    Discord sends no data alongside this event. The fields are
+    filled in from the session the client has just resumed.
+
+    ---
+
     Attributes
     ----------
-    token : `str`
-        The token of the bot used.
-    session_id : `str`
+    session_id : `str`, optional
         The ID of the Gateway connection session.
-    seq : `int`
+    seq : `int`, optional
         The last sequence number given for the session.
     """
 
-    token: str = field(kw_only=True)
-    """The token of the bot used."""
-    session_id: str = field(kw_only=True)
+    session_id: str | None = field(default=None, kw_only=True)
     """The ID of the Gateway connection session."""
-    seq: int = field(kw_only=True)
+    seq: int | None = field(default=None, kw_only=True)
     """The last sequence number given for the session."""
 
 
@@ -196,3 +208,10 @@ class InvalidSession(_Event):
             Whether the session can be reconnected to or not.
         """
         return self._invalid_session
+
+
+_EventTable.register("READY", Ready)
+_EventTable.register("RESUMED", Resumed)
+_EventTable.register("RECONNECT", Reconnect)
+_EventTable.register("INVALID_SESSION", InvalidSession)
+_EventTable.register("HEARTBEAT_ACK", HeartbeatAck)
@@ -1,54 +1,92 @@
-from ...const import MISSING
+from attrs import define, field
 
+from ...client.resources.abc import Snowflake
+from ...client.resources.guild import Member
+from ...utils.converters import dict_c, list_c
 
-class _GuildEvents:
+from .abc import _Event, _EventTable
+
+__all__ = ("GuildMembersChunk",)
+
+
+@define()
+class GuildMembersChunk(_Event):
     """
-    Acts as a lookup table for Gateway events relating to
-    guilds from Discord.
+    Represents a `GUILD_MEMBERS_CHUNK` event from Discord.
+
+    ---
+
+    Sent in response to a request for guild members, with up
+    to 1000 members at a time. A request for many members is
+    answered across numerous chunks, which share its nonce.
+
+    ---
+
+    Attributes
+    ----------
+    guild_id : `Snowflake`
+        The ID of the guild the members are of.
+    members : `list[Member]`
+        The members of the chunk.
+    chunk_index : `int`
+        The index of the chunk, out of `chunk_count`.
+    chunk_count : `int`
+        The amount of chunks answering the request.
+    not_found : `list[Snowflake]`
+        The IDs of the users requested that were not found.
+    presences : `list[dict]`
+        The presences of the members, if requested.
+    nonce : `str`, optional
+        The nonce the request was sent with, if any.
     """
 
-    @classmethod
-    def lookup(cls, name: str) -> dict | MISSING:
-        match name:
-            case "GUILD_CREATE":
-                ...
-            case "GUILD_UPDATE":
-                ...
-            case "GUILD_DELETE":
-                ...
-            case "GUILD_BAN_ADD":
-                ...
-            case "GUILD_BAN_REMOVE":
-                ...
-            case "GUILD_EMOJIS_UPDATE":
-                ...
-            case "GUILD_STICKERS_UPDATE":
-                ...
-            case "GUILD_INTEGRATIONS_UPDATE":
-                ...
-            case "GUILD_MEMBER_ADD":
-                ...
-            case "GUILD_MEMBER_REMOVE":
-                ...
-            case "GUILD_MEMBER_UPDATE":
-                ...
-            case "GUILD_MEMBERS_CHUNK":
-                ...
-            case "GUILD_ROLE_CREATE":
-                ...
-            case "GUILD_ROLE_UPDATE":
-                ...
-            case "GUILD_ROLE_DELETE":
-                ...
-            case "GUILD_SCHEDULED_EVENT_CREATE":
-                ...
-            case "GUILD_SCHEDULED_EVENT_UPDATE":
-                ...
-            case "GUILD_SCHEDULED_EVENT_DELETE":
-                ...
-            case "GUILD_SCHEDULED_EVENT_USER_ADD":
-                ...
-            case "GUILD_SCHEDULED_EVENT_USER_REMOVE":
-                ...
-            case _:
-                ...
+    guild_id: str | Snowflake = field(converter=Snowflake, kw_only=True)
+    """The ID of the guild the members are of."""
+    members: list[dict] | list[Member] = field(converter=list_c(dict_c(Member)), kw_only=True)
+    """The members of the chunk."""
+    chunk_index: int = field(kw_only=True)
+    """The index of the chunk, out of `chunk_count`."""
+    chunk_count: int = field(kw_only=True)
+    """The amount of chunks answering the request."""
+    not_found: list[str] | list[Snowflake] = field(
+        converter=list_c(Snowflake), factory=list, kw_only=True
+    )
+    """The IDs of the users requested that were not found."""
+    presences: list[dict] = field(factory=list, kw_only=True)
+    """The presences of the members, if requested."""
+    nonce: str | None = field(default=None, kw_only=True)
+    """The nonce the request was sent with, if any."""
+
+    @property
+    def last(self) -> bool:
+        """Whether this is the last chunk answering the request or not."""
+        return self.chunk_index >= self.chunk_count - 1
+
+
+_GUILD_EVENTS = (
+    "GUILD_CREATE",
+    "GUILD_UPDATE",
+    "GUILD_DELETE",
+    "GUILD_BAN_ADD",
+    "GUILD_BAN_REMOVE",
+    "GUILD_EMOJIS_UPDATE",
+    "GUILD_STICKERS_UPDATE",
+    "GUILD_INTEGRATIONS_UPDATE",
+    "GUILD_MEMBER_ADD",
+    "GUILD_MEMBER_REMOVE",
+    "GUILD_MEMBER_UPDATE",
+    "GUILD_ROLE_CREATE",
+    "GUILD_ROLE_UPDATE",
+    "GUILD_ROLE_DELETE",
+    "GUILD_SCHEDULED_EVENT_CREATE",
+    "GUILD_SCHEDULED_EVENT_UPDATE",
+    "GUILD_SCHEDULED_EVENT_DELETE",
+    "GUILD_SCHEDULED_EVENT_USER_ADD",
+    "GUILD_SCHEDULED_EVENT_USER_REMOVE",
+)
+"""The Gateway events relating to guilds from Discord, without a class of their own yet."""
+
+for name in _GUILD_EVENTS:
+    _EventTable.register(name)
+
+_EventTable.register("GUILD_MEMBERS_CHUNK", GuildMembersChunk)
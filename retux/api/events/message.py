@@ -1,30 +1,18 @@
-from ...const import MISSING
+from .abc import _EventTable
 
+__all__ = ()
 
-class _MessageEvents:
-    """
-    Acts as a lookup table for Gateway events relating to
-    messages from Discord.
-    """
+_MESSAGE_EVENTS = (
+    "MESSAGE_CREATE",
+    "MESSAGE_UPDATE",
+    "MESSAGE_DELETE",
+    "MESSAGE_DELETE_BULK",
+    "MESSAGE_REACTION_ADD",
+    "MESSAGE_REACTION_REMOVE",
+    "MESSAGE_REACTION_REMOVE_ALL",
+    "MESSAGE_REACTION_REMOVE_EMOJI",
+)
+"""The Gateway events relating to messages from Discord."""
 
-    @classmethod
-    def lookup(cls, name: str) -> dict | MISSING:
-        match name:
-            case "MESSAGE_CREATE":
-                ...
-            case "MESSAGE_UPDATE":
-                ...
-            case "MESSAGE_DELETE":
-                ...
-            case "MESSAGE_DELETE_BULK":
-                ...
-            case "MESSAGE_REACTION_ADD":
-                ...
-            case "MESSAGE_REACTION_REMOVE":
-                ...
-            case "MESSAGE_REACTION_REMOVE_ALL":
-                ...
-            case "MESSAGE_REACTION_REMOVE_EMOJI":
-                ...
-            case _:
-                ...
+for name in _MESSAGE_EVENTS:
+    _EventTable.register(name)
@@ -3,11 +3,15 @@ from attrs import define, field
 
 from ...client.resources.abc import Snowflake
 from ...client.resources.guild import Member
-from ...utils.converters import optional_c
+from ...utils.converters import dict_c, optional_c
+
+from .abc import _Event, _EventTable
+
+__all__ = ("TypingStart",)
 
 
 @define()
-class TypingStart:
+class TypingStart(_Event):
     """
     Represents a `TYPING_START` event from Discord.
 
@@ -32,28 +36,71 @@ class TypingStart:
         outside of a DM.
     member : `Member`, optional
         The member who started typing.
-        
+
         This will only appear when a user is typing
         outside of a DM.
     """
 
-    channel_id: str | Snowflake = field(converter=Snowflake)
+    channel_id: str | Snowflake = field(converter=Snowflake, kw_only=True)
     """The ID of the channel when typing occured."""
-    user_id: str | Snowflake = field(converter=Snowflake)
+    user_id: str | Snowflake = field(converter=Snowflake, kw_only=True)
     """The ID of the user who started typing."""
-    timestamp: int | datetime = field(converter=datetime.fromtimestamp)
+    timestamp: int | datetime = field(converter=datetime.fromtimestamp, kw_only=True)
     """The timestamp of when the typing occured."""
-    guild_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
+    guild_id: str | Snowflake | None = field(
+        converter=optional_c(Snowflake), default=None, kw_only=True
+    )
     """
     The ID of the guild when typing occured.
 
     This will only appear when a user is typing
     outside of a DM.
     """
-    member: dict | Member | None = field(converter=optional_c(Member), default=None)
+    member: dict | Member | None = field(
+        converter=optional_c(dict_c(Member)), default=None, kw_only=True
+    )
     """
     The member who started typing.
-    
+
     This will only appear when a user is typing
     outside of a DM.
     """
+
+
+_MISC_EVENTS = (
+    "APPLICATION_COMMAND_PERMISSIONS_UPDATE",
+    "AUTO_MODERATION_RULE_CREATE",
+    "AUTO_MODERATION_RULE_UPDATE",
+    "AUTO_MODERATION_RULE_DELETE",
+    "AUTO_MODERATION_ACTION_EXECUTION",
+    "CHANNEL_CREATE",
+    "CHANNEL_UPDATE",
+    "CHANNEL_DELETE",
+    "CHANNEL_PINS_UPDATE",
+    "THREAD_CREATE",
+    "THREAD_UPDATE",
+    "THREAD_DELETE",
+    "THREAD_LIST_SYNC",
+    "THREAD_MEMBER_UPDATE",
+    "THREAD_MEMBERS_UPDATE",
+    "INTEGRATION_CREATE",
+    "INTEGRATION_UPDATE",
+    "INTEGRATION_DELETE",
+    "INTERACTION_CREATE",
+    "INVITE_CREATE",
+    "INVITE_DELETE",
+    "PRESENCE_UPDATE",
+    "STAGE_INSTANCE_CREATE",
+    "STAGE_INSTANCE_UPDATE",
+    "STAGE_INSTANCE_DELETE",
+    "USER_UPDATE",
+    "VOICE_STATE_UPDATE",
+    "VOICE_SERVER_UPDATE",
+    "WEBHOOKS_UPDATE",
+)
+"""The other Gateway events from Discord, which do not have a class of their own yet."""
+
+for name in _MISC_EVENTS:
+    _EventTable.register(name)
+
+_EventTable.register("TYPING_START", TypingStart)
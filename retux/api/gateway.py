@@ -1,24 +1,102 @@
+from collections import deque
+from heapq import heappop, heappush
+from itertools import count
 from enum import IntEnum
-from json import dumps, loads
-from logging import getLogger
+from logging import DEBUG, getLogger
+from pickle import dump, load
+from random import random
 from sys import platform
+from tempfile import TemporaryFile
 from time import perf_counter
-from typing import Any, Protocol
+from typing import IO, Any, AsyncIterator, Awaitable, Callable, Protocol
+from uuid import uuid4
+from zlib import decompressobj
 
 from attrs import asdict, define, field
 from cattrs import structure_attrs_fromdict
-from trio import open_nursery, sleep, Nursery
-from trio_websocket import ConnectionClosed, WebSocketConnection, open_websocket_url
-
+from trio import (
+    BrokenResourceError,
+    EndOfChannel,
+    Event,
+    MemorySendChannel,
+    Nursery,
+    current_time,
+    move_on_after,
+    open_memory_channel,
+    open_nursery,
+    sleep,
+)
+from trio_websocket import (
+    ConnectionClosed,
+    HandshakeError,
+    WebSocketConnection,
+    open_websocket_url,
+)
+
+from .codec import _Codec, get_codec
+from .error import GatewayException
+from .etf import ETFCodec
+from .session import SessionStore
 from .events.abc import _Event, _EventTable
 from .events.connection import HeartbeatAck, InvalidSession, Ready, Reconnect, Resumed
+from .events.guild import GuildMembersChunk
 
 from ..client.flags import Intents
 from ..client.resources.abc import Snowflake
 from ..const import MISSING, NotNeeded, __gateway_url__
+from ..utils.lazy import Lazy
 
 logger = getLogger(__name__)
 
+_ZLIB_SUFFIX = b"\x00\x00\xff\xff"
+"""The suffix marking the end of a message in a `zlib-stream` compressed Gateway connection."""
+
+_RESUME_CLOSE_CODE = 4000
+"""
+The code we close a connection with when we intend to resume it. Closing
+with `1000` or `1001` would invalidate the session along with it.
+"""
+
+_LATENCY_HISTORY = 20
+"""The amount of heartbeat latencies kept in the history of a connection."""
+
+_FATAL_CLOSE_CODES = {
+    4004: "The token given is invalid.",
+    4010: "The shard given is invalid.",
+    4011: "The bot is in too many guilds, and must be sharded.",
+    4012: "The version of the Gateway given is invalid.",
+    4013: "The intents given are invalid.",
+    4014: "The intents given have not been enabled for the bot.",
+}
+"""The close codes that can never be reconnected from, with their reason."""
+
+_SESSION_CLOSE_CODES = (4007, 4009)
+"""The close codes invalidating the session, which must be identified anew after."""
+
+_BACKOFF_BASE = 1.0
+"""The time in seconds the backoff in-between failed reconnects starts from."""
+
+_BACKOFF_CAP = 60.0
+"""The most time in seconds ever waited in-between failed reconnects."""
+
+_OVERFLOW_POLICIES = ("block", "drop", "spill")
+"""The policies available for when the event buffer of a client is full."""
+
+_LOW_PRIORITY_EVENTS = frozenset(("TYPING_START", "PRESENCE_UPDATE"))
+"""The events that may be dropped when the event buffer of a client is full."""
+
+_CONNECTION_EVENTS = frozenset(
+    ("ready", "resumed", "heartbeat_ack", "invalid_session", "reconnect")
+)
+"""The events dispatched while reading from the Gateway, rather than from the event buffer."""
+
+_CHUNK_STALL = 5.0
+"""
+The most time in seconds the Gateway waits on a stream of guild members to
+make room for another chunk, before giving up on the stream. Chunks are
+read from the same connection as heartbeats, and so cannot be held onto long.
+"""
+
 
 @define()
 class _GatewayMeta:
@@ -36,6 +114,10 @@ class _GatewayMeta:
     """The ID of an existent session, used for when resuming a lost connection."""
     seq: int | None = field(default=None)
     """The sequence number on an existent session."""
+    resume_gateway_url: str | None = field(default=None)
+    """The URL to connect to when resuming an existent session."""
+    shard: list[int] | None = field(default=None)
+    """The shard ID and amount of shards of the connection, if sharded."""
 
 
 class _GatewayOpCode(IntEnum):
@@ -68,7 +150,7 @@ class _GatewayOpCode(IntEnum):
     """An event received to acknowledge a `HEARTBEAT` sent."""
 
 
-@define(slots=False)
+@define()
 class _GatewayPayload:
     """
     Represents a Gateway payload, signifying data for events.
@@ -110,6 +192,546 @@ class _GatewayPayload:
         return self.t
 
 
+@define()
+class _ConnectionMetrics:
+    """Represents the metrics of a client's connections to the Gateway."""
+
+    connects: int = field(default=0)
+    """The amount of connections opened."""
+    reconnects: int = field(default=0)
+    """The amount of times the client has reconnected."""
+    resumes: int = field(default=0)
+    """The amount of sessions resumed."""
+    failures: int = field(default=0)
+    """The amount of connections in a row that have failed to become ready."""
+    last_close_code: int | None = field(default=None)
+    """The code the last connection was closed with, if any."""
+    last_delay: float = field(default=0.0)
+    """The time in seconds waited before the last reconnect."""
+    downtime: float = field(default=0.0)
+    """The total time in seconds spent without a ready connection."""
+    skipped: int = field(default=0)
+    """The amount of events dropped for having nothing listening to them."""
+    _closed_at: float | None = field(default=None, repr=False)
+    """The time on the `trio` clock that the last ready connection was closed at."""
+
+    def closed(self, code: int | None):
+        """
+        Records the close of a connection.
+
+        Parameters
+        ----------
+        code : `int`, optional
+            The code the connection was closed with, if any.
+        """
+        self.last_close_code = code
+
+        if self._closed_at is None:
+            self._closed_at = current_time()
+
+    def ready(self, resumed: bool):
+        """
+        Records a connection becoming ready.
+
+        Parameters
+        ----------
+        resumed : `bool`
+            Whether the session was resumed or not.
+        """
+        self.failures = 0
+        self.resumes += resumed
+
+        if self._closed_at is not None:
+            self.downtime += current_time() - self._closed_at
+            self._closed_at = None
+
+
+class _EventBuffer:
+    """
+    Represents the buffer of events in-between the Gateway and their dispatching.
+
+    ---
+
+    The connection only ever waits on its buffer, and not on callbacks,
+    which lets heartbeats and other connection payloads be read on
+    time. When dispatching falls behind, such as during a raid, the
+    buffer fills up and its overflow policy takes over:
+
+    - `block` waits for room, slowing down reading from the Gateway.
+    - `drop` removes the oldest low-priority event, like `TYPING_START`
+      or `PRESENCE_UPDATE`, to make room. If there are none, this blocks.
+    - `spill` writes events to a temporary file on disk until there is
+      room again, keeping them in the order they were received.
+
+    ---
+
+    Attributes
+    ----------
+    capacity : `int`
+        The amount of events held in memory.
+    overflow : `str`
+        The policy used when the buffer is full.
+    dropped : `int`
+        The amount of events dropped.
+    spilled : `int`
+        The amount of events written to disk.
+    blocked : `int`
+        The amount of times the connection had to wait on room in the buffer.
+    peak : `int`
+        The most events ever held in memory at once.
+    _events : `collections.deque[tuple[str, typing.Any]]`
+        The events held in memory, by their name and data.
+    _spill : `typing.IO[bytes]`, optional
+        The file events are spilled into, once one has been needed.
+    _unread : `int`
+        The amount of events inside of the file that have yet to be read.
+    _read_at : `int`
+        The position inside of the file of the next event to read.
+    _closed : `bool`
+        Whether the buffer is closed or not.
+    _has_events : `trio.Event`
+        The event set when events are put into the buffer.
+    _has_room : `trio.Event`
+        The event set when events are taken out of the buffer.
+    """
+
+    __slots__ = (
+        "capacity",
+        "overflow",
+        "dropped",
+        "spilled",
+        "blocked",
+        "peak",
+        "_events",
+        "_spill",
+        "_unread",
+        "_read_at",
+        "_closed",
+        "_has_events",
+        "_has_room",
+    )
+    capacity: int
+    """The amount of events held in memory."""
+    overflow: str
+    """The policy used when the buffer is full."""
+    dropped: int
+    """The amount of events dropped."""
+    spilled: int
+    """The amount of events written to disk."""
+    blocked: int
+    """The amount of times the connection had to wait on room in the buffer."""
+    peak: int
+    """The most events ever held in memory at once."""
+    _events: deque[tuple[str, Any]]
+    """The events held in memory, by their name and data."""
+    _spill: IO[bytes] | None
+    """The file events are spilled into, once one has been needed."""
+    _unread: int
+    """The amount of events inside of the file that have yet to be read."""
+    _read_at: int
+    """The position inside of the file of the next event to read."""
+    _closed: bool
+    """Whether the buffer is closed or not."""
+    _has_events: Event
+    """The event set when events are put into the buffer."""
+    _has_room: Event
+    """The event set when events are taken out of the buffer."""
+
+    def __init__(self, capacity: int = 1000, overflow: str = "block"):
+        """
+        Creates a new buffer of events.
+
+        Parameters
+        ----------
+        capacity : `int`, optional
+            The amount of events held in memory. Defaults to `1000`.
+        overflow : `str`, optional
+            The policy used when the buffer is full. Defaults to `block`.
+            Please see `_EventBuffer` for every policy.
+        """
+        if overflow not in _OVERFLOW_POLICIES:
+            raise ValueError(f"{overflow} is not a supported overflow policy.")
+
+        self.capacity = capacity
+        self.overflow = overflow
+        self.dropped = 0
+        self.spilled = 0
+        self.blocked = 0
+        self.peak = 0
+        self._events = deque()
+        self._spill = None
+        self._unread = 0
+        self._read_at = 0
+        self._closed = False
+        self._has_events = Event()
+        self._has_room = Event()
+
+    @property
+    def depth(self) -> int:
+        """The amount of events waiting to be dispatched, both in memory and on disk."""
+        return len(self._events) + self._unread
+
+    @property
+    def metrics(self) -> dict:
+        """The metrics of the buffer, such as its depth and how many events were dropped."""
+        return {
+            "depth": self.depth,
+            "peak": self.peak,
+            "dropped": self.dropped,
+            "spilled": self.spilled,
+            "blocked": self.blocked,
+        }
+
+    def _drop(self) -> bool:
+        """
+        Drops the oldest low-priority event held in memory, to make room for another.
+
+        Returns
+        -------
+        `bool`
+            Whether an event was dropped or not.
+        """
+        for index, (queued, _) in enumerate(self._events):
+            if queued in _LOW_PRIORITY_EVENTS:
+                del self._events[index]
+                self.dropped += 1
+                return True
+
+        return False
+
+    def _write(self, event: tuple[str, Any]):
+        """
+        Writes an event onto disk.
+
+        Parameters
+        ----------
+        event : `tuple[str, typing.Any]`
+            The name and data of the event.
+        """
+        if self._spill is None:
+            self._spill = TemporaryFile()
+
+        self._spill.seek(0, 2)
+        dump(event, self._spill)
+        self._unread += 1
+        self.spilled += 1
+
+    def _read(self):
+        """Reads events from disk back into memory, for as long as there is room."""
+        self._spill.seek(self._read_at)
+
+        while self._unread and len(self._events) < self.capacity:
+            self._events.append(load(self._spill))
+            self._unread -= 1
+
+        self._read_at = self._spill.tell()
+
+        if not self._unread:
+            self._spill.seek(0)
+            self._spill.truncate()
+            self._read_at = 0
+
+    async def put(self, name: str, data: Any):
+        """
+        Puts an event into the buffer, following the overflow policy when full.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event.
+        data : `typing.Any`
+            The data of the event.
+        """
+        # Events are spilled for as long as any remain on disk,
+        # otherwise newer ones would be dispatched before them.
+        if self._unread:
+            self._write((name, data))
+            return
+
+        while len(self._events) >= self.capacity:
+            if self.overflow == "spill":
+                self._write((name, data))
+                return
+            if self.overflow == "drop":
+                if self._drop():
+                    continue
+                if name in _LOW_PRIORITY_EVENTS:
+                    self.dropped += 1
+                    return
+
+            self.blocked += 1
+            self._has_room = Event()
+            await self._has_room.wait()
+
+        self._events.append((name, data))
+        self.peak = max(self.peak, len(self._events))
+        self._has_events.set()
+
+    async def get(self) -> tuple[str, Any] | None:
+        """
+        Gets the next event from the buffer, waiting on one if empty.
+
+        Returns
+        -------
+        `tuple[str, typing.Any]`, optional
+            The name and data of the event. This is `None` once the
+            buffer has been closed and every event has been taken.
+        """
+        while not self._events:
+            if self._unread:
+                self._read()
+                break
+            if self._closed:
+                return None
+
+            self._has_events = Event()
+            await self._has_events.wait()
+
+        event = self._events.popleft()
+        self._has_room.set()
+
+        if self._unread and len(self._events) < self.capacity:
+            self._read()
+
+        return event
+
+    def open(self):
+        """Opens the buffer again once it has been closed, such as when the client restarts."""
+        self._closed = False
+
+    def close(self):
+        """Closes the buffer. Events already inside of it may still be taken."""
+        self._closed = True
+        self._has_events.set()
+
+
+class _SendPriority(IntEnum):
+    """Represents the priority of a payload waiting to be sent to the Gateway."""
+
+    CONNECTION = 0
+    """A payload keeping the connection alive, such as a heartbeat, identify or resume."""
+    REQUEST = 1
+    """A payload requesting something of the Gateway, such as a presence or voice state update."""
+
+
+@define()
+class _Send:
+    """Represents a payload waiting to be sent to the Gateway."""
+
+    priority: _SendPriority = field()
+    """The priority of the payload."""
+    data: str | bytes = field(repr=False)
+    """The encoded payload."""
+    done: Event = field(factory=Event, repr=False)
+    """The event set once the payload has been sent, or dropped."""
+    cancelled: bool = field(default=False)
+    """Whether the caller has stopped waiting on the payload or not."""
+
+
+class _SendQueue:
+    """
+    Represents the outbound queue of payloads for a Gateway connection.
+
+    ---
+
+    Discord only allows 120 payloads to be sent every 60 seconds on
+    a connection, and disconnects anybody going over. Payloads wait
+    inside of the queue in order of their priority, and are sent by
+    a single task once the sliding window of the connection has room.
+
+    The window counts every payload actually sent within the last
+    period, so no more than `limit` are ever sent inside of any period.
+    A few of them are reserved for payloads keeping the connection
+    alive, which requests are never allowed to take up.
+
+    Payloads requesting something of the Gateway are held back until
+    the session is ready, as they would otherwise arrive before the
+    identify. Payloads keeping the connection alive belong to the
+    connection they were made for, and are dropped when it ends.
+
+    ---
+
+    Attributes
+    ----------
+    limit : `int`
+        The amount of payloads allowed to be sent in each period.
+    per : `float`
+        The period of the limit in seconds.
+    reserved : `int`
+        The amount of payloads of each period reserved for keeping the connection alive.
+    ready : `bool`
+        Whether the session is ready for requests or not.
+    _queue : `list[tuple[int, int, _Send]]`
+        The heap of payloads waiting to be sent, by their priority and order.
+    _order : `itertools.count`
+        The counter keeping payloads of the same priority in order.
+    _wakeup : `trio.Event`
+        The event set when the sending task should look at the queue again.
+    _sent : `collections.deque[float]`
+        The times on the `trio` clock of the payloads sent within the last period.
+    """
+
+    __slots__ = ("limit", "per", "reserved", "ready", "_queue", "_order", "_wakeup", "_sent")
+    limit: int
+    """The amount of payloads allowed to be sent in each period."""
+    per: float
+    """The period of the limit in seconds."""
+    reserved: int
+    """The amount of payloads of each period reserved for keeping the connection alive."""
+    ready: bool
+    """Whether the session is ready for requests or not."""
+    _queue: list[tuple[int, int, _Send]]
+    """The heap of payloads waiting to be sent, by their priority and order."""
+    _order: count
+    """The counter keeping payloads of the same priority in order."""
+    _wakeup: Event
+    """The event set when the sending task should look at the queue again."""
+    _sent: deque[float]
+    """The times on the `trio` clock of the payloads sent within the last period."""
+
+    def __init__(self, limit: int = 120, per: float = 60.0, reserved: int = 5):
+        """
+        Creates a new outbound queue.
+
+        Parameters
+        ----------
+        limit : `int`, optional
+            The amount of payloads allowed to be sent in each period. Defaults to `120`.
+        per : `float`, optional
+            The period of the limit in seconds. Defaults to `60.0`.
+        reserved : `int`, optional
+            The amount of payloads of each period reserved for keeping the
+            connection alive, such as heartbeats. Defaults to `5`.
+        """
+        self.limit = limit
+        self.per = per
+        self.reserved = reserved
+        self.ready = False
+        self._queue = []
+        self._order = count()
+        self._wakeup = Event()
+        self._sent = deque()
+
+    def reset(self):
+        """Resets the queue for a new connection."""
+        self.ready = False
+        self._sent.clear()
+
+        for *_, send in self._queue:
+            if send.priority is _SendPriority.CONNECTION:
+                send.done.set()
+
+        self._queue = [item for item in self._queue if not item[2].done.is_set()]
+        self._notify()
+
+    def open(self):
+        """Marks the session as ready, letting requests through."""
+        self.ready = True
+        self._notify()
+
+    def _notify(self):
+        """Wakes up the sending task."""
+        self._wakeup.set()
+
+    def _sendable(self) -> bool:
+        """Whether the payload at the front of the queue may be sent or not."""
+        return bool(self._queue) and (self.ready or self._queue[0][0] == _SendPriority.CONNECTION)
+
+    def _wait(self, priority: _SendPriority) -> float:
+        """
+        Works out how long a payload must wait on room inside of the window.
+
+        Parameters
+        ----------
+        priority : `_SendPriority`
+            The priority of the payload.
+
+        Returns
+        -------
+        `float`
+            The time in seconds to wait, or `0` if the payload may be sent right away.
+        """
+        now = current_time()
+
+        while self._sent and self._sent[0] <= now - self.per:
+            self._sent.popleft()
+
+        allowed = self.limit if priority is _SendPriority.CONNECTION else self.limit - self.reserved
+
+        if len(self._sent) < allowed:
+            return 0
+
+        # Room is made once enough of the oldest payloads have left the window.
+        return self._sent[len(self._sent) - allowed] + self.per - now
+
+    async def put(self, data: str | bytes, priority: _SendPriority):
+        """
+        Puts a payload into the queue, and waits until it has been sent.
+
+        Parameters
+        ----------
+        data : `str`, `bytes`
+            The encoded payload.
+        priority : `_SendPriority`
+            The priority of the payload.
+        """
+        send = _Send(priority, data)
+        heappush(self._queue, (priority, next(self._order), send))
+        self._notify()
+
+        try:
+            await send.done.wait()
+        finally:
+            send.cancelled = not send.done.is_set()
+
+    async def run(self, conn: WebSocketConnection):
+        """
+        Sends the payloads inside of the queue for as long as a connection lasts.
+
+        Parameters
+        ----------
+        conn : `trio_websocket.WebSocketConnection`
+            The connection to send payloads on.
+        """
+        while True:
+            while not self._sendable():
+                self._wakeup = Event()
+                await self._wakeup.wait()
+
+            _, _, send = self._queue[0]
+
+            if send.cancelled:
+                heappop(self._queue)
+                continue
+
+            if (wait := self._wait(send.priority)) > 0:
+                logger.debug(f"The Gateway send limit was reached. Waiting {wait}s.")
+
+                # A payload of a higher priority may be queued while waiting,
+                # which is looked at straight away instead.
+                self._wakeup = Event()
+
+                with move_on_after(wait):
+                    await self._wakeup.wait()
+                continue
+
+            _, _, send = heappop(self._queue)
+
+            try:
+                await conn.send_message(send.data)
+            except ConnectionClosed:
+                logger.warn("The connection to Discord's Gateway has closed.")
+
+                if send.priority is _SendPriority.CONNECTION:
+                    send.done.set()
+                else:
+                    heappush(self._queue, (send.priority, next(self._order), send))
+                return
+
+            self._sent.append(current_time())
+            send.done.set()
+
+
 class GatewayProtocol(Protocol):
     def __init__(
         self,
@@ -119,6 +741,9 @@ class GatewayProtocol(Protocol):
         version: int = 10,
         encoding: str = "json",
         compress: NotNeeded[str] = MISSING,
+        codec: NotNeeded[str | _Codec] = MISSING,
+        shard: NotNeeded[tuple[int, int]] = MISSING,
+        session_store: NotNeeded[SessionStore] = MISSING,
     ):
         ...
 
@@ -140,6 +765,19 @@ class GatewayProtocol(Protocol):
     ):
         ...
 
+    def stream_guild_members(
+        self,
+        guild_id: Snowflake,
+        *,
+        query: NotNeeded[str] = MISSING,
+        limit: NotNeeded[int] = MISSING,
+        presences: NotNeeded[bool] = MISSING,
+        user_ids: NotNeeded[Snowflake | list[Snowflake]] = MISSING,
+        buffer: int = 2,
+        timeout: float | None = 30.0,
+    ) -> AsyncIterator[GuildMembersChunk]:
+        ...
+
     async def update_voice_state(
         self,
         guild_id: Snowflake,
@@ -153,6 +791,14 @@ class GatewayProtocol(Protocol):
     def latency(self) -> float:
         ...
 
+    @property
+    def latency_history(self) -> list[float]:
+        ...
+
+    @property
+    def metrics(self) -> dict:
+        ...
+
 
 class GatewayClient(GatewayProtocol):
     """
@@ -177,43 +823,116 @@ class GatewayClient(GatewayProtocol):
         An instance of a connection to the Gateway.
     _meta : `_GatewayMeta`
         Metadata representing connection parameters for the Gateway.
+    _codec : `_Codec`
+        The codec used on payloads.
+    _inflator : `zlib._Decompress`, optional
+        The decompressor of the current connection, if compression is used.
+    _buffer : `bytearray`
+        The compressed data received on the current connection that has yet to be decompressed.
+    max_retries : `int`, optional
+        The amount of connections in a row allowed to fail before giving up.
+    lazy : `bool`
+        Whether events are dispatched as `Lazy` resources or not.
     _tasks : `trio.Nursery`
-        The tasks associated with the Gateway, for reconnection and heartbeating.
+        The tasks associated with the Gateway, which supervise the connection.
     _closed : `bool`
         Whether the Gateway connection is closed or not.
     _stopped : `bool`
         Whether the Gateway connection was forcefully stopped or not.
-    _heartbeat_ack : `bool`
-        Whether we've received the first heartbeat acknowledgement or not.
+    _unacked_since : `float`, optional
+        The time on the `trio` clock the oldest heartbeat yet to be acknowledged was sent, if any.
     _last_ack : `list[float]`
-        The before/after time of the last Gateway event tracked. See `latency` for Gateway connection timing.
+        The before/after time of the last heartbeat sent and acknowledged. See `latency` for Gateway connection timing.
+    _latencies : `collections.deque[float]`
+        The latencies of the most recent heartbeats. See `latency_history`.
+    _beats : `trio.Nursery`
+        The tasks associated with the current connection, which send its heartbeats and payloads.
+    _sends : `_SendQueue`
+        The outbound queue of payloads, kept within the send limit of the Gateway.
     _bots : `list[retux.Bot]`
         The bot instances used for dispatching events.
+    _identify_gate : `typing.Callable[[int], typing.Awaitable[None]]`, optional
+        A coroutine waited on before identifying, given the shard ID. This is
+        set by a `ShardManager` to keep shards within their identify limits.
+    _session_store : `SessionStore`, optional
+        The store the session is saved to when the connection ends, and
+        loaded from when it starts.
+    _metrics : `_ConnectionMetrics`
+        The metrics of the client's connections. See `metrics`.
+    _events : `_EventBuffer`
+        The buffer of events received, waiting to be dispatched.
+    _chunks : `dict[str, trio.MemorySendChannel]`
+        The streams of guild members waiting on chunks, by the nonce of their request.
     """
 
-    # TODO: Add sharding and presence changing.
-
-    __slots__ = ("token", "intents", "_meta")
+    # TODO: Add presence changing.
+
+    __slots__ = (
+        "token",
+        "intents",
+        "max_retries",
+        "lazy",
+        "_meta",
+        "_codec",
+        "_inflator",
+        "_buffer",
+        "_last_ack",
+        "_latencies",
+        "_beats",
+        "_sends",
+        "_bots",
+        "_identify_gate",
+        "_session_store",
+        "_metrics",
+        "_events",
+        "_chunks",
+    )
     token: str
     """The bot's token."""
     intents: Intents
     """The intents to connect with."""
+    max_retries: int | None
+    """The amount of connections in a row allowed to fail before giving up."""
+    lazy: bool
+    """Whether events are dispatched as `Lazy` resources or not."""
     _conn: WebSocketConnection = None
     """An instance of a connection to the Gateway."""
     _meta: _GatewayMeta
     """Metadata representing connection parameters for the Gateway."""
+    _codec: _Codec
+    """The codec used on payloads."""
+    _inflator: Any | None
+    """The decompressor of the current connection, if compression is used."""
+    _buffer: bytearray
+    """The compressed data received on the current connection that has yet to be decompressed."""
     _tasks: Nursery = None
-    """The tasks associated with the Gateway, for reconnection and heartbeating."""
+    """The tasks associated with the Gateway, which supervise the connection."""
     _closed: bool = True
     """Whether the Gateway connection is closed or not."""
     _stopped: bool = False
     """Whether the Gateway connection was forcefully stopped or not."""
-    _heartbeat_ack: bool = False
-    """Whether we've received the first heartbeat acknowledgement or not."""
-    _last_ack: list[float] = []
-    """The before/after time of the last Gateway event tracked. See `latency` for Gateway connection timing."""
-    _bots: list["Bot"] = []  # noqa
+    _unacked_since: float | None = None
+    """The time on the `trio` clock the oldest heartbeat yet to be acknowledged was sent, if any."""
+    _last_ack: list[float]
+    """The before/after time of the last heartbeat sent and acknowledged. See `latency` for Gateway connection timing."""
+    _latencies: deque[float]
+    """The latencies of the most recent heartbeats. See `latency_history`."""
+    _beats: Nursery | None
+    """The tasks associated with the current connection, which send its heartbeats and payloads."""
+    _sends: _SendQueue
+    """The outbound queue of payloads, kept within the send limit of the Gateway."""
+    _bots: list["Bot"]  # noqa
     """The bot instances used for dispatching events."""
+    _identify_gate: Callable[[int], Awaitable[None]] | None
+    """A coroutine waited on before identifying, given the shard ID."""
+    _session_store: NotNeeded[SessionStore]
+    """The store the session is saved to when the connection ends, and loaded from when it starts."""
+    _metrics: _ConnectionMetrics
+    """The metrics of the client's connections. See `metrics`."""
+    _events: _EventBuffer
+    """The buffer of events received, waiting to be dispatched."""
+    _chunks: dict[str, MemorySendChannel]
+    """The streams of guild members waiting on chunks, by the nonce of their request."""
 
     def __init__(
         self,
@@ -223,6 +942,13 @@ class GatewayClient(GatewayProtocol):
         version: int = 10,
         encoding: str = "json",
         compress: str = None,
+        codec: NotNeeded[str | _Codec] = MISSING,
+        shard: NotNeeded[tuple[int, int]] = MISSING,
+        session_store: NotNeeded[SessionStore] = MISSING,
+        max_retries: int | None = 10,
+        event_capacity: int = 1000,
+        overflow: str = "block",
+        lazy: bool = False,
     ):
         """
         Creates a new connection to the Gateway.
@@ -237,22 +963,119 @@ class GatewayClient(GatewayProtocol):
             The version of the Gateway to use. Defaults to version `10`.
         encoding : `str`, optional
             The type of encoding to use on payloads. Defaults to `json`.
+            Both `json` and `etf` are supported.
         compress : `str`, optional
             The type of data compression to use on payloads. Defaults to none.
+            Only `zlib-stream` is supported.
+        codec : `str`, `_Codec`, optional
+            The codec to use on JSON payloads. Defaults to the fastest one installed.
+        shard : `tuple[int, int]`, optional
+            The shard ID and amount of shards to identify with. Defaults to
+            no sharding. Please see `ShardManager` for running numerous shards.
+        session_store : `SessionStore`, optional
+            The store to persist the session in across restarts. When given,
+            the last session is resumed on boot instead of identifying again.
+        max_retries : `int`, optional
+            The amount of connections in a row allowed to fail before giving
+            up with a `GatewayException`. Defaults to `10`, or never when `None`.
+        event_capacity : `int`, optional
+            The amount of events buffered in memory while waiting to be
+            dispatched. Defaults to `1000`.
+        overflow : `str`, optional
+            What to do with events received once the buffer is full.
+            Defaults to `block`. `drop` and `spill` are also supported,
+            please see `_EventBuffer` for more details.
+        lazy : `bool`, optional
+            Whether events are dispatched as `Lazy` resources, converting their
+            fields only once accessed. Defaults to `False`.
         """
         self.token = token
         self.intents = intents
-        self._meta = _GatewayMeta(version=version, encoding=encoding, compress=compress)
+        self.max_retries = max_retries
+        self.lazy = lazy
+        if encoding not in ("json", "etf"):
+            raise ValueError(f"{encoding} is not a supported encoding type.")
+        if compress not in (None, MISSING, "zlib-stream"):
+            raise ValueError(f"{compress} is not a supported compression type.")
+
+        self._meta = _GatewayMeta(
+            version=version,
+            encoding=encoding,
+            compress=None if compress is MISSING else compress,
+            shard=None if shard is MISSING else list(shard),
+        )
+        self._codec = ETFCodec() if encoding == "etf" else get_codec(codec)
+        self._inflator = None
+        self._buffer = bytearray()
+        self._last_ack = [perf_counter(), perf_counter()]
+        self._latencies = deque(maxlen=_LATENCY_HISTORY)
+        self._beats = None
+        self._sends = _SendQueue()
+        self._bots = []
+        self._identify_gate = None
+        self._session_store = session_store
+        self._metrics = _ConnectionMetrics()
+        self._events = _EventBuffer(event_capacity, overflow)
+        self._chunks = {}
 
     async def __aenter__(self):
+        if self._session_store is not MISSING and self._meta.session_id is None:
+            await self._load_session()
+
+        # The buffer was closed when the client last stopped, if it has run before.
+        self._events.open()
+
         self._tasks = open_nursery()
         nursery = await self._tasks.__aenter__()
-        nursery.start_soon(self.reconnect)
-        nursery.start_soon(self._heartbeat)
+        nursery.start_soon(self._supervise)
+        nursery.start_soon(self._dispatcher)
         return self
 
     async def __aexit__(self, *exc):
-        return await self._tasks.__aexit__(*exc)
+        try:
+            return await self._tasks.__aexit__(*exc)
+        finally:
+            if self._session_store is not MISSING:
+                await self._save_session()
+
+    @property
+    def _session_key(self) -> str:
+        """The key of the session inside of the session store, unique to each shard."""
+        shard_id, shard_count = self._meta.shard or (0, 1)
+        return f"{shard_id}/{shard_count}"
+
+    async def _load_session(self):
+        """Loads the last session from the session store, so that it may be resumed."""
+        session = await self._session_store.load(self._session_key)
+
+        if session is None:
+            logger.debug("No session was stored, identifying as a new one.")
+            return
+
+        self._meta.session_id = session["session_id"]
+        self._meta.seq = session["seq"]
+        self._meta.resume_gateway_url = session["resume_gateway_url"]
+        logger.debug(
+            f"Loaded a stored session to resume. (session: {self._meta.session_id}, sequence: {self._meta.seq})"
+        )
+
+    async def _save_session(self):
+        """Saves the current session into the session store, or clears it if there is none."""
+        if self._meta.session_id is None:
+            await self._session_store.delete(self._session_key)
+            return
+
+        await self._session_store.save(
+            self._session_key,
+            {
+                "session_id": self._meta.session_id,
+                "seq": self._meta.seq,
+                "resume_gateway_url": self._meta.resume_gateway_url,
+            },
+        )
+        logger.debug(
+            f"Saved the session. (session: {self._meta.session_id}, sequence: {self._meta.seq})"
+        )
 
     async def _receive(self) -> _GatewayPayload:
         """
@@ -260,83 +1083,196 @@ class GatewayClient(GatewayProtocol):
 
         Returns
         -------
-        `_GatewayPayload`
-            A class of the payload data.
+        `_GatewayPayload`, optional
+            A class of the payload data. This is `None` when only part
+            of a compressed payload has been received.
         """
+        resp = await self._conn.get_message()
 
-        # FIXME: our exception handling neglects other rejection
-        # reasons. A more thorough analysis of trio_websocket
-        # is necessary to have an extensible exception of our
-        # own for clarifying connection loss.
+        if self._inflator and isinstance(resp, bytes):
+            # Payloads may be split across numerous messages, and only the
+            # last one is flushed with the suffix. Everything up until then
+            # shares the same zlib context as the rest of the connection.
+            self._buffer.extend(resp)
 
-        try:
-            resp = await self._conn.get_message()
-            json = loads(resp)
-            return structure_attrs_fromdict(json, _GatewayPayload)
-        except ConnectionClosed:
-            logger.warn("The connection to Discord's Gateway has closed.")
-            self._closed = True
-            await self.reconnect()
+            if resp[-4:] != _ZLIB_SUFFIX:
+                return None
+
+            resp = self._inflator.decompress(self._buffer)
+            self._buffer.clear()
 
-    async def _send(self, payload: _GatewayPayload):
+        json = self._codec.loads(resp)
+        return structure_attrs_fromdict(json, _GatewayPayload)
+
+    async def _send(
+        self, payload: _GatewayPayload, priority: _SendPriority = _SendPriority.REQUEST
+    ):
         """
-        Sends a payload to the Gateway.
+        Sends a payload to the Gateway, and waits until it has been sent.
+
+        ---
+
+        Payloads are queued by their priority, and sent within the
+        send limit of the Gateway. Please see `_SendQueue` for more details.
+
+        ---
 
         Parameters
         ----------
         payload : `_GatewayPayload`
             The payload to send.
+        priority : `_SendPriority`, optional
+            The priority of the payload. Defaults to `REQUEST`.
         """
+        # Discord only takes ETF payloads in binary frames, and JSON ones in text
+        # frames, which are told apart by whether `bytes` or a `str` is sent.
+        if self._meta.encoding == "etf":
+            data = self._codec.dumpb(asdict(payload))
+        else:
+            data = self._codec.dumps(asdict(payload))
 
-        # TODO: implement the gateway rate limiting logic here.
-        # the theory of this is to "queue" dispatched informatoin
-        # from the Gateway when we enter a rate limit.
+        await self._sends.put(data, priority)
 
-        try:
-            json = dumps(asdict(payload))
-            resp = await self._conn.send_message(json)  # noqa
-        except ConnectionClosed:
-            logger.warn("The connection to Discord's Gateway has closed.")
-            await self._conn.aclose()
-            await self.reconnect()
+    async def _supervise(self):
+        """
+        Keeps a connection to the Gateway for as long as the client runs.
 
-    async def connect(self):
-        """Connects to the Gateway and initiates a WebSocket state."""
+        ---
+
+        Each connection runs until it has closed, after which a new one is
+        opened in its place by this loop. Connections that fail to become
+        ready are retried with an exponential backoff and jitter, until
+        `max_retries` is reached. Close codes that can never be recovered
+        from are raised straight away.
+
+        ---
+
+        Raises: `GatewayException`
+        """
         self._stopped = False
-        self._last_ack = [perf_counter(), perf_counter()]
 
-        # FIXME: this connection type will only work with JSON in mind.
-        # if other compression or encoding types are supplied, they
-        # will not be properly digested. This is only added so others
-        # may modify their GatewayClient to their liking.
+        try:
+            await self._reconnect_until_stopped()
+        finally:
+            # The dispatcher still empties the buffer out before stopping.
+            self._events.close()
+
+    async def _reconnect_until_stopped(self):
+        """
+        Opens connections to the Gateway one after another, until the client has stopped.
 
-        async with open_websocket_url(
-            f"{__gateway_url__}?v={self._meta.version}&encoding={self._meta.encoding}"
-            f"{'' if self._meta.compress is None else f'&compress={self._meta.compress}'}"
-        ) as self._conn:
-            self._closed = self._conn.closed
+        Raises: `GatewayException`
+        """
+        while not self._stopped:
+            code = await self.connect()
+            self._metrics.closed(code)
 
             if self._stopped:
-                await self._conn.aclose()
-            if self._closed:
-                await self._conn.aclose()
-                await self.reconnect()
+                break
+            if code in _FATAL_CLOSE_CODES:
+                raise GatewayException(code, _FATAL_CLOSE_CODES[code])
+            if code in _SESSION_CLOSE_CODES:
+                logger.info(f"The session was invalidated by the Gateway. (close code: {code})")
+                self._clear_session()
+
+            # Connections that never became ready are counted as failures,
+            # and push the backoff further out until one finally does.
+            if not self._sends.ready:
+                self._metrics.failures += 1
+
+            if self.max_retries is not None and self._metrics.failures > self.max_retries:
+                raise GatewayException(
+                    code, f"Could not connect to the Gateway after {self.max_retries} retries."
+                )
 
-            while not self._closed:
-                data = await self._receive()
+            delay = min(_BACKOFF_CAP, _BACKOFF_BASE * 2**self._metrics.failures) * random()
+            self._metrics.reconnects += 1
+            self._metrics.last_delay = delay
+            logger.info(
+                f"Reconnecting to the Gateway in {delay:.2f}s. "
+                f"(close code: {code}, failures: {self._metrics.failures})"
+            )
+            await sleep(delay)
+
+    def _clear_session(self):
+        """Clears the current session, so that the next connection identifies anew."""
+        self._meta.session_id = None
+        self._meta.seq = None
+        self._meta.resume_gateway_url = None
+
+    async def connect(self) -> int | None:
+        """
+        Connects to the Gateway, and runs the connection until it has closed.
 
-                if data:
-                    await self._track(data)
+        Returns
+        -------
+        `int`, optional
+            The code the connection was closed with. This is `None` when
+            the connection could not be opened.
+        """
+        self._last_ack = [perf_counter(), perf_counter()]
+
+        # Every connection has its own zlib context, so one from a prior
+        # connection can never be carried over.
+        self._inflator = decompressobj() if self._meta.compress == "zlib-stream" else None
+        self._buffer.clear()
+        self._sends.reset()
+
+        # Sessions may only be resumed through the URL given to us alongside them.
+        url = (
+            self._meta.resume_gateway_url
+            if self._meta.session_id and self._meta.resume_gateway_url
+            else __gateway_url__
+        )
+
+        try:
+            async with open_websocket_url(
+                f"{url.rstrip('/')}/?v={self._meta.version}&encoding={self._meta.encoding}"
+                f"{'' if self._meta.compress is None else f'&compress={self._meta.compress}'}"
+            ) as self._conn, open_nursery() as self._beats:
+                self._closed = False
+                self._metrics.connects += 1
+                self._beats.start_soon(self._sends.run, self._conn)
+
+                try:
+                    while not self._stopped:
+                        data = await self._receive()
+
+                        if data:
+                            await self._track(data)
+
+                    # Sessions are kept alive when stopping if they are
+                    # stored, so that they may be resumed on the next boot.
+                    code = 1000 if self._session_store is MISSING else _RESUME_CLOSE_CODE
+                    await self._conn.aclose(code=code)
+                    return code
+                except ConnectionClosed as err:
+                    logger.warn(
+                        f"The connection to Discord's Gateway has closed. (close code: {err.reason.code})"
+                    )
+                    return err.reason.code
+                finally:
+                    self._closed = True
+                    self._beats.cancel_scope.cancel()
+        except (HandshakeError, OSError) as err:
+            logger.warning(f"Could not connect to Discord's Gateway: {err!r}")
+            self._closed = True
+            return None
 
     async def reconnect(self):
-        """Reconnects to the Gateway and reinitiates a WebSocket state."""
-        self._closed = True
-        self._heartbeat_ack = False
+        """
+        Reconnects to the Gateway, resuming the current session.
 
-        if self._closed:
-            await self.connect()
-        else:
+        ---
+
+        The current connection is closed, and a new one is opened
+        in its place by the client.
+        """
+        if self._conn is None or self._conn.closed:
             logger.info("Told to reconnect, but did not need to.")
+            return
+
+        await self._conn.aclose(code=_RESUME_CLOSE_CODE)
 
     async def _track(self, payload: _GatewayPayload):
         """
@@ -352,23 +1288,37 @@ class GatewayClient(GatewayProtocol):
             f"{'' if payload.name is None else f' ({payload.name})'}"
         )
 
+        # Every dispatch moves the sequence forward, which is what we
+        # resume from and acknowledge in heartbeats.
+        if payload.sequence is not None:
+            self._meta.seq = payload.sequence
+
         match _GatewayOpCode(payload.opcode):
             case _GatewayOpCode.HELLO:
+                # The heartbeat is set up before anything else, and identifying
+                # happens off the reader, as it may have to wait on other shards
+                # first. Reading must carry on, or heartbeats go unacknowledged.
+                self._meta.heartbeat_interval = payload.data["heartbeat_interval"] / 1000
+                logger.debug(f"Heartbeat set to {self._meta.heartbeat_interval}ms.")
+                self._unacked_since = None
+                self._beats.start_soon(self._heartbeat, self._conn)
+                logger.debug("Began the heartbeat process.")
+
                 if self._meta.session_id:
                     logger.debug("Prior connection found, trying to resume.")
                     await self._resume()
                 else:
                     logger.debug("New connection found, identifying to the Gateway.")
-                    await self._identify()
-                    self._meta.heartbeat_interval = payload.data["heartbeat_interval"] / 1000
-                    logger.debug(f"Heartbeat set to {self._meta.heartbeat_interval}ms.")
-                    self._heartbeat_ack = True
-                    logger.debug("Began the heartbeat process.")
+                    self._beats.start_soon(self._identify)
+            case _GatewayOpCode.HEARTBEAT:
+                logger.debug("The Gateway has requested a heartbeat. Sending one immediately.")
+                await self._beat()
             case _GatewayOpCode.HEARTBEAT_ACK:
                 self._last_ack[1] = perf_counter()
+                self._unacked_since = None
+                self._latencies.append(self._last_ack[1] - self._last_ack[0])
                 logger.debug(f"The heartbeat was acknowledged. (took {self.latency}ms.)")
                 await self._dispatch("HEARTBEAT_ACK", HeartbeatAck, latency=self.latency)
-                self._last_ack[0] = perf_counter()
             case _GatewayOpCode.INVALID_SESSION:
                 logger.info(
                     "Our Gateway connection has suddenly invalidated. Checking reconnection status."
@@ -379,37 +1329,94 @@ class GatewayClient(GatewayProtocol):
                     logger.debug(
                         "The Gateway has told us to reconnect. Resuming last known connection."
                     )
-                    await self._resume()
                 else:
                     logger.debug(
                         "The given connection cannot be reconnected to. Starting new connection."
                     )
-                    self._meta.session_id = None
-                    await self._conn.aclose()
-                    await self.reconnect()
+                    self._clear_session()
+
+                await self._conn.aclose(code=_RESUME_CLOSE_CODE if payload.data else 1000)
             case _GatewayOpCode.RECONNECT:
                 logger.info("The Gateway has told us to reconnect. Resuming last known connection.")
                 await self._dispatch("RECONNECT", Reconnect)
-                await self._resume()
+
+                # Resuming is only possible on a new connection to the resume URL,
+                # which is done once we've been greeted by it with HELLO.
+                await self._conn.aclose(code=_RESUME_CLOSE_CODE)
             case _GatewayOpCode.DISPATCH:
-                if payload.name not in ["RESUMED", "READY"]:
-                    resource = _EventTable.lookup(payload.name)
-                    print(resource)
-                    await self._dispatch(payload.name, resource, **payload.data)
+                if payload.name == "GUILD_MEMBERS_CHUNK":
+                    await self._chunk(payload.data)
+
+                if payload.name in ["RESUMED", "READY"]:
+                    pass
+                elif self._listening(payload.name):
+                    await self._events.put(payload.name, payload.data)
+                else:
+                    # Most events, such as presences and typing, often have nothing
+                    # listening to them. These are dropped before any resource is made.
+                    self._metrics.skipped += 1
         match payload.name:
             case "RESUMED":
                 logger.debug(
                     f"The connection was resumed. (session: {self._meta.session_id}, sequence: {self._meta.seq}"
                 )
-                await self._dispatch("RESUMED", Resumed, **payload.data)
+                self._sends.open()
+                self._metrics.ready(resumed=True)
+                # Discord sends no data with this event, often not even an empty object.
+                await self._dispatch(
+                    "RESUMED", Resumed, session_id=self._meta.session_id, seq=self._meta.seq
+                )
             case "READY":
                 self._meta.session_id = payload.data["session_id"]
-                self._meta.seq = payload.sequence
+                self._meta.resume_gateway_url = payload.data.get("resume_gateway_url")
                 logger.debug(
                     f"The Gateway has declared a ready connection. (session: {self._meta.session_id}, sequence: {self._meta.seq}"
                 )
+                self._sends.open()
+                self._metrics.ready(resumed=False)
                 await self._dispatch("READY", Ready, **payload.data)
 
+    async def _chunk(self, data: dict):
+        """
+        Hands a chunk of guild members to the stream that requested it, if any.
+
+        ---
+
+        The stream is given up on when it is closed, or has not made room
+        for the chunk in time. See `_CHUNK_STALL` for the time waited.
+
+        ---
+
+        Parameters
+        ----------
+        data : `dict`
+            The data of the `GUILD_MEMBERS_CHUNK` event.
+        """
+        if (stream := self._chunks.get(nonce := data.get("nonce"))) is None:
+            return
+
+        chunk = _EventTable.deserialize(GuildMembersChunk, "guild_members_chunk", MISSING, **data)
+
+        with move_on_after(_CHUNK_STALL) as scope:
+            try:
+                await stream.send(chunk)
+                return
+            except BrokenResourceError:
+                pass
+
+        if scope.cancelled_caught:
+            logger.warning(f"The stream of guild members {nonce} fell behind. Closing it.")
+
+        self._chunks.pop(nonce, None)
+        stream.close()
+
+    async def _dispatcher(self):
+        """Dispatches the events inside of the buffer, until it has been closed and emptied."""
+        while (event := await self._events.get()) is not None:
+            name, data = event
+            resource = _EventTable.lookup(name)
+            await self._dispatch(name, data if resource is None else resource, **data)
+
     async def _hook(self, bot: "Bot"):  # noqa
         """
         Hooks the Gateway to a bot for event dispatching.
@@ -433,6 +1440,23 @@ class GatewayClient(GatewayProtocol):
         logger.debug("Hooking the bot into the Gateway.")
         self._bots.append(bot)
 
+    def _listening(self, name: str) -> bool:
+        """
+        Checks whether any hooked bot is listening to an event.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event.
+
+        Returns
+        -------
+        `bool`
+            Whether the event is listened to or not.
+        """
+        name = name.lower()
+        return any(bot._listens(name) for bot in self._bots)
+
     async def _dispatch(self, _name: str, data: dict | _Event | MISSING, *args, **kwargs):
         """
         Dispatches an event from the Gateway.
@@ -458,24 +1482,41 @@ class GatewayClient(GatewayProtocol):
             The supplied payload data from the event.
 
             If a resource was not able to be found for
-            the event called for, `MISSING` will be given.
+            the event called for, the raw `dict` is given.
         """
-        logger.debug(f"Dispatching {_name}: {data if isinstance(data, dict) else kwargs}")
+        if logger.isEnabledFor(DEBUG):
+            logger.debug(f"Dispatching {_name}: {data if isinstance(data, dict) else kwargs}")
 
         for bot in self._bots:
-            if isinstance(data, dict) or isinstance(data, MISSING):
+            # The cache only stores raw data, which events with a class of
+            # their own are otherwise not triggered with.
+            if not isinstance(data, dict) and kwargs:
+                await bot.cache._update(_name.lower(), kwargs)
+
+                # Events only fed to the cache, such as guild member chunks
+                # of a large guild, are never built into their class.
+                if not bot._calls.get(_name.lower()):
+                    continue
+
+            if isinstance(data, dict) or data is MISSING:
                 await bot._trigger(_name.lower(), data)
+            elif self.lazy and not args:
+                await bot._trigger(
+                    _name.lower(),
+                    Lazy(
+                        data,
+                        kwargs,
+                        _name=_name.lower(),
+                        _bot=bot if "id" in kwargs else MISSING,
+                    ),
+                )
             else:
-                # FIXME: write a better sanitiser for internal values that
-                # may be passed to us by Discord.
+                # Fields unknown to the event are left out by its deserializer.
                 # See important note: https://discord.com/developers/docs/topics/gateway#gateways
                 await bot._trigger(
                     _name.lower(),
-                    data(
-                        _name.lower(),
-                        bot if "id" in kwargs else MISSING,
-                        *args,
-                        **{k: v for k, v in kwargs.items() if not k.startswith("_")},
+                    _EventTable.deserialize(
+                        data, _name.lower(), bot if "id" in kwargs else MISSING, *args, **kwargs
                     ),
                 )
 
@@ -489,8 +1530,13 @@ class GatewayClient(GatewayProtocol):
                 "properties": {"os": platform, "browser": "retux", "device": "retux"},
             },
         )
+
+        if self._meta.shard is not None:
+            payload.data["shard"] = self._meta.shard
+        if self._identify_gate is not None:
+            await self._identify_gate(0 if self._meta.shard is None else self._meta.shard[0])
         logger.debug("Sending an identification payload to the Gateway.")
-        await self._send(payload)
+        await self._send(payload, _SendPriority.CONNECTION)
 
     async def _resume(self):
         """Sends a resuming payload to the Gateway."""
@@ -503,25 +1549,59 @@ class GatewayClient(GatewayProtocol):
             },
         )
         logger.debug("Sending a resuming payload to the Gateway.")
-        await self._send(payload)
+        await self._send(payload, _SendPriority.CONNECTION)
 
-    async def _heartbeat(self):
-        """Sends a heartbeat payload to the Gateway."""
-        payload = _GatewayPayload(op=_GatewayOpCode.HEARTBEAT.value, d=self._meta.seq)
+    async def _heartbeat(self, conn: WebSocketConnection):
+        """
+        Sends heartbeat payloads to the Gateway for as long as a connection lasts.
 
-        # FIXME: Move towards a better solution for the heartbeat acknowledgement loop.
-        # This is a really bad approach to fixing heartbeat timing, but this only fires
-        # during the initialisation of the async context manager.
-        # Please spare me Bluenix.
+        ---
 
-        logger.debug("Waiting the appropriate time for probable connection.")
-        await sleep(1)
+        The first heartbeat is sent after a random fraction of the interval,
+        as Discord asks of us, so that clients reconnecting at once do not
+        all beat together. Each heartbeat must be acknowledged within an
+        interval of being sent, including those the Gateway asked for.
+        Otherwise, the connection is taken as a "zombie" and is closed,
+        so that the session may be resumed on a new one.
 
-        while self._heartbeat_ack:
-            logger.debug("Sending a heartbeat payload to the Gateway.")
-            await self._send(payload)
+        ---
+
+        Parameters
+        ----------
+        conn : `trio_websocket.WebSocketConnection`
+            The connection to send heartbeats on.
+        """
+        logger.debug("Waiting a jittered interval before the first heartbeat.")
+        await sleep(self._meta.heartbeat_interval * random())
+
+        while self._conn is conn and not conn.closed:
+            if (
+                self._unacked_since is not None
+                and current_time() >= self._unacked_since + self._meta.heartbeat_interval
+            ):
+                logger.warning(
+                    "The last heartbeat was never acknowledged. Closing the zombie connection."
+                )
+                await conn.aclose(code=_RESUME_CLOSE_CODE)
+                return
+
+            await self._beat()
             await sleep(self._meta.heartbeat_interval)
 
+    async def _beat(self):
+        """Sends a heartbeat payload to the Gateway."""
+        logger.debug("Sending a heartbeat payload to the Gateway.")
+        self._last_ack[0] = perf_counter()
+
+        # A beat the Gateway asks for right before one is due does not cut
+        # short the time given to acknowledge the one before it.
+        if self._unacked_since is None:
+            self._unacked_since = current_time()
+        await self._send(
+            _GatewayPayload(op=_GatewayOpCode.HEARTBEAT.value, d=self._meta.seq),
+            _SendPriority.CONNECTION,
+        )
+
     async def request_guild_members(
         self,
         guild_id: Snowflake,
@@ -562,7 +1642,7 @@ class GatewayClient(GatewayProtocol):
         payload = _GatewayPayload(
             op=_GatewayOpCode.REQUEST_GUILD_MEMBERS,
             d={
-                "guild_id": guild_id,
+                "guild_id": str(guild_id),
                 "query": "" if query is MISSING else query,
                 "limit": 0 if limit is MISSING else limit,
             },
@@ -571,13 +1651,123 @@ class GatewayClient(GatewayProtocol):
         if presences is not MISSING:
             payload.data["presences"] = presences
         if user_ids is not MISSING:
-            payload.data["user_ids"] = user_ids
+            payload.data["user_ids"] = (
+                [str(user_id) for user_id in user_ids]
+                if isinstance(user_ids, list)
+                else str(user_ids)
+            )
         if nonce is not MISSING:
             payload.data["nonce"] = nonce
 
         logger.debug("Sending a payload requesting for guild members to the Gateway.")
         await self._send(payload)
 
+    async def stream_guild_members(
+        self,
+        guild_id: Snowflake,
+        *,
+        query: NotNeeded[str] = MISSING,
+        limit: NotNeeded[int] = MISSING,
+        presences: NotNeeded[bool] = MISSING,
+        user_ids: NotNeeded[Snowflake | list[Snowflake]] = MISSING,
+        buffer: int = 2,
+        timeout: float | None = 30.0,
+    ) -> AsyncIterator[GuildMembersChunk]:
+        """
+        Requests guild members from the Gateway, and streams the chunks answering it.
+
+        ---
+
+        The request is sent with a nonce of its own, which its chunks are
+        told apart by. Each chunk is given as soon as it is received, so
+        that every member of a large guild may be gone through without
+        holding onto them all at once. The stream ends with the last chunk.
+
+        Only `buffer` chunks are held onto while waiting to be read. Any
+        further chunks are waited on, up to a few seconds, after which the
+        stream is given up on. This should be used as an `async for` loop:
+
+        ```py
+        async for chunk in gateway.stream_guild_members(guild_id):
+            for member in chunk.members:
+                ...
+        ```
+
+        The IDs of any users requested who are not members are given
+        in the `not_found` field of each chunk.
+
+        ---
+
+        Parameters
+        ----------
+        guild_id : `Snowflake`
+            The ID of the guild to request from.
+        query : `str`, optional
+            The name of the guild member(s). If you're looking to
+            receive all members of a guild, this is left untouched.
+        limit : `int`, optional
+            How many guild members you wish to return. See
+            `request_guild_members` for more details.
+        presences : `bool`, optional
+            Whether you only want to receive guild members with
+            a presence. The `GUILD_PRESENCES` intent must be
+            enabled in order to use.
+        user_ids : `Snowflake` or `list[Snowflake]`, optional
+            The IDs of members in the guild to return.
+        buffer : `int`, optional
+            The amount of chunks held onto while waiting to be read.
+            Defaults to `2`, with up to 1000 members each.
+        timeout : `float`, optional
+            The most time in seconds waited on each chunk. Defaults
+            to `30` seconds, or forever when `None`.
+
+        Returns
+        -------
+        `typing.AsyncIterator[GuildMembersChunk]`
+            The chunks answering the request, in order.
+
+        Raises
+        ------
+        `GatewayException`
+            A chunk was not received in time, or the stream fell behind.
+        """
+        nonce = uuid4().hex
+        send, receive = open_memory_channel(buffer)
+        self._chunks[nonce] = send
+
+        try:
+            await self.request_guild_members(
+                guild_id,
+                query=query,
+                limit=limit,
+                presences=presences,
+                user_ids=user_ids,
+                nonce=nonce,
+            )
+
+            with receive:
+                while True:
+                    with move_on_after(float("inf") if timeout is None else timeout) as scope:
+                        try:
+                            chunk = await receive.receive()
+                        except EndOfChannel:
+                            raise GatewayException(
+                                None, f"The stream of guild members {nonce} fell behind."
+                            ) from None
+
+                    if scope.cancelled_caught:
+                        raise GatewayException(
+                            None, f"A chunk of guild members {nonce} was not received in time."
+                        )
+
+                    yield chunk
+
+                    if chunk.last:
+                        return
+        finally:
+            if self._chunks.get(nonce) is send:
+                del self._chunks[nonce]
+
     async def update_voice_state(
         self,
         guild_id: Snowflake,
@@ -606,8 +1796,8 @@ class GatewayClient(GatewayProtocol):
         payload = _GatewayPayload(
             op=_GatewayOpCode.VOICE_STATE_UPDATE,
             d={
-                "guild_id": guild_id,
-                "channel_id": None if channel_id is MISSING else channel_id,
+                "guild_id": str(guild_id),
+                "channel_id": None if channel_id is MISSING else str(channel_id),
                 "self_mute": False if self_mute is MISSING else self_mute,
                 "self_deaf": False if self_deaf is MISSING else self_deaf,
             },
@@ -618,7 +1808,23 @@ class GatewayClient(GatewayProtocol):
     @property
     def latency(self) -> float:
         """
-        The calculated difference between the last known set
-        of acknowledgements for a Gateway event.
+        The calculated difference between the last heartbeat
+        sent and its acknowledgement from the Gateway.
+        """
+        return self._latencies[-1] if self._latencies else 0.0
+
+    @property
+    def latency_history(self) -> list[float]:
+        """The latencies of the most recent heartbeats, from oldest to newest."""
+        return list(self._latencies)
+
+    @property
+    def metrics(self) -> dict:
+        """
+        The metrics of the client's connections, such as how often it has
+        reconnected, and of its event buffer under `events`.
         """
-        return self._last_ack[1] - self._last_ack[0]
+        return {
+            **asdict(self._metrics, filter=lambda attr, _: not attr.name.startswith("_")),
+            "events": self._events.metrics,
+        }
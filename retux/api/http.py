@@ -1,20 +1,27 @@
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
 from enum import Enum
-from json import dumps, loads
-from logging import INFO, getLogger
+from importlib.util import find_spec
+from json import dumps
+from logging import DEBUG, INFO, WARNING, getLogger
 from sys import version_info
-from typing import Protocol
+from typing import Any, AsyncIterator, Protocol
 
 from attrs import define, field
-from httpx import AsyncClient, QueryParams, Response, __version__ as __http_version__
-from trio import Event, sleep
+from httpx import AsyncClient, Limits, QueryParams, Response, __version__ as __http_version__
+from trio import Event, Lock, TooSlowError, current_time, fail_after, sleep, sleep_until
 
+from .codec import _Codec, get_codec
 from .error import HTTPException
 
 from ..const import MISSING, NotNeeded, __api_url__, __repo_url__, __version__
 
 logger = getLogger(__name__)
 
-__all__ = ("_RouteMethod", "_Route", "_Limit", "HTTPClient")
+__all__ = ("_RouteMethod", "_Route", "_Limit", "_RateLimiter", "_Flight", "HTTPClient")
+
+_RATE_LIMIT_RETRIES = 5
+"""The amount of rate limits in a row a request is tried again after before giving up."""
 
 
 class _RouteMethod(Enum):
@@ -26,21 +33,21 @@ class _RouteMethod(Enum):
     DELETE = "DELETE"
 
 
-@define(slots=False)
+@define()
 class _Route:
     """
     Represents a route path to an API endpoint.
 
     By standard nature, the route will only contain the relevant sending details,
     such as the method and path. However, in the event of a rate limit that applies
-    to the route specifically, some fields will be populated such as `channel_id`
-    and `guild_id` for "per-route" rate limitation.
+    to the route specifically, some fields will be populated such as `channel_id`,
+    `guild_id` and `webhook_id` for "per-route" rate limitation.
 
     ---
 
-    `channel_id` and `guild_id` are considered as top-level identifiers. On a given
-    representation, these will be excluded. You will need to call these values
-    separately in order to retrieve their values.
+    `channel_id`, `guild_id`, `webhook_id` and `webhook_token` are considered as
+    top-level identifiers. On a given representation, these will be excluded. You
+    will need to call these values separately in order to retrieve their values.
     """
 
     method: _RouteMethod = field(converter=_RouteMethod)
@@ -51,6 +58,10 @@ class _Route:
     """The channel ID associated with this route. This is for route-based rate limits."""
     guild_id: str = field(default=None)
     """The guild ID associated with this route. This is for route-based rate limits."""
+    webhook_id: str = field(default=None)
+    """The webhook ID associated with this route. This is for route-based rate limits."""
+    webhook_token: str = field(default=None)
+    """The webhook token associated with this route. This is for route-based rate limits."""
 
     def __str__(self) -> str:
         # We'll be associating our route as just the base URL for the API
@@ -79,30 +90,399 @@ class _Route:
             If the bucket is not shared, the bucket will be based off of what Discord's
             currently provided to us as the route's information.
         """
-        return (
-            f"{self.channel_id}:{self.guild_id}:{self.path}"
-            if shared is MISSING
-            else f"{self.channel_id}:{self.guild_id}:{shared}"
-        )
+        major = f"{self.channel_id}:{self.guild_id}:{self.webhook_id}:{self.webhook_token}"
+        return f"{major}:{self.path}" if shared is MISSING else f"{major}:{shared}"
+
+    @property
+    def endpoint(self) -> str:
+        """The method and path of the route, used to look up its bucket hash."""
+        return f"{self.method.value} {self.path}"
 
 
-@define(slots=False)
+@define()
 class _Limit:
-    """Represents a bucket that exists for a route."""
+    """
+    Represents a bucket that exists for a route.
+
+    ---
+
+    A bucket is only known once Discord has given one back to us
+    through the `X-RateLimit-*` headers of a response. Until then,
+    `limit` and `remaining` are left as `None` and requests to the
+    bucket are made one at a time.
+
+    Requests waiting on a bucket are held in `queue` in the order
+    they were made, which only lets through as many requests as
+    there are `remaining` in the current window.
+    """
+
+    bucket: str | None = field(default=None)
+    """The hash of the bucket given by Discord, if known."""
+    limit: int | None = field(default=None)
+    """The amount of requests allowed per window of the bucket, if known."""
+    remaining: int | None = field(default=None)
+    """The amount of requests remaining in the current window, if known."""
+    reset_at: float = field(default=0.0)
+    """The time on the `trio` clock at which the bucket resets. Defaults to `0.0`."""
+    window: float = field(default=0.0)
+    """The length in seconds of a window of the bucket, as last seen. Defaults to `0.0`."""
+    queue: Lock = field(factory=Lock, repr=False)
+    """The first-in, first-out queue of requests waiting on the bucket."""
+
+    @property
+    def reset_after(self) -> float:
+        """The time remaining before the bucket resets."""
+        return max(self.reset_at - current_time(), 0.0)
+
+    @property
+    def exhausted(self) -> bool:
+        """Whether the bucket has no requests left for its current window or not."""
+        return self.remaining == 0 and self.reset_at > current_time()
+
+    def take(self):
+        """Takes a request out of the current window of the bucket."""
+        now = current_time()
+
+        if self.reset_at <= now and self.limit is not None:
+            # The last window has passed, so a new one is started with the
+            # length we last saw until Discord tells us otherwise.
+            self.remaining = self.limit
+            self.reset_at = now + self.window
+        if self.remaining:
+            self.remaining -= 1
+
+    def lock(self, reset_after: float):
+        """
+        Locks the bucket down until it resets.
+
+        Parameters
+        ----------
+        reset_after : `float`
+            The time in seconds before the bucket resets.
+        """
+        self.remaining = 0
+        self.reset_at = current_time() + reset_after
+
+
+@define()
+class _Flight:
+    """
+    Represents a `GET` request in flight, which others asking for the same may wait on.
+
+    ---
+
+    Concurrent requests for the same resource, such as many interactions
+    asking for the same guild at once, are coalesced into the first one
+    made. Everyone waiting is then given back the same result.
+    """
+
+    done: Event = field(factory=Event, repr=False)
+    """The event set once the request has finished."""
+    result: Any = field(default=None)
+    """The JSON given back by the request, once finished."""
+    error: BaseException | None = field(default=None)
+    """The exception raised by the request, if any."""
+    cancelled: bool = field(default=False)
+    """Whether the request was cancelled before finishing or not."""
+    waiters: int = field(default=0)
+    """The amount of requests coalesced into this one."""
+
+
+class _RateLimiter:
+    """
+    Tracks the rate limits of the REST API from the headers Discord
+    gives back to us, and holds requests back before they would exceed them.
+
+    ---
+
+    Discord groups routes together into buckets, which are identified
+    by the `X-RateLimit-Bucket` header. A bucket is then split up further
+    by the top-level identifiers of a route, such as `channel_id`.
+    Routes are mapped onto their bucket hash as soon as it has been seen.
+
+    Every request also passes through a single gate for the global
+    rate limit, right before it is made. The gate counts the requests
+    let through within the last second, and never lets through more
+    than `global_limit` inside of any second. Only the request at the
+    front of the gate ever sleeps, and the rest are queued behind it in order.
+
+    ---
+
+    Attributes
+    ----------
+    _buckets : `dict[str, str]`
+        The bucket hashes, stored by the endpoint of their route.
+    _limits : `dict[str, _Limit]`
+        The rate limits, stored by their bucket and top-level identifiers.
+    _global : `_Limit`
+        The global rate limit state.
+    _gate : `trio.Lock`
+        The first-in, first-out queue of requests waiting on the global rate limit.
+    _global_limit : `int`
+        The amount of requests allowed per second globally.
+    _passed : `collections.deque[float]`
+        The times on the `trio` clock of requests let through the global gate in the last second.
+    _max_wait : `float`, optional
+        The longest time in seconds a request may wait on a rate limit.
+    """
+
+    __slots__ = (
+        "_buckets",
+        "_limits",
+        "_global",
+        "_gate",
+        "_global_limit",
+        "_passed",
+        "_max_wait",
+    )
+    _buckets: dict[str, str]
+    """The bucket hashes, stored by the endpoint of their route."""
+    _limits: dict[str, _Limit]
+    """The rate limits, stored by their bucket and top-level identifiers."""
+    _global: _Limit
+    """The global rate limit state."""
+    _gate: Lock
+    """The first-in, first-out queue of requests waiting on the global rate limit."""
+    _global_limit: int
+    """The amount of requests allowed per second globally."""
+    _passed: deque[float]
+    """The times on the `trio` clock of requests let through the global gate in the last second."""
+    _max_wait: float | None
+    """The longest time in seconds a request may wait on a rate limit."""
+
+    def __init__(self, *, global_limit: int = 50, max_wait: float | None = None):
+        """
+        Creates a new rate limiter.
+
+        Parameters
+        ----------
+        global_limit : `int`, optional
+            The amount of requests allowed per second globally. Defaults to `50`.
+        max_wait : `float`, optional
+            The longest time in seconds a request may wait on a rate limit
+            before giving up. Defaults to waiting for as long as needed.
+        """
+        self._buckets = {}
+        self._limits = {}
+        self._global = _Limit()
+        self._gate = Lock()
+        self._global_limit = global_limit
+        self._passed = deque()
+        self._max_wait = max_wait
+
+    def get(self, route: _Route) -> _Limit:
+        """
+        Gets the rate limit of a route, creating one if it does not exist yet.
+
+        Parameters
+        ----------
+        route : `_Route`
+            The route to get the rate limit of.
+
+        Returns
+        -------
+        `_Limit`
+            The rate limit of the route.
+        """
+        bucket = self._buckets.get(route.endpoint, MISSING)
+        key = route.get_bucket(shared=route.endpoint if bucket is MISSING else bucket)
+
+        if (limit := self._limits.get(key)) is None:
+            limit = self._limits[key] = _Limit(bucket=None if bucket is MISSING else bucket)
+
+        return limit
+
+    @asynccontextmanager
+    async def acquire(self, route: _Route) -> AsyncIterator[_Limit]:
+        """
+        Waits until a request may be made on a route without being rate limited.
+
+        ---
+
+        This is an asynchronous context manager, and the request should
+        be made inside of it. If the bucket of the route is not known yet,
+        the request will hold the bucket until the context is left.
+
+        ---
+
+        Parameters
+        ----------
+        route : `_Route`
+            The route a request is being made to.
+
+        Returns
+        -------
+        `_Limit`
+            The rate limit of the route.
+
+        Raises: `HTTPException`
+        """
+        limit = self.get(route)
+        held = False
+
+        try:
+            with self._waiting(route):
+                await limit.queue.acquire()
+                held = True
+
+                if limit.remaining is not None:
+                    if limit.exhausted:
+                        logger.warning(
+                            f"The bucket of {route.endpoint} is still under a rate limit. Trying again in {limit.reset_after}s."
+                        )
+                        await sleep_until(limit.reset_at)
+
+                    limit.take()
+                    limit.queue.release()
+                    held = False
+
+                # The global gate is passed last, so that the time it counts
+                # a request at is the time the request is actually made.
+                await self._pass_gate()
+
+            yield limit
+        finally:
+            if held:
+                limit.queue.release()
+
+    @contextmanager
+    def _waiting(self, route: _Route):
+        """
+        Bounds the time spent waiting on a rate limit by `_max_wait`.
+
+        Parameters
+        ----------
+        route : `_Route`
+            The route a request is being made to.
+
+        Raises: `HTTPException`
+        """
+        if self._max_wait is None:
+            yield
+            return
+
+        try:
+            with fail_after(self._max_wait):
+                yield
+        except TooSlowError:
+            raise HTTPException(
+                {
+                    "code": 429,
+                    "message": f"Waited longer than {self._max_wait}s on the rate limit of {route.endpoint}.",
+                },
+                severity=WARNING,
+            ) from None
+
+    async def _pass_gate(self):
+        """Waits for a request to pass through the global rate limit."""
+        async with self._gate:
+            if self._global.exhausted:
+                logger.warning(
+                    f"There is still a global rate limit ongoing. Trying again in {self._global.reset_after}s."
+                )
+                await sleep_until(self._global.reset_at)
+
+            while True:
+                now = current_time()
+
+                while self._passed and self._passed[0] <= now - 1:
+                    self._passed.popleft()
+
+                if len(self._passed) < self._global_limit:
+                    break
+
+                await sleep_until(self._passed[0] + 1)
+
+            self._passed.append(now)
+
+    def update(self, route: _Route, limit: _Limit, resp: Response, json: dict | None):
+        """
+        Updates the rate limit of a route from the response given back to us.
+
+        Parameters
+        ----------
+        route : `_Route`
+            The route a request was made to.
+        limit : `_Limit`
+            The rate limit the request was made under.
+        resp : `httpx.Response`
+            The response of the request.
+        json : `dict`, optional
+            The JSON body of the response, if present.
+        """
+        headers = resp.headers
+
+        if (bucket := headers.get("X-RateLimit-Bucket")) and bucket != limit.bucket:
+            self._buckets[route.endpoint] = bucket
+            self._limits.pop(route.get_bucket(shared=route.endpoint), None)
+
+            # Another route may have already told us about this bucket,
+            # in which case its state is shared rather than replaced.
+            limit.bucket = bucket
+            limit = self._limits.setdefault(route.get_bucket(shared=bucket), limit)
+            logger.debug(f"Mapped {route.endpoint} onto the bucket {bucket}.")
+
+        if "X-RateLimit-Limit" in headers:
+            limit.limit = int(headers["X-RateLimit-Limit"])
+        if "X-RateLimit-Remaining" in headers and "X-RateLimit-Reset-After" in headers:
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_after = float(headers["X-RateLimit-Reset-After"])
+            reset_at = current_time() + reset_after
+            limit.window = max(limit.window, reset_after)
+
+            # Responses from the same window may come back out of order,
+            # so we only trust the lowest count until a new window starts.
+            if limit.remaining is None or reset_at > limit.reset_at + 0.1:
+                limit.remaining = remaining
+                limit.reset_at = reset_at
+            else:
+                limit.remaining = min(limit.remaining, remaining)
+
+        if resp.status_code != 429:
+            return
+
+        body = json if isinstance(json, dict) else {}
+        retry_after = float(
+            body.get("retry_after")
+            or headers.get("Retry-After")
+            or headers.get("X-RateLimit-Reset-After")
+            or 1.0
+        )
 
-    event: Event = field(default=Event())
-    """The asynchronous event associated to the bucket, used for blocking conditions."""
-    reset_after: float = field(default=0.0)
-    """The time remaining before the event may be reset. Defaults to `0.0`."""
+        if body.get("global") or headers.get("X-RateLimit-Global", "").lower() == "true":
+            logger.warning(
+                f"A global rate limit has occured. Locking down future requests for {retry_after}s."
+            )
+            self._global.lock(retry_after)
+        else:
+            logger.warning(
+                f"A route-based rate limit has occured on {route.endpoint}. "
+                f"Locking down future requests for {retry_after}s."
+            )
+            limit.lock(retry_after)
 
 
 class HTTPProtocol(Protocol):
-    def __init__(self, token: str):
+    def __init__(
+        self,
+        token: str,
+        *,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        global_limit: int = 50,
+        max_rate_limit_wait: float | None = None,
+        codec: NotNeeded[str | _Codec] = MISSING,
+    ):
         ...
 
     async def request(self, route: _Route, payload: dict, retries: NotNeeded[int] = MISSING):
         ...
 
+    async def aclose(self):
+        ...
+
 
 class HTTPClient(HTTPProtocol):
     """
@@ -116,35 +496,74 @@ class HTTPClient(HTTPProtocol):
         The bot's token.
     _headers : `dict[str]`
         HTTP headers sent for authorisation purposes.
-    _limits : `dict[_Route, str]`
-        The buckets currently stored.
-    _rate_limits : `dict[str, _Limit]`
-        The rate limits currently stored.
-    _global_rate_limit : `_Limit`
-        The global rate limit state.
+    _client : `httpx.AsyncClient`
+        The pooled HTTP connection shared across every request.
+    _limiter : `_RateLimiter`
+        The rate limits of the REST API currently tracked.
+    _codec : `_Codec`
+        The codec used on payloads.
+    _flights : `dict[str, _Flight]`
+        The `GET` requests currently in flight, by their method, URL and query.
     """
 
-    __slots__ = ("token", "_headers")
+    __slots__ = ("token", "_headers", "_client", "_limiter", "_codec", "_flights")
     token: str
     """The bot's token."""
     _headers: dict[str, str]
     """HTTP headers sent for authorisation purposes."""
-    _buckets: dict[_Route, str] = {}
-    """The buckets currently stored."""
-    _rate_limits: dict[str, _Limit] = {}
-    """The rate limits currently stored."""
-    _global_rate_limit: _Limit = _Limit()
-    """The global rate limit state.
-"""
-
-    def __init__(self, token: str):
+    _client: AsyncClient
+    """The pooled HTTP connection shared across every request."""
+    _limiter: _RateLimiter
+    """The rate limits of the REST API currently tracked."""
+    _codec: _Codec
+    """The codec used on payloads."""
+    _flights: dict[str, _Flight]
+    """The `GET` requests currently in flight, by their method, URL and query."""
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        http2: bool = True,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        global_limit: int = 50,
+        max_rate_limit_wait: float | None = None,
+        codec: NotNeeded[str | _Codec] = MISSING,
+    ):
         """
         Creates a new connection to the REST API.
 
+        ---
+
+        Connections made to the REST API are pooled and kept alive
+        for the lifetime of the client, so that requests do not need
+        to repeat a TCP and TLS handshake each time. The pool must be
+        closed with `aclose()` once the client is no longer needed.
+
+        ---
+
         Parameters
         ----------
         token : `str`
             The bot's token to connect with.
+        http2 : `bool`, optional
+            Whether to multiplex requests over HTTP/2 or not. Defaults to `True`.
+            This requires the `h2` package, and falls back to HTTP/1.1 without it.
+        max_connections : `int`, optional
+            The maximum amount of connections open at once. Defaults to `100`.
+        max_keepalive_connections : `int`, optional
+            The maximum amount of idle connections kept alive. Defaults to `20`.
+        keepalive_expiry : `float`, optional
+            The time in seconds an idle connection is kept alive for. Defaults to `30.0`.
+        global_limit : `int`, optional
+            The amount of requests allowed per second globally. Defaults to `50`.
+        max_rate_limit_wait : `float`, optional
+            The longest time in seconds a request may wait on a rate limit before
+            giving up. Defaults to waiting for as long as needed.
+        codec : `str`, `_Codec`, optional
+            The codec to use on payloads. Defaults to the fastest one installed.
         """
         self.token = token
         self._headers = {
@@ -154,11 +573,108 @@ class HTTPClient(HTTPProtocol):
             f"Python/{version_info[0]}.{version_info[1]} "
             f"httpx/{__http_version__}",
         }
+        self._limiter = _RateLimiter(global_limit=global_limit, max_wait=max_rate_limit_wait)
+        self._codec = get_codec(codec)
+        self._flights = {}
+
+        if http2 and find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 was requested, but h2 is not installed. Falling back to HTTP/1.1."
+            )
+            http2 = False
+
+        self._client = AsyncClient(
+            headers=self._headers,
+            http2=http2,
+            limits=Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.aclose()
+
+    async def aclose(self):
+        """Closes every pooled connection to the REST API."""
+        if not self._client.is_closed:
+            logger.debug("Closing the pooled connections to the REST API.")
+            await self._client.aclose()
 
     async def request(self, route: _Route, payload: dict, retries: NotNeeded[int] = MISSING):
         """
         Makes a request to Discord's REST API.
 
+        ---
+
+        `GET` requests made while an identical one is already in flight
+        are not sent again. They wait on the one in flight instead, and
+        are given back the same JSON. Should the request in flight be
+        cancelled, one of those waiting makes it again in its place.
+
+        ---
+
+        Attributes
+        ----------
+        route : `_Route`
+            The route of the API endpoint.
+        payload : `dict`
+            The payload to send with the request. If you're making
+            a `GET` or `DELETE` call, this dictionary is automatically
+            converted into a query-parameter string.
+        retries : `int`, optional
+            The amount of retries to make if an HTTP request fails.
+            Defaults to `1`.
+
+        Returns
+        -------
+        `dict`
+            The JSON associated with the HTTP request.
+
+        Raises: `HTTPException`
+        """
+        if route.method is not _RouteMethod.GET:
+            return await self._request(route, payload, retries)
+
+        key = f"{route} {QueryParams(**payload)}"
+
+        while (flight := self._flights.get(key)) is not None:
+            flight.waiters += 1
+            await flight.done.wait()
+
+            if flight.error is not None:
+                raise flight.error
+            if not flight.cancelled:
+                return flight.result
+
+        flight = self._flights[key] = _Flight()
+
+        try:
+            flight.result = await self._request(route, payload, retries)
+            return flight.result
+        except Exception as err:
+            flight.error = err
+            raise
+        except BaseException:
+            # Cancellation belongs to the task it was raised in, and so is
+            # never handed to those waiting. They make the request again.
+            flight.cancelled = True
+            raise
+        finally:
+            del self._flights[key]
+            flight.done.set()
+
+            if flight.waiters:
+                logger.debug(f"Coalesced {flight.waiters} requests into GET {route}.")
+
+    async def _request(self, route: _Route, payload: dict, retries: NotNeeded[int] = MISSING):
+        """
+        Makes a request to Discord's REST API, without coalescing it.
+
         Attributes
         ----------
         route : `_Route`
@@ -182,71 +698,66 @@ class HTTPClient(HTTPProtocol):
         # TODO: Allow a reason field to be passed for audit log
         # purposes.
 
-        if self._global_rate_limit.event.is_set() and self._global_rate_limit.reset_after != 0:
-            logger.warning(
-                f"There is still a global rate limit ongoing. Trying again in {self._global_rate_limit.reset_after}s."
-            )
-            await self._global_rate_limit.event.wait(self._global_rate_limit.reset_after)
-            self._global_rate_limit.reset_after = 0.0
-        elif self._global_rate_limit.reset_after == 0.0:
-            self._global_rate_limit.event = Event()
-
-        bucket_path = route.get_bucket()
-        rate_limit = self._rate_limits.get(bucket_path)
-        if rate_limit:
-            if rate_limit.event.is_set() and rate_limit.reset_after != 0:
-                logger.warning(
-                    f"The current bucket {bucket_path} is still under a rate limit. Trying again in {rate_limit.reset_after}s."
-                )
-                await rate_limit.event.wait(rate_limit.reset_after)
-                rate_limit.reset_after = 0.0
-            elif rate_limit.reset_after == 0.0:
-                rate_limit.event = Event()
-        else:
-            self._rate_limits[bucket_path] = _Limit()
-
         retry_attempts = 1 if retries is MISSING else retries
         for attempt in range(retry_attempts):
             try:
                 resp: Response
+                rate_limited = 0
 
-                async with AsyncClient(headers=self._headers) as client:
-                    if route.method in (_RouteMethod.POST, _RouteMethod.PUT):
-                        resp = await client.request(route.method.value, str(route), json=payload)
-                    elif route.method in (_RouteMethod.GET, _RouteMethod.DELETE):
-                        resp = await client.request(
-                            route.method.value,
-                            str(route),
-                            params=QueryParams(**payload),
-                        )
-
-                    json = resp.json()
-                    logger.debug(f"{route.method} {route}: {resp.status_code}")
-                    logger.debug(dumps(loads(json), indent=4, sort_keys=True))
-
-                    if isinstance(json, dict) and json.get("errors"):
-                        raise HTTPException(json, severity=INFO)
-                    if resp.status_code == 429:
-                        reset_after = resp.headers.get("X-RateLimit-Reset-After", 0.0)
-                        if bool(resp.headers.get("X-RateLimit-Global")):
-                            logger.warning(
-                                f"A global rate limit has occured. Locking down future requests for {reset_after}s."
+                while True:
+                    async with self._limiter.acquire(route) as limit:
+                        if route.method in (_RouteMethod.POST, _RouteMethod.PUT):
+                            resp = await self._client.request(
+                                route.method.value, str(route), content=self._codec.dumpb(payload)
                             )
-                            self._global_rate_limit.reset_after = reset_after
-                            self._global_rate_limit.set()
-                        else:
-                            logger.warning(
-                                f"A route-based rate limit has occured. Locking down future requests for {reset_after}s."
+                        elif route.method in (_RouteMethod.GET, _RouteMethod.DELETE):
+                            resp = await self._client.request(
+                                route.method.value,
+                                str(route),
+                                params=QueryParams(**payload),
                             )
-                            rate_limit.reset_after = reset_after
-                            rate_limit.event.set()
-                    if resp.headers.get("X-RateLimit-Remaining", 0) == 0:
-                        logger.warning(
-                            f"We've reached the maximum number of requests possible. Locking down future requests for {reset_after}s."
+
+                        json = self._codec.loads(resp.content) if resp.content else None
+
+                        if logger.isEnabledFor(DEBUG):
+                            logger.debug(f"{route.method} {route}: {resp.status_code}")
+                            logger.debug(dumps(json, indent=4, sort_keys=True))
+
+                        self._limiter.update(route, limit, resp, json)
+
+                    # Rate limits are waited out by the limiter on the next
+                    # pass, so they do not count towards our retries. A route
+                    # rate limiting every request is given up on, however.
+                    if resp.status_code != 429:
+                        break
+
+                    rate_limited += 1
+
+                    if rate_limited >= _RATE_LIMIT_RETRIES:
+                        raise HTTPException(
+                            {
+                                "code": 429,
+                                "message": f"Rate limited {rate_limited} times in a row "
+                                f"on {route.endpoint}.",
+                            },
+                            severity=WARNING,
+                            status=429,
                         )
-                        await sleep(reset_after)
 
-                    return json
+                if resp.is_error or isinstance(json, dict) and json.get("errors"):
+                    raise HTTPException(
+                        (
+                            json
+                            if isinstance(json, dict)
+                            else {"code": resp.status_code, "message": resp.reason_phrase}
+                        ),
+                        severity=INFO,
+                        status=resp.status_code,
+                    )
+
+                return json
+            except HTTPException:
+                raise
             except OSError as err:
                 if attempt <= 1 and err.errno in {54, 10054}:
                     await sleep(5)
@@ -0,0 +1,249 @@
+from json import dumps, loads
+from logging import getLogger
+from sqlite3 import connect
+from typing import Protocol
+
+from trio import Lock, Path, to_thread
+
+logger = getLogger(__name__)
+
+__all__ = ("SessionStore", "FileSessionStore", "SQLiteSessionStore")
+
+
+class SessionStore(Protocol):
+    """
+    Represents a store of Gateway sessions that outlives the process.
+
+    ---
+
+    A session is saved by each shard when its connection ends, and is
+    loaded back the next time it starts. This allows a restarted bot to
+    resume where it had left off instead of identifying all over again.
+
+    Sessions are stored by a key unique to each shard, and hold the
+    `session_id`, `seq` and `resume_gateway_url` of the connection.
+    Any object with these coroutines may be used as a store.
+    """
+
+    async def load(self, key: str) -> dict | None:
+        ...
+
+    async def save(self, key: str, session: dict):
+        ...
+
+    async def delete(self, key: str):
+        ...
+
+
+class FileSessionStore:
+    """
+    Represents a store of Gateway sessions kept inside of a JSON file.
+
+    ---
+
+    Every session is kept in the same file, and so this store should
+    not be shared by numerous processes at once. Please see
+    `SQLiteSessionStore` for that.
+
+    ---
+
+    Attributes
+    ----------
+    path : `trio.Path`
+        The path of the file.
+    _lock : `trio.Lock`
+        The lock held while the file is being read or written to.
+    """
+
+    __slots__ = ("path", "_lock")
+    path: Path
+    """The path of the file."""
+    _lock: Lock
+    """The lock held while the file is being read or written to."""
+
+    def __init__(self, path: str = "sessions.json"):
+        """
+        Creates a new store of sessions kept inside of a JSON file.
+
+        Parameters
+        ----------
+        path : `str`, optional
+            The path of the file. Defaults to `sessions.json`.
+        """
+        self.path = Path(path)
+        self._lock = Lock()
+
+    async def _read(self) -> dict[str, dict]:
+        """
+        Reads every session inside of the file.
+
+        Returns
+        -------
+        `dict[str, dict]`
+            The sessions stored, by their key.
+        """
+        try:
+            return loads(await self.path.read_text())
+        except FileNotFoundError:
+            return {}
+        except ValueError:
+            logger.warning(f"The sessions stored in {self.path} could not be read.")
+            return {}
+
+    async def load(self, key: str) -> dict | None:
+        """
+        Loads a session.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the session.
+
+        Returns
+        -------
+        `dict`, optional
+            The session, if one was stored.
+        """
+        async with self._lock:
+            return (await self._read()).get(key)
+
+    async def save(self, key: str, session: dict):
+        """
+        Saves a session.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the session.
+        session : `dict`
+            The session to save.
+        """
+        async with self._lock:
+            sessions = await self._read()
+            sessions[key] = session
+
+            # The file is replaced all at once, so that a crash midway
+            # through never leaves behind a partially written one.
+            temp = self.path.with_suffix(".tmp")
+            await temp.write_text(dumps(sessions))
+            await temp.replace(self.path)
+
+    async def delete(self, key: str):
+        """
+        Deletes a session.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the session.
+        """
+        async with self._lock:
+            sessions = await self._read()
+
+            if sessions.pop(key, None) is not None:
+                temp = self.path.with_suffix(".tmp")
+                await temp.write_text(dumps(sessions))
+                await temp.replace(self.path)
+
+
+class SQLiteSessionStore:
+    """
+    Represents a store of Gateway sessions kept inside of an SQLite database.
+
+    ---
+
+    The database may be shared by numerous processes at once, such
+    as the workers of a `Cluster`.
+
+    ---
+
+    Attributes
+    ----------
+    path : `str`
+        The path of the database.
+    """
+
+    __slots__ = ("path",)
+    path: str
+    """The path of the database."""
+
+    def __init__(self, path: str = "sessions.db"):
+        """
+        Creates a new store of sessions kept inside of an SQLite database.
+
+        Parameters
+        ----------
+        path : `str`, optional
+            The path of the database. Defaults to `sessions.db`.
+        """
+        self.path = path
+
+    def _execute(self, query: str, *params) -> list[tuple]:
+        """
+        Executes a query on the database. This blocks, and is ran in a thread.
+
+        Parameters
+        ----------
+        query : `str`
+            The query to execute.
+        *params
+            The parameters of the query.
+
+        Returns
+        -------
+        `list[tuple]`
+            The rows given back by the query.
+        """
+        with connect(self.path, timeout=10) as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS sessions (key TEXT PRIMARY KEY, session TEXT NOT NULL)"
+            )
+            return db.execute(query, params).fetchall()
+
+    async def load(self, key: str) -> dict | None:
+        """
+        Loads a session.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the session.
+
+        Returns
+        -------
+        `dict`, optional
+            The session, if one was stored.
+        """
+        rows = await to_thread.run_sync(
+            self._execute, "SELECT session FROM sessions WHERE key = ?", key
+        )
+        return loads(rows[0][0]) if rows else None
+
+    async def save(self, key: str, session: dict):
+        """
+        Saves a session.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the session.
+        session : `dict`
+            The session to save.
+        """
+        await to_thread.run_sync(
+            self._execute,
+            "INSERT OR REPLACE INTO sessions (key, session) VALUES (?, ?)",
+            key,
+            dumps(session),
+        )
+
+    async def delete(self, key: str):
+        """
+        Deletes a session.
+
+        Parameters
+        ----------
+        key : `str`
+            The key of the session.
+        """
+        await to_thread.run_sync(self._execute, "DELETE FROM sessions WHERE key = ?", key)
@@ -0,0 +1,298 @@
+from logging import getLogger
+from typing import Awaitable, Callable
+
+from trio import Lock, Nursery, current_time, open_nursery, sleep_until
+
+from .error import HTTPException
+from .gateway import GatewayClient
+from .http import HTTPClient, _Route
+
+from ..client.flags import Intents
+from ..const import MISSING, NotNeeded
+
+logger = getLogger(__name__)
+
+__all__ = ("ShardManager",)
+
+_IDENTIFY_INTERVAL = 5.0
+"""The time in seconds Discord requires in-between identifies of the same bucket."""
+
+
+class ShardManager:
+    """
+    Represents a manager of numerous connections to Discord's Gateway, or "shards."
+
+    ---
+
+    Bots in a large amount of guilds must split their Gateway connection
+    up into shards, with each shard receiving events for a portion of them.
+    The manager runs every shard it is given at once, and dispatches their
+    events to the same bots.
+
+    Shards may only identify with the Gateway so many at a time. Every
+    shard is placed into an identify bucket by `shard_id % max_concurrency`,
+    and each bucket may only identify once every 5 seconds.
+
+    ---
+
+    Attributes
+    ----------
+    token : `str`
+        The bot's token.
+    intents : `Intents`
+        The intents to connect with.
+    shard_count : `int`, optional
+        The total amount of shards of the bot. This is fetched from
+        Discord when not given.
+    shard_ids : `list[int]`, optional
+        The IDs of the shards ran by the manager. Defaults to every shard.
+    max_concurrency : `int`
+        The amount of shards allowed to identify at once.
+    shards : `dict[int, GatewayClient]`
+        The shards ran by the manager, by their ID.
+    _http : `HTTPClient`, optional
+        The HTTP connection used for fetching the recommended shard count.
+    _kwargs : `dict`
+        The keyword arguments given to every shard's `GatewayClient`.
+    _tasks : `trio.Nursery`
+        The tasks associated with the manager, which run each shard.
+    _identify_locks : `dict[int, trio.Lock]`
+        The queues of shards waiting to identify, by their identify bucket.
+    _identified_at : `dict[int, float]`
+        The time on the `trio` clock of each identify bucket's last identify.
+    _identify_gate : `typing.Callable[[int], typing.Awaitable[None]]`
+        The coroutine each shard waits on before identifying, given the shard ID.
+    """
+
+    __slots__ = (
+        "token",
+        "intents",
+        "shard_count",
+        "shard_ids",
+        "max_concurrency",
+        "shards",
+        "_http",
+        "_kwargs",
+        "_tasks",
+        "_identify_locks",
+        "_identified_at",
+        "_identify_gate",
+    )
+    token: str
+    """The bot's token."""
+    intents: Intents
+    """The intents to connect with."""
+    shard_count: NotNeeded[int]
+    """The total amount of shards of the bot."""
+    shard_ids: NotNeeded[list[int]]
+    """The IDs of the shards ran by the manager."""
+    max_concurrency: int
+    """The amount of shards allowed to identify at once."""
+    shards: dict[int, GatewayClient]
+    """The shards ran by the manager, by their ID."""
+    _http: NotNeeded[HTTPClient]
+    """The HTTP connection used for fetching the recommended shard count."""
+    _kwargs: dict
+    """The keyword arguments given to every shard's `GatewayClient`."""
+    _tasks: Nursery
+    """The tasks associated with the manager, which run each shard."""
+    _identify_locks: dict[int, Lock]
+    """The queues of shards waiting to identify, by their identify bucket."""
+    _identified_at: dict[int, float]
+    """The time on the `trio` clock of each identify bucket's last identify."""
+    _identify_gate: Callable[[int], Awaitable[None]]
+    """The coroutine each shard waits on before identifying, given the shard ID."""
+
+    def __init__(
+        self,
+        token: str,
+        intents: Intents,
+        *,
+        shard_count: NotNeeded[int] = MISSING,
+        shard_ids: NotNeeded[list[int]] = MISSING,
+        max_concurrency: int = 1,
+        http: NotNeeded[HTTPClient] = MISSING,
+        identify_gate: NotNeeded[Callable[[int], Awaitable[None]]] = MISSING,
+        **kwargs,
+    ):
+        """
+        Creates a new manager of shards.
+
+        Parameters
+        ----------
+        token : `str`
+            The bot's token to connect with.
+        intents : `Intents`
+            The intents to connect with.
+        shard_count : `int`, optional
+            The total amount of shards of the bot. Defaults to the
+            amount recommended by Discord.
+        shard_ids : `list[int]`, optional
+            The IDs of the shards to run. Defaults to every shard.
+        max_concurrency : `int`, optional
+            The amount of shards allowed to identify at once. Defaults to `1`,
+            and is replaced by Discord's own when the shard count is fetched.
+        http : `HTTPClient`, optional
+            The HTTP connection to fetch the recommended shard count with.
+            A temporary one is made when not given.
+        identify_gate : `typing.Callable[[int], typing.Awaitable[None]]`, optional
+            A coroutine each shard waits on before identifying, given the shard ID.
+            This is used when identifies are shared with shards of other processes.
+            Defaults to the identify buckets of the manager.
+        **kwargs
+            The keyword arguments to give to every shard's `GatewayClient`,
+            such as `encoding` or `compress`.
+        """
+        self.token = token
+        self.intents = intents
+        self.shard_count = shard_count
+        self.shard_ids = shard_ids
+        self.max_concurrency = max_concurrency
+        self.shards = {}
+        self._http = http
+        self._kwargs = kwargs
+        self._identify_locks = {}
+        self._identified_at = {}
+        self._identify_gate = self._wait_to_identify if identify_gate is MISSING else identify_gate
+
+    async def __aenter__(self):
+        if self.shard_count is MISSING:
+            await self._fetch()
+        if self.shard_ids is MISSING:
+            self.shard_ids = list(range(self.shard_count))
+
+        for shard_id in self.shard_ids:
+            shard = GatewayClient(
+                self.token, self.intents, shard=(shard_id, self.shard_count), **self._kwargs
+            )
+            shard._identify_gate = self._identify_gate
+            self.shards[shard_id] = shard
+
+        logger.info(f"Running shards {self.shard_ids} of {self.shard_count}.")
+        self._tasks = open_nursery()
+        nursery = await self._tasks.__aenter__()
+
+        for shard in self.shards.values():
+            nursery.start_soon(self._run, shard)
+
+        return self
+
+    async def __aexit__(self, *exc):
+        return await self._tasks.__aexit__(*exc)
+
+    async def _fetch(self):
+        """
+        Fetches the recommended shard count and identify concurrency from Discord.
+
+        Raises: `HTTPException`
+        """
+        if self._http is MISSING:
+            async with HTTPClient(self.token) as http:
+                info = await http.request(_Route("GET", "/gateway/bot"), {})
+        else:
+            info = await self._http.request(_Route("GET", "/gateway/bot"), {})
+
+        if not isinstance(info, dict) or "shards" not in info:
+            raise HTTPException(
+                {"code": 0, "message": "Could not fetch the recommended shard count."}
+            )
+
+        limit = info["session_start_limit"]
+        self.shard_count = info["shards"]
+        self.max_concurrency = limit["max_concurrency"]
+        logger.debug(
+            f"Discord recommends {self.shard_count} shards, identifying {self.max_concurrency} at once."
+        )
+
+        if limit["remaining"] < self.shard_count:
+            logger.warning(
+                f"Only {limit['remaining']} identifies remain for {self.shard_count} shards. "
+                f"The limit resets in {limit['reset_after'] / 1000}s."
+            )
+
+    async def _run(self, shard: GatewayClient):
+        """
+        Runs a shard until its connection has ended.
+
+        Parameters
+        ----------
+        shard : `GatewayClient`
+            The shard to run.
+        """
+        async with shard:
+            pass
+
+    async def _wait_to_identify(self, shard_id: int):
+        """
+        Waits until a shard may identify with the Gateway.
+
+        Parameters
+        ----------
+        shard_id : `int`
+            The ID of the shard identifying.
+        """
+        bucket = shard_id % self.max_concurrency
+        lock = self._identify_locks.setdefault(bucket, Lock())
+
+        async with lock:
+            if bucket in self._identified_at:
+                await sleep_until(self._identified_at[bucket] + _IDENTIFY_INTERVAL)
+
+            logger.debug(f"Shard {shard_id} is identifying from bucket {bucket}.")
+            self._identified_at[bucket] = current_time()
+
+    async def _hook(self, bot: "Bot"):  # noqa
+        """
+        Hooks every shard to a bot for event dispatching.
+
+        Parameters
+        ----------
+        bot : `retux.Bot`
+            The bot instance to hook onto.
+        """
+        for shard in self.shards.values():
+            await shard._hook(bot)
+
+    async def reconnect(self):
+        """Reconnects every shard to the Gateway."""
+        async with open_nursery() as nursery:
+            for shard in self.shards.values():
+                nursery.start_soon(shard.reconnect)
+
+    @property
+    def _closed(self) -> bool:
+        """Whether every shard's connection is closed or not."""
+        return all(shard._closed for shard in self.shards.values())
+
+    @property
+    def _stopped(self) -> bool:
+        """Whether every shard's connection was forcefully stopped or not."""
+        return all(shard._stopped for shard in self.shards.values())
+
+    @_stopped.setter
+    def _stopped(self, value: bool):
+        for shard in self.shards.values():
+            shard._stopped = value
+
+    @property
+    def latency(self) -> float:
+        """The average latency of every shard from the Gateway."""
+        if not self.shards:
+            return 0.0
+
+        return sum(shard.latency for shard in self.shards.values()) / len(self.shards)
+
+    @property
+    def latencies(self) -> dict[int, float]:
+        """The latency of each shard from the Gateway, by their ID."""
+        return {shard_id: shard.latency for shard_id, shard in self.shards.items()}
+
+    @property
+    def latency_history(self) -> dict[int, list[float]]:
+        """The latencies of each shard's most recent heartbeats, by their ID."""
+        return {shard_id: shard.latency_history for shard_id, shard in self.shards.items()}
+
+    @property
+    def metrics(self) -> dict[int, dict]:
+        """The metrics of each shard's connections, by their ID."""
+        return {shard_id: shard.metrics for shard_id, shard in self.shards.items()}
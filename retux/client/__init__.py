@@ -1,3 +1,5 @@
 from .bot import *  # noqa
+from .cache import *  # noqa
+from .cluster import *  # noqa
 from .flags import *  # noqa
 from .resources import *  # noqa
@@ -1,18 +1,36 @@
+from collections import deque
 from logging import getLogger
-from typing import Any, Callable, Coroutine, Optional, Protocol
+from typing import Any, Callable, Coroutine, Hashable, Optional, Protocol
 
-from trio import run
+from trio import CapacityLimiter, Nursery, open_nursery, run
 
-from ..api import GatewayClient
-from ..api.http import HTTPClient
+from ..api import GatewayClient, SessionStore, ShardManager
+from ..api.error import HTTPException
+from ..api.gateway import _CONNECTION_EVENTS
+from ..api.http import HTTPClient, _Route
 from ..const import MISSING, NotNeeded
+from .cache import Cache
 from .flags import Intents
+from .resources.abc import Snowflake
+from .resources.guild import Guild, Member
+from .resources.user import User
 
 logger = getLogger(__name__)
 
 
 class BotProtocol(Protocol):
-    def __init__(self, intents: Intents):
+    def __init__(
+        self,
+        intents: Intents,
+        *,
+        sharded: bool = False,
+        shard_count: NotNeeded[int] = MISSING,
+        shard_ids: NotNeeded[list[int]] = MISSING,
+        session_store: NotNeeded[SessionStore] = MISSING,
+        max_in_flight: int = 100,
+        cache: NotNeeded[Cache] = MISSING,
+        **kwargs,
+    ):
         ...
 
     def start(self, token: str):
@@ -24,7 +42,26 @@ class BotProtocol(Protocol):
     async def restart(self):
         ...
 
-    async def on(self, coro: Coroutine, name: NotNeeded[str] = MISSING) -> Callable[..., Any]:
+    async def get_guild(self, id: str | int | Snowflake) -> Guild | None:
+        ...
+
+    async def get_channel(self, id: str | int | Snowflake) -> dict | None:
+        ...
+
+    async def get_member(
+        self, guild_id: str | int | Snowflake, user_id: str | int | Snowflake
+    ) -> Member | None:
+        ...
+
+    async def get_user(self, id: str | int | Snowflake) -> User | None:
+        ...
+
+    async def on(
+        self,
+        coro: Coroutine,
+        name: NotNeeded[str] = MISSING,
+        ordered_by: NotNeeded[str | Callable[[Any], Hashable]] = MISSING,
+    ) -> Callable[..., Any]:
         ...
 
     @property
@@ -44,19 +81,37 @@ class Bot(BotProtocol):
     ----------
     intents : `Intents`
         The bot's intents.
-    _gateway : `GatewayClient`
-        The bot's gateway connection.
+    _gateway : `GatewayClient`, `ShardManager`
+        The bot's gateway connection. This is a `ShardManager` when sharded.
     http : `HTTPClient`
         The bot's HTTP connection.
     _calls : `dict[str, list[typing.Coroutine]]`
         A set of callbacks registered by their name to their function.
         These are used to help dispatch Gateway events.
+    _shards : `dict`, optional
+        The sharding options of the bot, if sharded.
+    ipc : `ClusterClient`, optional
+        The bot's connection to the other workers of its cluster, if ran by a `Cluster`.
+    _session_store : `SessionStore`, optional
+        The store Gateway sessions are persisted in across restarts.
+    _handlers : `trio.Nursery`, optional
+        The tasks running callbacks, while the bot is connected.
+    _limiter : `trio.CapacityLimiter`
+        The limit on how many callbacks may be in flight at once.
+    _order_keys : `dict[typing.Coroutine, typing.Callable[[typing.Any], typing.Hashable]]`
+        The keys callbacks are ordered by, for those registered with `ordered_by`.
+    _queues : `dict[tuple, collections.deque]`
+        The events waiting on ordered callbacks, by their callback and key.
+    _gateway_kwargs : `dict`
+        The keyword arguments given to the bot's Gateway connection.
+    cache : `Cache`
+        The cache of resources, fed by events from the Gateway.
     """
 
     intents: Intents
     """The bot's intents."""
-    _gateway: GatewayClient
-    """The bot's gateway connection."""
+    _gateway: GatewayClient | ShardManager
+    """The bot's gateway connection. This is a `ShardManager` when sharded."""
     http: HTTPClient
     """The bot's HTTP connection."""
     _calls: dict[str, list[Coroutine]] = {}
@@ -64,11 +119,82 @@ class Bot(BotProtocol):
     A set of callbacks registered by their name to their function.
     These are used to help dispatch Gateway events.
     """
+    _shards: dict | None
+    """The sharding options of the bot, if sharded."""
+    ipc: Optional["ClusterClient"]  # noqa
+    """The bot's connection to the other workers of its cluster, if ran by a `Cluster`."""
+    _session_store: NotNeeded[SessionStore]
+    """The store Gateway sessions are persisted in across restarts."""
+    _handlers: Nursery | None
+    """The tasks running callbacks, while the bot is connected."""
+    _limiter: CapacityLimiter
+    """The limit on how many callbacks may be in flight at once."""
+    _order_keys: dict[Coroutine, Callable[[Any], Hashable]]
+    """The keys callbacks are ordered by, for those registered with `ordered_by`."""
+    _queues: dict[tuple, deque]
+    """The events waiting on ordered callbacks, by their callback and key."""
+    _gateway_kwargs: dict
+    """The keyword arguments given to the bot's Gateway connection."""
+    cache: Cache
+    """The cache of resources, fed by events from the Gateway."""
+
+    def __init__(
+        self,
+        intents: Intents,
+        *,
+        sharded: bool = False,
+        shard_count: NotNeeded[int] = MISSING,
+        shard_ids: NotNeeded[list[int]] = MISSING,
+        session_store: NotNeeded[SessionStore] = MISSING,
+        max_in_flight: int = 100,
+        cache: NotNeeded[Cache] = MISSING,
+        **kwargs,
+    ):
+        """
+        Creates a new bot.
 
-    def __init__(self, intents: Intents):
+        Parameters
+        ----------
+        intents : `Intents`
+            The bot's intents.
+        sharded : `bool`, optional
+            Whether to split the Gateway connection into shards or not.
+            Defaults to `False`, unless `shard_count` or `shard_ids` is given.
+        shard_count : `int`, optional
+            The total amount of shards of the bot. Defaults to the amount
+            recommended by Discord.
+        shard_ids : `list[int]`, optional
+            The IDs of the shards to run. Defaults to every shard.
+        session_store : `SessionStore`, optional
+            The store to persist Gateway sessions in, allowing them to
+            be resumed after a restart. Defaults to none.
+        max_in_flight : `int`, optional
+            The amount of callbacks allowed to run at once. Past this,
+            events wait on a callback finishing before being dispatched.
+            Defaults to `100`.
+        cache : `Cache`, optional
+            The cache of resources, with the policy of each kind. Defaults
+            to one keeping every resource.
+        **kwargs
+            The keyword arguments to give to the bot's `GatewayClient`, or every
+            shard's, such as `compress`, `event_capacity` or `overflow`.
+        """
         self.intents = intents
         self._gateway = MISSING
         self.http = MISSING
+        self.ipc = None
+        self._session_store = session_store
+        self._handlers = None
+        self._limiter = CapacityLimiter(max_in_flight)
+        self._order_keys = {}
+        self._queues = {}
+        self._gateway_kwargs = kwargs
+        self.cache = Cache() if cache is MISSING else cache
+        self._shards = (
+            {"shard_count": shard_count, "shard_ids": shard_ids}
+            if sharded or shard_count is not MISSING or shard_ids is not MISSING
+            else None
+        )
 
     def start(self, token: str):
         """
@@ -83,13 +209,167 @@ class Bot(BotProtocol):
         run(self._connect, token)
 
     def close(self):
-        """Closes the current connection with Discord."""
+        """
+        Closes the current connection with Discord.
+
+        ---
+
+        The pooled connections of the HTTP client are closed
+        alongside the Gateway once the connection has wound down.
+        """
         self._gateway._stopped = True
 
     async def restart(self):
         """Restarts a connection with Discord."""
         await self._gateway.reconnect()
 
+    async def get_guild(self, id: str | int | Snowflake) -> Guild | None:
+        """
+        Gets a guild, from the cache if possible.
+
+        ---
+
+        Guilds missing from the cache are fetched from Discord and then
+        stored. Concurrent fetches of the same guild are made only once.
+
+        ---
+
+        Parameters
+        ----------
+        id : `str`, `int`, `Snowflake`
+            The ID of the guild.
+
+        Returns
+        -------
+        `Guild`, optional
+            The guild, if it could be found.
+
+        Raises: `HTTPException`
+        """
+        if (guild := await self.cache.get_guild(id)) is not None:
+            return guild
+
+        data = await self._fetch(_Route("GET", f"/guilds/{id}", guild_id=str(id)))
+        return None if data is None else await self.cache._put_guild(data)
+
+    async def get_channel(self, id: str | int | Snowflake) -> dict | None:
+        """
+        Gets a channel or thread, from the cache if possible.
+
+        ---
+
+        Channels missing from the cache are fetched from Discord and then
+        stored. Concurrent fetches of the same channel are made only once.
+
+        ---
+
+        Parameters
+        ----------
+        id : `str`, `int`, `Snowflake`
+            The ID of the channel.
+
+        Returns
+        -------
+        `dict`, optional
+            The channel, if it could be found.
+
+        Raises: `HTTPException`
+        """
+        if (channel := await self.cache.get_channel(id)) is not None:
+            return channel
+
+        data = await self._fetch(_Route("GET", f"/channels/{id}", channel_id=str(id)))
+        return None if data is None else await self.cache._put_channel(data)
+
+    async def get_member(
+        self, guild_id: str | int | Snowflake, user_id: str | int | Snowflake
+    ) -> Member | None:
+        """
+        Gets a member of a guild, from the cache if possible.
+
+        ---
+
+        Members missing from the cache are fetched from Discord and then
+        stored. Concurrent fetches of the same member are made only once.
+
+        ---
+
+        Parameters
+        ----------
+        guild_id : `str`, `int`, `Snowflake`
+            The ID of the member's guild.
+        user_id : `str`, `int`, `Snowflake`
+            The ID of the member's user.
+
+        Returns
+        -------
+        `Member`, optional
+            The member, if they could be found.
+
+        Raises: `HTTPException`
+        """
+        if (member := await self.cache.get_member(guild_id, user_id)) is not None:
+            return member
+
+        data = await self._fetch(
+            _Route("GET", f"/guilds/{guild_id}/members/{user_id}", guild_id=str(guild_id))
+        )
+        return None if data is None else await self.cache._put_member(Snowflake(guild_id), data)
+
+    async def get_user(self, id: str | int | Snowflake) -> User | None:
+        """
+        Gets a user, from the cache if possible.
+
+        ---
+
+        Users missing from the cache are fetched from Discord and then
+        stored. Concurrent fetches of the same user are made only once.
+
+        ---
+
+        Parameters
+        ----------
+        id : `str`, `int`, `Snowflake`
+            The ID of the user.
+
+        Returns
+        -------
+        `User`, optional
+            The user, if they could be found.
+
+        Raises: `HTTPException`
+        """
+        if (user := await self.cache.get_user(id)) is not None:
+            return user
+
+        data = await self._fetch(_Route("GET", f"/users/{id}"))
+        return None if data is None else await self.cache._put_user(data)
+
+    async def _fetch(self, route: _Route) -> dict | None:
+        """
+        Fetches a resource from Discord, for a cache-first getter.
+
+        Parameters
+        ----------
+        route : `_Route`
+            The route of the resource.
+
+        Returns
+        -------
+        `dict`, optional
+            The resource, if Discord could find it.
+
+        Raises: `HTTPException`
+        """
+        try:
+            data = await self.http.request(route, {})
+        except HTTPException as err:
+            if err.status == 404:
+                return None
+            raise
+
+        return data if isinstance(data, dict) else None
+
     async def _connect(self, token: str):
         """
         Connects to the Gateway and hooks into the manager.
@@ -99,10 +379,31 @@ class Bot(BotProtocol):
         token : `str`
             The token of the bot.
         """
-        async with GatewayClient(token, self.intents) as self._gateway:
-            await self._gateway._hook(self)
-
-    def _register(self, coro: Coroutine, name: Optional[str] = None, event: Optional[bool] = True):
+        async with self.http, open_nursery() as self._handlers:
+            if self._shards is None:
+                gateway = GatewayClient(
+                    token, self.intents, session_store=self._session_store, **self._gateway_kwargs
+                )
+            else:
+                gateway = ShardManager(
+                    token,
+                    self.intents,
+                    http=self.http,
+                    session_store=self._session_store,
+                    **self._shards,
+                    **self._gateway_kwargs,
+                )
+
+            async with gateway as self._gateway:
+                await self._gateway._hook(self)
+
+    def _register(
+        self,
+        coro: Coroutine,
+        name: Optional[str] = None,
+        event: Optional[bool] = True,
+        ordered_by: NotNeeded[str | Callable[[Any], Hashable]] = MISSING,
+    ):
         """
         Registers a coroutine to be used as a callback.
 
@@ -116,6 +417,9 @@ class Bot(BotProtocol):
         event : `bool`, optional
             Whether the coroutine is a Gateway event or not.
             Defaults to `True`.
+        ordered_by : `str`, `typing.Callable[[typing.Any], typing.Hashable]`, optional
+            The attribute, or function of the event, to order the coroutine's
+            calls by. Defaults to no ordering.
         """
         _name = (name if event else name) if name else coro.__name__
 
@@ -125,20 +429,139 @@ class Bot(BotProtocol):
 
         self._calls[_name] = call
 
+        if isinstance(ordered_by, str):
+            self._order_keys[coro] = lambda event: (
+                event.get(ordered_by) if isinstance(event, dict) else getattr(event, ordered_by)
+            )
+        elif ordered_by is not MISSING:
+            self._order_keys[coro] = ordered_by
+
+    def _listens(self, name: str) -> bool:
+        """
+        Checks whether the bot is listening to an event.
+
+        ---
+
+        The Gateway drops the events nothing is listening to before
+        they are deserialized, and so anything consuming an event
+        must be accounted for here.
+
+        ---
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event.
+
+        Returns
+        -------
+        `bool`
+            Whether any callback is registered for the event, or the
+            cache is fed by it, or not.
+        """
+        return bool(self._calls.get(name)) or self.cache._wants(name)
+
     async def _trigger(self, name: str, *args):
         """
         Triggers a name registered for callbacks.
 
+        ---
+
+        Every callback is ran as a task of its own, so that a slow one never
+        holds up the Gateway. Only `max_in_flight` callbacks may be in flight
+        at once, after which this waits on one of them finishing.
+
+        Connection events, such as `ready` and `heartbeat_ack`, are triggered
+        while the Gateway is being read from, and so never wait. Their
+        callbacks are not counted towards `max_in_flight`.
+
+        Callbacks registered with `ordered_by` are ran one at a time for
+        each key, in the order their events were received.
+
+        ---
+
         Parameters
         ----------
         name : `str`
             The name associated with the callbacks.
         """
-        for event in self._calls.get(name, []):
-            await event(*args)
+        if args:
+            await self.cache._update(name, args[0])
+
+        for coro in self._calls.get(name, []):
+            if name in _CONNECTION_EVENTS:
+                token = None
+            else:
+                token = object()
+                await self._limiter.acquire_on_behalf_of(token)
+
+            if (order_key := self._order_keys.get(coro)) is None:
+                self._handlers.start_soon(self._run, name, coro, args, token)
+                continue
+
+            try:
+                key = (coro, order_key(*args))
+            except Exception:
+                logger.exception(f"Could not find the key to order a callback of {name} by.")
+
+                if token is not None:
+                    self._limiter.release_on_behalf_of(token)
+                continue
+
+            if (queue := self._queues.get(key)) is None:
+                queue = self._queues[key] = deque()
+                self._handlers.start_soon(self._drain, name, key, queue)
+
+            queue.append((args, token))
+
+    async def _drain(self, name: str, key: tuple, queue: deque):
+        """
+        Runs the events waiting on an ordered callback, one at a time.
+
+        Parameters
+        ----------
+        name : `str`
+            The name associated with the callback.
+        key : `tuple`
+            The callback, and the key its events are ordered by.
+        queue : `collections.deque`
+            The events waiting on the callback.
+        """
+        while queue:
+            args, token = queue.popleft()
+            await self._run(name, key[0], args, token)
+
+        del self._queues[key]
+
+    async def _run(self, name: str, coro: Coroutine, args: tuple, token: object | None):
+        """
+        Runs a callback, keeping any exception it raises from reaching the bot.
+
+        Parameters
+        ----------
+        name : `str`
+            The name associated with the callback.
+        coro : `typing.Coroutine`
+            The callback to run.
+        args : `tuple`
+            The arguments to give the callback.
+        token : `object`, optional
+            The token the callback holds in the limit of callbacks in flight, if any.
+        """
+        try:
+            await coro(*args)
+        except Exception:
+            logger.exception(f"Ignoring an exception raised by a callback of {name}.")
+        finally:
+            if token is not None:
+                self._limiter.release_on_behalf_of(token)
 
     def on(
-        self, coro: NotNeeded[Coroutine] = MISSING, *, name: NotNeeded[str] = MISSING
+        self,
+        coro: NotNeeded[Coroutine] = MISSING,
+        *,
+        name: NotNeeded[str] = MISSING,
+        ordered_by: NotNeeded[str | Callable[[Any], Hashable]] = MISSING,
     ) -> Callable[..., Any]:
         """
         Listens to events given from the Gateway.
@@ -172,6 +595,15 @@ class Bot(BotProtocol):
             ...
         ```
 
+        Callbacks run concurrently with one another. If the events of a
+        callback must be handled in order, such as the messages of each
+        channel, you can pass the attribute to order them by.
+        ```
+        @bot.on(name="message_create", ordered_by="channel_id")
+        async def log_message(event):
+            ...
+        ```
+
         `@on` empowers developers to also determine when a restart may
         be needed without having to create your own loop. Please note
         that this is only an example. retux automatically attempts reconnections
@@ -219,6 +651,10 @@ class Bot(BotProtocol):
         name : `str`, optional
             The name associated with the event. This defaults to the
             name of the coroutine, prefixed with `on_`.
+        ordered_by : `str`, `typing.Callable[[typing.Any], typing.Hashable]`, optional
+            The attribute, or function of the event, to order the coroutine's
+            calls by. Events sharing the same key are handled one at a time,
+            in the order they were received. Defaults to no ordering.
 
         Returns
         -------
@@ -228,7 +664,9 @@ class Bot(BotProtocol):
         """
 
         def decor(coro: Coroutine):
-            self._register(coro, name=name if name is not MISSING else coro.__name__)
+            self._register(
+                coro, name=name if name is not MISSING else coro.__name__, ordered_by=ordered_by
+            )
             return coro
 
         if coro is not MISSING:
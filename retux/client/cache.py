@@ -0,0 +1,2353 @@
+from array import array
+from collections import OrderedDict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
+from logging import getLogger
+from mmap import mmap
+from os import O_CREAT, O_RDWR, close, fstat, ftruncate
+from os import open as open_fd
+from struct import Struct
+from time import monotonic, time
+from typing import Any, Callable, Hashable, Iterator, Protocol
+from zlib import compress, decompress
+
+from attrs import define, field
+from trio import (
+    BrokenResourceError,
+    ClosedResourceError,
+    Lock,
+    TooSlowError,
+    aclose_forcefully,
+    current_time,
+    fail_after,
+    open_tcp_stream,
+    open_unix_socket,
+    sleep,
+)
+from trio.abc import Stream
+
+from .resources.abc import Snowflake
+from .resources.guild import Guild, Member
+from .resources.user import User
+from ..api.codec import _Codec, get_codec
+from ..const import MISSING, NotNeeded
+from ..utils.lazy import Lazy
+
+try:
+    from fcntl import LOCK_EX, LOCK_NB, LOCK_SH, LOCK_UN, flock
+except ImportError:
+    flock = None
+
+logger = getLogger(__name__)
+
+__all__ = (
+    "CachePolicy",
+    "CacheBackend",
+    "MemoryBackend",
+    "RedisBackend",
+    "SharedMemoryBackend",
+    "MemberStore",
+    "Cache",
+)
+
+_COMPRESS_OVER = 1024
+"""The size in bytes past which resources are compressed when serialized."""
+
+_RETRY_BASE = 0.5
+"""The time in seconds first waited before trying an unreachable Redis server again."""
+
+_RETRY_CAP = 30.0
+"""The most time in seconds waited before trying an unreachable Redis server again."""
+
+
+@define(frozen=True)
+class CachePolicy:
+    """
+    Represents how a kind of resource is kept inside of the cache.
+
+    ---
+
+    Policies are best made with one of their shorthands:
+
+    - `CachePolicy.unbounded()` keeps every resource until Discord removes it.
+    - `CachePolicy.lru(max_size)` keeps the most recently used resources.
+    - `CachePolicy.expiring(ttl)` keeps resources for a time after they were stored.
+    - `CachePolicy.disabled()` keeps no resources at all.
+
+    `max_size` and `ttl` may also be given together.
+
+    ---
+
+    Attributes
+    ----------
+    enabled : `bool`
+        Whether resources are kept at all or not. Defaults to `True`.
+    max_size : `int`, optional
+        The amount of resources kept, evicting the least recently used
+        past it. Defaults to no limit.
+    ttl : `float`, optional
+        The time in seconds a resource is kept after it was stored.
+        Defaults to forever.
+    """
+
+    enabled: bool = field(default=True)
+    """Whether resources are kept at all or not. Defaults to `True`."""
+    max_size: int | None = field(default=None)
+    """The amount of resources kept, evicting the least recently used past it."""
+    ttl: float | None = field(default=None)
+    """The time in seconds a resource is kept after it was stored."""
+
+    @classmethod
+    def unbounded(cls) -> "CachePolicy":
+        """Creates a policy keeping every resource until Discord removes it."""
+        return cls()
+
+    @classmethod
+    def lru(cls, max_size: int) -> "CachePolicy":
+        """
+        Creates a policy keeping only the most recently used resources.
+
+        Parameters
+        ----------
+        max_size : `int`
+            The amount of resources kept.
+        """
+        return cls(max_size=max_size)
+
+    @classmethod
+    def expiring(cls, ttl: float) -> "CachePolicy":
+        """
+        Creates a policy keeping resources for a time after they were stored.
+
+        Parameters
+        ----------
+        ttl : `float`
+            The time in seconds a resource is kept.
+        """
+        return cls(ttl=ttl)
+
+    @classmethod
+    def disabled(cls) -> "CachePolicy":
+        """Creates a policy keeping no resources at all."""
+        return cls(enabled=False)
+
+
+class CacheBackend(Protocol):
+    """
+    Represents where the resources of one kind inside of the cache are kept.
+
+    ---
+
+    Resources are given to a backend as the raw `dict` given by Discord,
+    and are keyed by a `Snowflake`, or a `tuple` of them for members.
+    Any object with these coroutine methods may be used as a backend,
+    so that backends kept outside of the process never block the bot.
+
+    Backends kept outside of the process, such as `RedisBackend` and
+    `SharedMemoryBackend`, allow the workers of a `Cluster` to share one
+    copy of their resources instead of each keeping their own.
+    """
+
+    policy: CachePolicy
+    """The policy of the backend."""
+
+    async def size(self) -> int:
+        ...
+
+    async def get(self, key: Hashable) -> dict | None:
+        ...
+
+    async def put(self, key: Hashable, value: dict):
+        ...
+
+    async def pop(self, key: Hashable) -> dict | None:
+        ...
+
+    async def discard(self, predicate: Callable[[Hashable, dict], bool]) -> int:
+        ...
+
+
+class MemoryBackend:
+    """
+    Represents the resources of one kind kept inside of the process.
+
+    ---
+
+    Resources are kept in the order they were last used, so that the
+    least recently used one is always first in line to be evicted.
+    Expired resources are evicted when looked up, or when they reach
+    the front of the line as others are stored.
+
+    ---
+
+    Attributes
+    ----------
+    policy : `CachePolicy`
+        The policy of the backend.
+    _items : `collections.OrderedDict[typing.Hashable, tuple[typing.Any, float | None]]`
+        The resources stored, alongside when they expire, by their key.
+    """
+
+    __slots__ = ("policy", "_items")
+    policy: CachePolicy
+    """The policy of the backend."""
+    _items: OrderedDict[Hashable, tuple[Any, float | None]]
+    """The resources stored, alongside when they expire, by their key."""
+
+    def __init__(self, policy: CachePolicy = CachePolicy()):
+        """
+        Creates a new backend kept inside of the process.
+
+        Parameters
+        ----------
+        policy : `CachePolicy`, optional
+            The policy of the backend. Defaults to unbounded.
+        """
+        self.policy = policy
+        self._items = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    async def size(self) -> int:
+        """
+        Counts the resources kept.
+
+        Returns
+        -------
+        `int`
+            The amount of resources kept.
+        """
+        return len(self)
+
+    async def get(self, key: Hashable) -> Any | None:
+        """
+        Gets a resource, marking it as recently used.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `typing.Any`, optional
+            The resource, if it is stored.
+        """
+        if (item := self._items.get(key)) is None:
+            return None
+
+        value, expires_at = item
+
+        if expires_at is not None and expires_at <= monotonic():
+            del self._items[key]
+            return None
+        if self.policy.max_size is not None:
+            self._items.move_to_end(key)
+
+        return value
+
+    async def put(self, key: Hashable, value: Any):
+        """
+        Stores a resource, evicting others as the policy calls for.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+        value : `typing.Any`
+            The resource.
+        """
+        if not self.policy.enabled:
+            return
+
+        now = monotonic()
+        self._items[key] = (value, None if self.policy.ttl is None else now + self.policy.ttl)
+        self._items.move_to_end(key)
+
+        while self._items:
+            _, expires_at = next(iter(self._items.values()))
+
+            if (self.policy.max_size is not None and len(self._items) > self.policy.max_size) or (
+                expires_at is not None and expires_at <= now
+            ):
+                self._items.popitem(last=False)
+            else:
+                break
+
+    async def pop(self, key: Hashable) -> Any | None:
+        """
+        Removes a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `typing.Any`, optional
+            The resource removed, if it was stored.
+        """
+        item = self._items.pop(key, None)
+        return None if item is None else item[0]
+
+    async def discard(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """
+        Removes every resource matching a predicate.
+
+        Parameters
+        ----------
+        predicate : `typing.Callable[[typing.Hashable, typing.Any], bool]`
+            The predicate given the key of each resource, and the resource.
+
+        Returns
+        -------
+        `int`
+            The amount of resources removed.
+        """
+        keys = [key for key, (value, _) in self._items.items() if predicate(key, value)]
+
+        for key in keys:
+            del self._items[key]
+
+        return len(keys)
+
+
+def _dumps(codec: _Codec, value: dict) -> bytes:
+    """
+    Serializes a resource, compressing it when large.
+
+    Parameters
+    ----------
+    codec : `_Codec`
+        The codec to serialize with.
+    value : `dict`
+        The resource.
+
+    Returns
+    -------
+    `bytes`
+        The serialized resource, prefixed by whether it is compressed.
+    """
+    data = codec.dumpb(value)
+
+    if len(data) > _COMPRESS_OVER:
+        return b"z" + compress(data, 1)
+    return b"j" + data
+
+
+def _loads(codec: _Codec, data: bytes) -> dict:
+    """
+    Deserializes a resource.
+
+    Parameters
+    ----------
+    codec : `_Codec`
+        The codec to deserialize with.
+    data : `bytes`
+        The serialized resource.
+
+    Returns
+    -------
+    `dict`
+        The resource.
+    """
+    return codec.loads(decompress(data[1:]) if data[:1] == b"z" else data[1:])
+
+
+def _split(key: Hashable) -> tuple[int, int]:
+    """
+    Splits the key of a resource into the two IDs it is made of.
+
+    Parameters
+    ----------
+    key : `typing.Hashable`
+        The key of the resource, as a `Snowflake` or `tuple` of two.
+
+    Returns
+    -------
+    `tuple[int, int]`
+        The IDs of the key. The second is `0` for keys of only one.
+    """
+    return (int(key[0]), int(key[1])) if isinstance(key, tuple) else (int(key), 0)
+
+
+def _join(first: int, second: int) -> Hashable:
+    """
+    Joins the two IDs of a key back into the key of a resource.
+
+    Parameters
+    ----------
+    first : `int`
+        The first ID of the key.
+    second : `int`
+        The second ID of the key, or `0` for keys of only one.
+
+    Returns
+    -------
+    `typing.Hashable`
+        The key of the resource.
+    """
+    return Snowflake(first) if not second else (Snowflake(first), Snowflake(second))
+
+
+class RedisBackend:
+    """
+    Represents the resources of one kind kept inside of a Redis server.
+
+    ---
+
+    Resources are serialized with the codec given, and are compressed
+    when large. Keys are namespaced, so that every kind of resource may
+    share the same server. Any server speaking the Redis protocol, such
+    as KeyDB or Dragonfly, may be used. Redis 2.6.12 or newer is needed.
+
+    Resources expire on the server when the policy has a `ttl`. The policy's
+    `max_size` is not enforced by the backend. Please configure the server's
+    `maxmemory` and `maxmemory-policy allkeys-lru` for that instead.
+
+    The keys of the backend are indexed inside of a sorted set by when
+    they expire, so that they may be gone through without scanning
+    every key on the server. Expired keys are pruned from it as others
+    are stored. Resources of a guild, such as its members and channels,
+    are also indexed inside of a set of their guild, so that removing a
+    guild only ever goes through its own keys.
+
+    Commands are sent one at a time over a single connection. Failures
+    are logged and treated as cache misses. While the server cannot be
+    reached, commands are not tried again until a backoff has passed.
+
+    ---
+
+    Attributes
+    ----------
+    namespace : `str`
+        The prefix of every key kept by the backend.
+    policy : `CachePolicy`
+        The policy of the backend.
+    address : `tuple[str, int]`, `str`
+        The host and port of the server, or the path of its Unix socket.
+    timeout : `float`
+        The time in seconds to wait on the server before giving up.
+    _password : `str`, optional
+        The password to authenticate with, if any.
+    _db : `int`
+        The index of the database to use.
+    _codec : `_Codec`
+        The codec used on resources.
+    _stream : `trio.abc.Stream`, optional
+        The connection to the server, if open.
+    _buffer : `bytearray`
+        The data received from the server that has yet to be read.
+    _lock : `trio.Lock`
+        The lock held while a command waits on its reply.
+    _retry_at : `float`
+        The time on the `trio` clock before which the server is not tried again.
+    _retry_delay : `float`
+        The time in seconds last waited before trying the server again.
+    """
+
+    __slots__ = (
+        "namespace",
+        "policy",
+        "address",
+        "timeout",
+        "_password",
+        "_db",
+        "_codec",
+        "_stream",
+        "_buffer",
+        "_lock",
+        "_retry_at",
+        "_retry_delay",
+    )
+    namespace: str
+    """The prefix of every key kept by the backend."""
+    policy: CachePolicy
+    """The policy of the backend."""
+    address: tuple[str, int] | str
+    """The host and port of the server, or the path of its Unix socket."""
+    timeout: float
+    """The time in seconds to wait on the server before giving up."""
+    _password: str | None
+    """The password to authenticate with, if any."""
+    _db: int
+    """The index of the database to use."""
+    _codec: _Codec
+    """The codec used on resources."""
+    _stream: Stream | None
+    """The connection to the server, if open."""
+    _buffer: bytearray
+    """The data received from the server that has yet to be read."""
+    _lock: Lock
+    """The lock held while a command waits on its reply."""
+    _retry_at: float
+    """The time on the `trio` clock before which the server is not tried again."""
+    _retry_delay: float
+    """The time in seconds last waited before trying the server again."""
+
+    def __init__(
+        self,
+        namespace: str,
+        *,
+        host: str = "localhost",
+        port: int = 6379,
+        path: NotNeeded[str] = MISSING,
+        password: NotNeeded[str] = MISSING,
+        db: int = 0,
+        policy: CachePolicy = CachePolicy(),
+        codec: NotNeeded[str | _Codec] = MISSING,
+        timeout: float = 1.0,
+    ):
+        """
+        Creates a new backend kept inside of a Redis server.
+
+        Parameters
+        ----------
+        namespace : `str`
+            The prefix of every key kept by the backend, such as `retux:guilds`.
+        host : `str`, optional
+            The host of the server. Defaults to `localhost`.
+        port : `int`, optional
+            The port of the server. Defaults to `6379`.
+        path : `str`, optional
+            The path of the server's Unix socket. When given, this is
+            connected to instead of `host` and `port`.
+        password : `str`, optional
+            The password to authenticate with. Defaults to none.
+        db : `int`, optional
+            The index of the database to use. Defaults to `0`.
+        policy : `CachePolicy`, optional
+            The policy of the backend. Defaults to unbounded.
+        codec : `str`, `_Codec`, optional
+            The codec to use on resources. Defaults to the fastest one installed.
+        timeout : `float`, optional
+            The time in seconds to wait on the server before giving up.
+            Defaults to `1.0`.
+        """
+        self.namespace = namespace
+        self.policy = policy
+        self.address = (host, port) if path is MISSING else path
+        self.timeout = timeout
+        self._password = None if password is MISSING else password
+        self._db = db
+        self._codec = get_codec(codec)
+        self._stream = None
+        self._buffer = bytearray()
+        self._lock = Lock()
+        self._retry_at = float("-inf")
+        self._retry_delay = 0.0
+
+    async def _connect(self):
+        """Connects to the server, authenticating and selecting the database."""
+        if isinstance(self.address, str):
+            self._stream = await open_unix_socket(self.address)
+        else:
+            self._stream = await open_tcp_stream(*self.address)
+
+        self._buffer.clear()
+
+        commands = []
+
+        if self._password is not None:
+            commands.append(("AUTH", self._password))
+        if self._db:
+            commands.append(("SELECT", self._db))
+
+        try:
+            if commands:
+                await self._send(*commands)
+        except ValueError as err:
+            raise ConnectionError(str(err)) from err
+
+    async def aclose(self):
+        """Closes the connection to the server."""
+        if self._stream is not None:
+            stream, self._stream = self._stream, None
+            await aclose_forcefully(stream)
+
+    async def _fill(self):
+        """
+        Receives more data from the server.
+
+        Raises: `ConnectionError`
+        """
+        if not (data := await self._stream.receive_some(65536)):
+            raise ConnectionError("The connection to the Redis server was closed.")
+
+        self._buffer += data
+
+    async def _read(self) -> Any:
+        """
+        Reads a reply from the server.
+
+        Returns
+        -------
+        `typing.Any`
+            The reply. Error replies are given back as a `ValueError`.
+
+        Raises: `ConnectionError`
+        """
+        while (end := self._buffer.find(b"\r\n")) == -1:
+            await self._fill()
+
+        kind, rest = self._buffer[:1], bytes(self._buffer[1:end])
+        del self._buffer[: end + 2]
+
+        match kind:
+            case b"+":
+                return rest.decode()
+            case b"-":
+                return ValueError(f"The Redis server replied with an error: {rest.decode()}")
+            case b":":
+                return int(rest)
+            case b"$":
+                if (size := int(rest)) == -1:
+                    return None
+
+                while len(self._buffer) < size + 2:
+                    await self._fill()
+
+                data = bytes(self._buffer[:size])
+                del self._buffer[: size + 2]
+                return data
+            case b"*":
+                return None if rest == b"-1" else [await self._read() for _ in range(int(rest))]
+
+        raise ConnectionError(f"The Redis server replied with an unknown type: {kind!r}")
+
+    async def _send(self, *commands: tuple[str | int | bytes, ...]) -> list[Any]:
+        """
+        Sends commands to the server all at once, and reads their replies.
+
+        Parameters
+        ----------
+        *commands : `tuple[str | int | bytes, ...]`
+            The commands, each with its arguments.
+
+        Returns
+        -------
+        `list[typing.Any]`
+            The reply of each command.
+
+        Raises: `ConnectionError`, `ValueError`
+        """
+        data = bytearray()
+
+        for command in commands:
+            parts = [arg if isinstance(arg, bytes) else str(arg).encode() for arg in command]
+            data += b"*%d\r\n" % len(parts)
+            data += b"".join(b"$%d\r\n%s\r\n" % (len(part), part) for part in parts)
+
+        await self._stream.send_all(data)
+        replies = [await self._read() for _ in commands]
+
+        for reply in replies:
+            if isinstance(reply, ValueError):
+                raise reply
+
+        return replies
+
+    async def _execute(self, *commands: tuple[str | int | bytes, ...]) -> list[Any] | None:
+        """
+        Executes commands, connecting to the server if needed.
+
+        Parameters
+        ----------
+        *commands : `tuple[str | int | bytes, ...]`
+            The commands, each with its arguments.
+
+        Returns
+        -------
+        `list[typing.Any]`, optional
+            The reply of each command, or `None` if the server could not be reached.
+        """
+        if current_time() < self._retry_at:
+            return None
+
+        names = " ".join(command[0] for command in commands)
+
+        async with self._lock:
+            try:
+                with fail_after(self.timeout):
+                    if self._stream is None:
+                        await self._connect()
+
+                    replies = await self._send(*commands)
+            except ValueError as err:
+                # The connection is still usable after an error reply.
+                logger.warning(f"Could not execute {names} on the Redis server: {err}")
+                return None
+            except (OSError, BrokenResourceError, ClosedResourceError, TooSlowError) as err:
+                self._retry_delay = min(_RETRY_CAP, max(_RETRY_BASE, self._retry_delay * 2))
+                self._retry_at = current_time() + self._retry_delay
+                logger.warning(
+                    f"Could not execute {names} on the Redis server: {err!r}. "
+                    f"Trying again in {self._retry_delay}s."
+                )
+                await self.aclose()
+                return None
+            except BaseException:
+                # A command cut off midway leaves its reply unread, which
+                # would otherwise be mistaken for the reply of the next one.
+                await self.aclose()
+                raise
+
+            self._retry_delay = 0.0
+            return replies
+
+    @property
+    def _index(self) -> str:
+        """The key of the sorted set indexing every key kept by the backend."""
+        return f"{self.namespace}:index"
+
+    def _guild_index(self, guild_id: Hashable) -> str:
+        """
+        Gives the key of the set indexing the keys of a guild's resources.
+
+        Parameters
+        ----------
+        guild_id : `typing.Hashable`
+            The ID of the guild.
+
+        Returns
+        -------
+        `str`
+            The namespaced key of the set.
+        """
+        return f"{self.namespace}:guild:{int(guild_id)}"
+
+    def _key(self, key: Hashable) -> str:
+        """
+        Gives the key of a resource on the server.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `str`
+            The namespaced key.
+        """
+        return f"{self.namespace}:{':'.join(map(str, key)) if isinstance(key, tuple) else key}"
+
+    def _unkey(self, key: bytes) -> Hashable:
+        """
+        Gives the key of a resource from its key on the server.
+
+        Parameters
+        ----------
+        key : `bytes`
+            The namespaced key.
+
+        Returns
+        -------
+        `typing.Hashable`
+            The key of the resource.
+        """
+        ids = key[len(self.namespace) + 1 :].split(b":")
+        return _join(int(ids[0]), int(ids[1]) if len(ids) > 1 else 0)
+
+    async def size(self) -> int:
+        """
+        Counts the resources kept.
+
+        Returns
+        -------
+        `int`
+            The amount of resources kept.
+        """
+        replies = await self._execute(
+            ("ZREMRANGEBYSCORE", self._index, "-inf", f"({time()}"), ("ZCARD", self._index)
+        )
+        return 0 if replies is None else replies[-1]
+
+    async def get(self, key: Hashable) -> dict | None:
+        """
+        Gets a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `dict`, optional
+            The resource, if it is kept.
+        """
+        replies = await self._execute(("GET", self._key(key)))
+        return None if replies is None or replies[0] is None else _loads(self._codec, replies[0])
+
+    async def put(self, key: Hashable, value: dict):
+        """
+        Stores a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+        value : `dict`
+            The resource.
+        """
+        if not self.policy.enabled:
+            return
+
+        name = self._key(key)
+        command = ["SET", name, _dumps(self._codec, value)]
+        now = time()
+
+        if self.policy.ttl is not None:
+            command += ["PX", int(self.policy.ttl * 1000)]
+
+        commands = [
+            tuple(command),
+            (
+                "ZADD",
+                self._index,
+                "inf" if self.policy.ttl is None else now + self.policy.ttl,
+                name,
+            ),
+            ("ZREMRANGEBYSCORE", self._index, "-inf", f"({now}"),
+        ]
+
+        # Members are keyed by their guild, whereas channels hold onto its ID.
+        guild_id = key[0] if isinstance(key, tuple) else value.get("guild_id")
+
+        if guild_id is not None:
+            commands.append(("SADD", self._guild_index(guild_id), name))
+
+        await self._execute(*commands)
+
+    async def pop(self, key: Hashable) -> dict | None:
+        """
+        Removes a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `dict`, optional
+            The resource removed, if it was kept.
+        """
+        name = self._key(key)
+        replies = await self._execute(
+            ("MULTI",), ("GET", name), ("DEL", name), ("ZREM", self._index, name), ("EXEC",)
+        )
+
+        if replies is None or replies[-1] is None or replies[-1][0] is None:
+            return None
+        return _loads(self._codec, replies[-1][0])
+
+    async def discard(self, predicate: Callable[[Hashable, dict], bool]) -> int:
+        """
+        Removes every resource matching a predicate.
+
+        Parameters
+        ----------
+        predicate : `typing.Callable[[typing.Hashable, dict], bool]`
+            The predicate given the key of each resource, and the resource.
+
+        Returns
+        -------
+        `int`
+            The amount of resources removed.
+        """
+        if (replies := await self._execute(("ZRANGE", self._index, 0, -1))) is None:
+            return 0
+
+        names = replies[0]
+        removed = 0
+
+        for start in range(0, len(names), 1000):
+            batch = names[start : start + 1000]
+
+            if (replies := await self._execute(("MGET", *batch))) is None:
+                break
+
+            # Keys missing a value have expired, and are dropped from the index as well.
+            matched = [
+                name
+                for name, data in zip(batch, replies[0])
+                if data is None or predicate(self._unkey(name), _loads(self._codec, data))
+            ]
+
+            if matched:
+                replies = await self._execute(("DEL", *matched), ("ZREM", self._index, *matched))
+                removed += 0 if replies is None else replies[0]
+
+        return removed
+
+    async def discard_guild(self, guild_id: str | int | Snowflake) -> int:
+        """
+        Removes every resource of a guild, such as its members or channels.
+
+        ---
+
+        Only the keys inside of the guild's set are gone through. Keys
+        removed on their own are left inside of it until then, which is
+        harmless, as deleting a key that is gone does nothing.
+
+        ---
+
+        Parameters
+        ----------
+        guild_id : `str`, `int`, `Snowflake`
+            The ID of the guild.
+
+        Returns
+        -------
+        `int`
+            The amount of resources removed.
+        """
+        index = self._guild_index(guild_id)
+
+        if (replies := await self._execute(("SMEMBERS", index))) is None:
+            return 0
+
+        names = replies[0]
+        removed = 0
+
+        for start in range(0, len(names), 1000):
+            batch = names[start : start + 1000]
+            replies = await self._execute(("DEL", *batch), ("ZREM", self._index, *batch))
+            removed += 0 if replies is None else replies[0]
+
+        await self._execute(("DEL", index))
+        return removed
+
+
+_FILE_HEADER = Struct("<4sII")
+"""The header of a shared memory file: its magic, amount of slots and size of each."""
+_SLOT_HEADER = Struct("<BQQdI")
+"""The header of a slot: its state, the IDs of its key, when it expires and its size."""
+_MAGIC = b"RTXC"
+"""The magic at the start of every shared memory file."""
+_EMPTY, _USED, _DELETED = 0, 1, 2
+"""The states of a slot."""
+_PROBES = 32
+"""The amount of slots looked through for a key, starting from the one it hashes to."""
+_LOCK_RETRY = 0.001
+"""The time in seconds waited on before trying to lock a shared memory file again."""
+
+
+class SharedMemoryBackend:
+    """
+    Represents the resources of one kind kept inside of memory shared between processes.
+
+    ---
+
+    Resources are kept inside of a file mapped into the memory of every
+    process using it, which is best placed on a memory-backed filesystem
+    such as `/dev/shm`. Every worker of a `Cluster` opening the same path
+    shares one copy of the resources, rather than each keeping their own.
+    Access is guarded by a file lock, and so this is only available on
+    systems with `fcntl`.
+
+    The file is split into a fixed amount of slots of a fixed size, found
+    by hashing the key of a resource. Resources are serialized with the
+    codec given, and compressed when large. Those which still do not fit
+    inside of a slot are not kept. Once every slot near the one a key
+    hashes to is taken, the resource in that slot is replaced.
+
+    Resources expire when the policy has a `ttl`. The policy's `max_size`
+    is not enforced, as the amount of slots is fixed.
+
+    ---
+
+    Attributes
+    ----------
+    path : `str`
+        The path of the file.
+    policy : `CachePolicy`
+        The policy of the backend.
+    slots : `int`
+        The amount of slots in the file.
+    slot_size : `int`
+        The size in bytes of each slot.
+    _codec : `_Codec`
+        The codec used on resources.
+    _fd : `int`
+        The file descriptor of the file.
+    _map : `mmap.mmap`
+        The file, mapped into memory.
+    """
+
+    __slots__ = ("path", "policy", "slots", "slot_size", "_codec", "_fd", "_map")
+    path: str
+    """The path of the file."""
+    policy: CachePolicy
+    """The policy of the backend."""
+    slots: int
+    """The amount of slots in the file."""
+    slot_size: int
+    """The size in bytes of each slot."""
+    _codec: _Codec
+    """The codec used on resources."""
+    _fd: int
+    """The file descriptor of the file."""
+    _map: mmap
+    """The file, mapped into memory."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        slots: int = 65536,
+        slot_size: int = 2048,
+        policy: CachePolicy = CachePolicy(),
+        codec: NotNeeded[str | _Codec] = MISSING,
+    ):
+        """
+        Creates a new backend kept inside of shared memory.
+
+        ---
+
+        The file is created when it does not exist yet. Otherwise, it
+        is opened with the amount of slots and size it was created with.
+
+        ---
+
+        Parameters
+        ----------
+        path : `str`
+            The path of the file, such as `/dev/shm/retux-guilds`.
+        slots : `int`, optional
+            The amount of slots in the file. Defaults to `65536`.
+        slot_size : `int`, optional
+            The size in bytes of each slot. Defaults to `2048`.
+        policy : `CachePolicy`, optional
+            The policy of the backend. Defaults to unbounded.
+        codec : `str`, `_Codec`, optional
+            The codec to use on resources. Defaults to the fastest one installed.
+
+        Raises: `RuntimeError`, `ValueError`
+        """
+        if flock is None:
+            raise RuntimeError("Shared memory caches need fcntl, which is unavailable.")
+        if slot_size <= _SLOT_HEADER.size:
+            raise ValueError(f"Slots must be larger than {_SLOT_HEADER.size} bytes.")
+
+        self.path = path
+        self.policy = policy
+        self._codec = get_codec(codec)
+        self._fd = open_fd(path, O_RDWR | O_CREAT, 0o600)
+
+        with self._blocking_lock():
+            if fstat(self._fd).st_size == 0:
+                ftruncate(self._fd, _FILE_HEADER.size + slots * slot_size)
+                self._map = mmap(self._fd, 0)
+                _FILE_HEADER.pack_into(self._map, 0, _MAGIC, slots, slot_size)
+            else:
+                self._map = mmap(self._fd, 0)
+
+        magic, self.slots, self.slot_size = _FILE_HEADER.unpack_from(self._map, 0)
+
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a shared memory cache.")
+
+    def close(self):
+        """Unmaps and closes the file. The resources inside are kept."""
+        self._map.close()
+        close(self._fd)
+
+    @asynccontextmanager
+    async def _locked(self, shared: bool = False):
+        """
+        Locks the file for the duration of the context.
+
+        ---
+
+        Other processes may hold onto the lock for a while, such as when
+        discarding every resource of a guild. Waiting on it would block
+        the event loop, and so the lock is tried again after a short
+        sleep instead. See `_LOCK_RETRY` for the time waited.
+
+        ---
+
+        Parameters
+        ----------
+        shared : `bool`, optional
+            Whether the lock may be shared with other readers or not.
+            Defaults to `False`.
+        """
+        while True:
+            try:
+                flock(self._fd, (LOCK_SH if shared else LOCK_EX) | LOCK_NB)
+                break
+            except BlockingIOError:
+                await sleep(_LOCK_RETRY)
+
+        try:
+            yield
+        finally:
+            flock(self._fd, LOCK_UN)
+
+    @contextmanager
+    def _blocking_lock(self, shared: bool = False):
+        """
+        Locks the file for the duration of the context, waiting on other processes.
+
+        This is only used outside of the event loop, such as when opening the file.
+
+        Parameters
+        ----------
+        shared : `bool`, optional
+            Whether the lock may be shared with other readers or not.
+            Defaults to `False`.
+        """
+        flock(self._fd, LOCK_SH if shared else LOCK_EX)
+
+        try:
+            yield
+        finally:
+            flock(self._fd, LOCK_UN)
+
+    def _offset(self, index: int) -> int:
+        """
+        Gives the offset of a slot inside of the file.
+
+        Parameters
+        ----------
+        index : `int`
+            The index of the slot.
+
+        Returns
+        -------
+        `int`
+            The offset of the slot.
+        """
+        return _FILE_HEADER.size + index * self.slot_size
+
+    def _find(self, ids: tuple[int, int], now: float) -> tuple[int | None, int | None]:
+        """
+        Finds the slot of a key, and the first slot free to take near it.
+
+        Parameters
+        ----------
+        ids : `tuple[int, int]`
+            The IDs of the key.
+        now : `float`
+            The current time, which expired slots are free by.
+
+        Returns
+        -------
+        `tuple[int, int]`
+            The offset of the key's slot and of the free slot, if any.
+        """
+        start = hash(ids) % self.slots
+        free = None
+
+        for step in range(min(_PROBES, self.slots)):
+            offset = self._offset((start + step) % self.slots)
+            state, first, second, expires_at, _ = _SLOT_HEADER.unpack_from(self._map, offset)
+
+            if state == _EMPTY:
+                return None, offset if free is None else free
+            if state == _USED and (first, second) == ids:
+                return offset, free
+            if free is None and (state == _DELETED or 0 < expires_at <= now):
+                free = offset
+
+        return None, free
+
+    def _value(self, offset: int, now: float) -> dict | None:
+        """
+        Reads the resource inside of a slot.
+
+        Parameters
+        ----------
+        offset : `int`
+            The offset of the slot.
+        now : `float`
+            The current time, which expired slots are missing by.
+
+        Returns
+        -------
+        `dict`, optional
+            The resource, if it has not expired.
+        """
+        _, _, _, expires_at, size = _SLOT_HEADER.unpack_from(self._map, offset)
+
+        if 0 < expires_at <= now:
+            return None
+
+        start = offset + _SLOT_HEADER.size
+        return _loads(self._codec, self._map[start : start + size])
+
+    def _count(self) -> int:
+        """
+        Counts the resources kept, while the file is locked.
+
+        Returns
+        -------
+        `int`
+            The amount of resources kept.
+        """
+        count = 0
+        now = time()
+
+        for index in range(self.slots):
+            state, _, _, expires_at, _ = _SLOT_HEADER.unpack_from(self._map, self._offset(index))
+            count += state == _USED and not 0 < expires_at <= now
+
+        return count
+
+    def __len__(self) -> int:
+        with self._blocking_lock(shared=True):
+            return self._count()
+
+    async def size(self) -> int:
+        """
+        Counts the resources kept.
+
+        Returns
+        -------
+        `int`
+            The amount of resources kept.
+        """
+        async with self._locked(shared=True):
+            return self._count()
+
+    async def get(self, key: Hashable) -> dict | None:
+        """
+        Gets a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `dict`, optional
+            The resource, if it is kept.
+        """
+        now = time()
+
+        async with self._locked(shared=True):
+            offset, _ = self._find(_split(key), now)
+            return None if offset is None else self._value(offset, now)
+
+    async def put(self, key: Hashable, value: dict):
+        """
+        Stores a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+        value : `dict`
+            The resource.
+        """
+        if not self.policy.enabled:
+            return
+
+        ids = _split(key)
+        data = _dumps(self._codec, value)
+        now = time()
+        expires_at = 0.0 if self.policy.ttl is None else now + self.policy.ttl
+
+        async with self._locked():
+            offset, free = self._find(ids, now)
+
+            if len(data) > self.slot_size - _SLOT_HEADER.size:
+                logger.debug(f"{key} is too large to be kept in {self.path}. ({len(data)} bytes)")
+
+                if offset is not None:
+                    self._map[offset] = _DELETED
+                return
+            if offset is None:
+                offset = self._offset(hash(ids) % self.slots) if free is None else free
+
+            _SLOT_HEADER.pack_into(self._map, offset, _USED, *ids, expires_at, len(data))
+            start = offset + _SLOT_HEADER.size
+            self._map[start : start + len(data)] = data
+
+    async def pop(self, key: Hashable) -> dict | None:
+        """
+        Removes a resource.
+
+        Parameters
+        ----------
+        key : `typing.Hashable`
+            The key of the resource.
+
+        Returns
+        -------
+        `dict`, optional
+            The resource removed, if it was kept.
+        """
+        now = time()
+
+        async with self._locked():
+            offset, _ = self._find(_split(key), now)
+
+            if offset is None:
+                return None
+
+            value = self._value(offset, now)
+            self._map[offset] = _DELETED
+            return value
+
+    async def discard(self, predicate: Callable[[Hashable, dict], bool]) -> int:
+        """
+        Removes every resource matching a predicate.
+
+        Parameters
+        ----------
+        predicate : `typing.Callable[[typing.Hashable, dict], bool]`
+            The predicate given the key of each resource, and the resource.
+
+        Returns
+        -------
+        `int`
+            The amount of resources removed.
+        """
+        removed = 0
+        now = time()
+
+        async with self._locked():
+            for index in range(self.slots):
+                offset = self._offset(index)
+                state, first, second, _, _ = _SLOT_HEADER.unpack_from(self._map, offset)
+
+                if state != _USED or (value := self._value(offset, now)) is None:
+                    continue
+                if predicate(_join(first, second), value):
+                    self._map[offset] = _DELETED
+                    removed += 1
+
+        return removed
+
+
+_ROW_MISSING = 0
+"""The slot of a member index that has never held a row."""
+_ROW_REMOVED = 0xFFFFFFFF
+"""The slot of a member index whose row has been removed."""
+_FIBONACCI = 11400714819323198485
+"""The multiplier spreading the IDs of users across a member index."""
+_STRING_FIELDS = (
+    ("nick",),
+    ("avatar",),
+    ("user", "username"),
+    ("user", "discriminator"),
+    ("user", "avatar"),
+)
+"""The fields of a member stored as strings, by their path."""
+_FLAG_FIELDS = (("deaf",), ("mute",), ("pending",), ("user", "bot"), ("user", "system"))
+"""The fields of a member stored as flags, by their path, from the lowest bit."""
+_TIME_FIELDS = ("joined_at", "premium_since", "communication_disabled_until")
+"""The fields of a member stored as timestamps."""
+
+
+def _to_timestamp(value: str | None) -> int:
+    """
+    Turns an ISO 8601 time given by Discord into seconds since the Unix epoch.
+
+    Parameters
+    ----------
+    value : `str`, optional
+        The time, if any.
+
+    Returns
+    -------
+    `int`
+        The seconds since the Unix epoch, or `0` for no time.
+    """
+    return 0 if value is None else int(datetime.fromisoformat(value).timestamp())
+
+
+def _from_timestamp(value: int) -> str | None:
+    """
+    Turns seconds since the Unix epoch back into an ISO 8601 time.
+
+    Parameters
+    ----------
+    value : `int`
+        The seconds since the Unix epoch, or `0` for no time.
+
+    Returns
+    -------
+    `str`, optional
+        The time, if any.
+    """
+    return None if not value else datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+
+class _GuildMembers:
+    """
+    Represents the members of one guild, stored in columns.
+
+    ---
+
+    Every member is a row, which is found through an open-addressed
+    index of their user's ID. Removed rows are filled by the last one,
+    so that the columns never have gaps.
+
+    The strings of each row are packed into one record of a shared
+    buffer, each prefixed by its length. Records replaced are left
+    behind as garbage, which is compacted once it outgrows the rest.
+
+    Roles are numbered in the order they are first seen, and the
+    combinations of roles members have are stored once each.
+
+    ---
+
+    Attributes
+    ----------
+    ids : `array.array`
+        The IDs of each row's user.
+    times : `dict[str, array.array]`
+        The timestamps of each row, in seconds since the Unix epoch, by their field.
+    flags : `array.array`
+        The flags of each row. See `_FLAG_FIELDS`.
+    role_sets : `array.array`
+        The number of each row's combination of roles.
+    records : `array.array`
+        The offset of each row's record of strings.
+    strings : `bytearray`
+        The buffer of every record of strings.
+    garbage : `int`
+        The size in bytes of the records no longer used.
+    roles : `array.array`
+        The IDs of every role, by their number.
+    role_numbers : `dict[int, int]`
+        The numbers of every role, by their ID.
+    combinations : `list[tuple[int, ...]]`
+        The combinations of roles, by their number.
+    combination_numbers : `dict[tuple[int, ...], int]`
+        The numbers of every combination of roles.
+    index : `array.array`
+        The index of rows, by the hash of their user's ID.
+    removed : `int`
+        The amount of slots in the index marked as removed.
+    """
+
+    __slots__ = (
+        "ids",
+        "times",
+        "flags",
+        "role_sets",
+        "records",
+        "strings",
+        "garbage",
+        "roles",
+        "role_numbers",
+        "combinations",
+        "combination_numbers",
+        "index",
+        "removed",
+    )
+    ids: array
+    """The IDs of each row's user."""
+    times: dict[str, array]
+    """The timestamps of each row, in seconds since the Unix epoch, by their field."""
+    flags: array
+    """The flags of each row. See `_FLAG_FIELDS`."""
+    role_sets: array
+    """The number of each row's combination of roles."""
+    records: array
+    """The offset of each row's record of strings."""
+    strings: bytearray
+    """The buffer of every record of strings."""
+    garbage: int
+    """The size in bytes of the records no longer used."""
+    roles: array
+    """The IDs of every role, by their number."""
+    role_numbers: dict[int, int]
+    """The numbers of every role, by their ID."""
+    combinations: list[tuple[int, ...]]
+    """The combinations of roles, by their number."""
+    combination_numbers: dict[tuple[int, ...], int]
+    """The numbers of every combination of roles."""
+    index: array
+    """The index of rows, by the hash of their user's ID."""
+    removed: int
+    """The amount of slots in the index marked as removed."""
+
+    def __init__(self):
+        self.ids = array("Q")
+        self.times = {name: array("I") for name in _TIME_FIELDS}
+        self.flags = array("B")
+        self.role_sets = array("I")
+        self.records = array("I")
+        self.strings = bytearray()
+        self.garbage = 0
+        self.roles = array("Q")
+        self.role_numbers = {}
+        self.combinations = [()]
+        self.combination_numbers = {(): 0}
+        self.index = array("I", bytes(4 * 8))
+        self.removed = 0
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _columns(self) -> tuple[array, ...]:
+        """
+        Gives every column of the rows.
+
+        Returns
+        -------
+        `tuple[array.array, ...]`
+            The columns.
+        """
+        return (self.ids, self.flags, self.role_sets, self.records, *self.times.values())
+
+    def _slot(self, user_id: int) -> tuple[int, int]:
+        """
+        Finds the slot of a user inside of the index.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the user.
+
+        Returns
+        -------
+        `tuple[int, int]`
+            The slot found, and the row it holds. The row is `-1` when the
+            user has none, in which case the slot is where one may be put.
+        """
+        mask = len(self.index) - 1
+        slot = ((user_id * _FIBONACCI) >> 32) & mask
+        free = None
+
+        while (row := self.index[slot]) != _ROW_MISSING:
+            if row == _ROW_REMOVED:
+                free = slot if free is None else free
+            elif self.ids[row - 1] == user_id:
+                return slot, row - 1
+
+            slot = (slot + 1) & mask
+
+        return (slot if free is None else free), -1
+
+    def _reindex(self):
+        """Rebuilds the index, growing it to stay at most a quarter full."""
+        size = 8
+
+        while size < len(self.ids) * 4:
+            size *= 2
+
+        self.index = array("I", bytes(4 * size))
+        self.removed = 0
+
+        for row, user_id in enumerate(self.ids):
+            slot, _ = self._slot(user_id)
+            self.index[slot] = row + 1
+
+    def _record(self, data: dict) -> int:
+        """
+        Packs the strings of a member into a new record.
+
+        Parameters
+        ----------
+        data : `dict`
+            The member.
+
+        Returns
+        -------
+        `int`
+            The offset of the record.
+        """
+        offset = len(self.strings)
+
+        for path in _STRING_FIELDS:
+            value = data.get(path[0]) if len(path) == 1 else data["user"].get(path[1])
+            encoded = b"" if value is None else value.encode()[:254]
+            self.strings.append(0xFF if value is None else len(encoded))
+            self.strings += encoded
+
+        return offset
+
+    def _strings(self, row: int) -> Iterator[str | None]:
+        """
+        Unpacks the record of strings of a row.
+
+        Parameters
+        ----------
+        row : `int`
+            The row.
+
+        Returns
+        -------
+        `typing.Iterator[str | None]`
+            The strings, in the order of `_STRING_FIELDS`.
+        """
+        offset = self.records[row]
+
+        for _ in _STRING_FIELDS:
+            size = self.strings[offset]
+
+            if size == 0xFF:
+                offset += 1
+                yield None
+            else:
+                yield self.strings[offset + 1 : offset + 1 + size].decode()
+                offset += 1 + size
+
+    def _record_size(self, row: int) -> int:
+        """
+        Gives the size in bytes of the record of strings of a row.
+
+        Parameters
+        ----------
+        row : `int`
+            The row.
+
+        Returns
+        -------
+        `int`
+            The size of the record.
+        """
+        start = offset = self.records[row]
+
+        for _ in _STRING_FIELDS:
+            size = self.strings[offset]
+            offset += 1 if size == 0xFF else 1 + size
+
+        return offset - start
+
+    def _compact(self):
+        """Packs every record of strings in use into a new buffer, leaving the garbage behind."""
+        strings = bytearray()
+
+        for row in range(len(self.ids)):
+            start, size = self.records[row], self._record_size(row)
+            self.records[row] = len(strings)
+            strings += self.strings[start : start + size]
+
+        self.strings = strings
+        self.garbage = 0
+
+    def _role_set(self, role_ids: list[str] | None) -> int:
+        """
+        Numbers a combination of roles, numbering any roles not yet seen.
+
+        Parameters
+        ----------
+        role_ids : `list[str]`, optional
+            The IDs of the roles.
+
+        Returns
+        -------
+        `int`
+            The number of the combination.
+        """
+        numbers = []
+
+        for role_id in role_ids or ():
+            if (number := self.role_numbers.get(role_id := int(role_id))) is None:
+                number = self.role_numbers[role_id] = len(self.roles)
+                self.roles.append(role_id)
+
+            numbers.append(number)
+
+        combination = tuple(sorted(numbers))
+
+        if (number := self.combination_numbers.get(combination)) is None:
+            number = self.combination_numbers[combination] = len(self.combinations)
+            self.combinations.append(combination)
+
+        return number
+
+    def put(self, user_id: int, data: dict):
+        """
+        Stores a member, replacing any row they already have.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the member's user.
+        data : `dict`
+            The member.
+        """
+        slot, row = self._slot(user_id)
+        flags = 0
+
+        for bit, path in enumerate(_FLAG_FIELDS):
+            value = data.get(path[0]) if len(path) == 1 else data["user"].get(path[1])
+            flags |= bool(value) << bit
+
+        if row == -1:
+            row = len(self.ids)
+            self.ids.append(user_id)
+            self.flags.append(flags)
+            self.role_sets.append(self._role_set(data.get("roles")))
+            self.records.append(self._record(data))
+
+            for name, column in self.times.items():
+                column.append(_to_timestamp(data.get(name)))
+
+            self.removed -= self.index[slot] == _ROW_REMOVED
+            self.index[slot] = row + 1
+
+            if (len(self.ids) + self.removed) * 2 > len(self.index):
+                self._reindex()
+        else:
+            self.garbage += self._record_size(row)
+            self.flags[row] = flags
+            self.role_sets[row] = self._role_set(data.get("roles"))
+            self.records[row] = self._record(data)
+
+            for name, column in self.times.items():
+                column[row] = _to_timestamp(data.get(name))
+
+            if self.garbage > len(self.strings) // 2 > 65536:
+                self._compact()
+
+    def get(self, user_id: int) -> dict | None:
+        """
+        Gets a member, rebuilding them as the `dict` given by Discord.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the member's user.
+
+        Returns
+        -------
+        `dict`, optional
+            The member, if they are stored.
+        """
+        _, row = self._slot(user_id)
+        return None if row == -1 else self._rebuild(row)
+
+    def _rebuild(self, row: int) -> dict:
+        """
+        Rebuilds the member of a row as the `dict` given by Discord.
+
+        Parameters
+        ----------
+        row : `int`
+            The row.
+
+        Returns
+        -------
+        `dict`
+            The member.
+        """
+        nick, avatar, username, discriminator, user_avatar = self._strings(row)
+        flags = self.flags[row]
+        data = {
+            "user": {
+                "id": str(self.ids[row]),
+                "username": username,
+                "discriminator": discriminator,
+                "avatar": user_avatar,
+                "bot": bool(flags & 8),
+                "system": bool(flags & 16),
+            },
+            "nick": nick,
+            "avatar": avatar,
+            "roles": [str(self.roles[number]) for number in self.combinations[self.role_sets[row]]],
+            "deaf": bool(flags & 1),
+            "mute": bool(flags & 2),
+            "pending": bool(flags & 4),
+        }
+
+        for name, column in self.times.items():
+            data[name] = _from_timestamp(column[row])
+
+        return data
+
+    def pop(self, user_id: int) -> dict | None:
+        """
+        Removes a member, filling their row with the last one.
+
+        Parameters
+        ----------
+        user_id : `int`
+            The ID of the member's user.
+
+        Returns
+        -------
+        `dict`, optional
+            The member removed, if they were stored.
+        """
+        slot, row = self._slot(user_id)
+
+        if row == -1:
+            return None
+
+        data = self._rebuild(row)
+        last = len(self.ids) - 1
+        self.garbage += self._record_size(row)
+        self.index[slot] = _ROW_REMOVED
+        self.removed += 1
+
+        if row != last:
+            moved, _ = self._slot(self.ids[last])
+            self.index[moved] = row + 1
+
+            for column in self._columns():
+                column[row] = column[last]
+
+        for column in self._columns():
+            column.pop()
+
+        if self.garbage > len(self.strings) // 2 > 65536:
+            self._compact()
+
+        return data
+
+
+class MemberStore:
+    """
+    Represents the members of every guild, stored compactly in columns.
+
+    ---
+
+    Keeping a `dict` or `Member` for every member of a large guild costs
+    several kilobytes each. This backend instead keeps each field of a
+    guild's members in an `array`, and their strings packed together.
+    A guild of a million members is kept in tens of megabytes.
+
+    Members are rebuilt as the `dict` given by Discord when looked up,
+    which `Cache` then gives back as a `Lazy` member. Their user is kept
+    alongside them, with only the fields most often used: their username,
+    discriminator, avatar and whether they are a bot or system user,
+    and so it is not stored again with the other users of the cache.
+
+    Timestamps are kept to the second. Only whether the policy is enabled
+    is followed, as members are removed by Discord's events alone.
+
+    ---
+
+    Attributes
+    ----------
+    policy : `CachePolicy`
+        The policy of the backend.
+    _guilds : `dict[int, _GuildMembers]`
+        The members of each guild, by its ID.
+    """
+
+    __slots__ = ("policy", "_guilds")
+    policy: CachePolicy
+    """The policy of the backend."""
+    _guilds: dict[int, _GuildMembers]
+    """The members of each guild, by its ID."""
+
+    def __init__(self, policy: CachePolicy = CachePolicy()):
+        """
+        Creates a new backend of members stored in columns.
+
+        Parameters
+        ----------
+        policy : `CachePolicy`, optional
+            The policy of the backend. Defaults to unbounded.
+        """
+        self.policy = policy
+        self._guilds = {}
+
+    def __len__(self) -> int:
+        return sum(len(members) for members in self._guilds.values())
+
+    def count(self, guild_id: str | int | Snowflake) -> int:
+        """
+        Counts the members of a guild.
+
+        Parameters
+        ----------
+        guild_id : `str`, `int`, `Snowflake`
+            The ID of the guild.
+
+        Returns
+        -------
+        `int`
+            The amount of members stored.
+        """
+        members = self._guilds.get(int(guild_id))
+        return 0 if members is None else len(members)
+
+    async def size(self) -> int:
+        """
+        Counts the members stored.
+
+        Returns
+        -------
+        `int`
+            The amount of members stored.
+        """
+        return len(self)
+
+    async def get(self, key: tuple[Snowflake, Snowflake]) -> dict | None:
+        """
+        Gets a member.
+
+        Parameters
+        ----------
+        key : `tuple[Snowflake, Snowflake]`
+            The ID of the member's guild and user.
+
+        Returns
+        -------
+        `dict`, optional
+            The member, if they are stored.
+        """
+        members = self._guilds.get(int(key[0]))
+        return None if members is None else members.get(int(key[1]))
+
+    async def put(self, key: tuple[Snowflake, Snowflake], value: dict):
+        """
+        Stores a member.
+
+        Parameters
+        ----------
+        key : `tuple[Snowflake, Snowflake]`
+            The ID of the member's guild and user.
+        value : `dict`
+            The member.
+        """
+        if not self.policy.enabled:
+            return
+
+        if (members := self._guilds.get(guild_id := int(key[0]))) is None:
+            members = self._guilds[guild_id] = _GuildMembers()
+
+        members.put(int(key[1]), value)
+
+    async def pop(self, key: tuple[Snowflake, Snowflake]) -> dict | None:
+        """
+        Removes a member.
+
+        Parameters
+        ----------
+        key : `tuple[Snowflake, Snowflake]`
+            The ID of the member's guild and user.
+
+        Returns
+        -------
+        `dict`, optional
+            The member removed, if they were stored.
+        """
+        members = self._guilds.get(int(key[0]))
+        return None if members is None else members.pop(int(key[1]))
+
+    async def discard(self, predicate: Callable[[Hashable, dict], bool]) -> int:
+        """
+        Removes every member matching a predicate.
+
+        ---
+
+        Every member is rebuilt to be given to the predicate. Please see
+        `discard_guild()` for removing the members of a guild instead.
+
+        ---
+
+        Parameters
+        ----------
+        predicate : `typing.Callable[[typing.Hashable, dict], bool]`
+            The predicate given the ID of each member's guild and user, and the member.
+
+        Returns
+        -------
+        `int`
+            The amount of members removed.
+        """
+        removed = 0
+
+        for guild_id, members in self._guilds.items():
+            for user_id in list(members.ids):
+                key = (Snowflake(guild_id), Snowflake(user_id))
+
+                if predicate(key, members.get(user_id)):
+                    members.pop(user_id)
+                    removed += 1
+
+        return removed
+
+    async def discard_guild(self, guild_id: str | int | Snowflake) -> int:
+        """
+        Removes every member of a guild.
+
+        Parameters
+        ----------
+        guild_id : `str`, `int`, `Snowflake`
+            The ID of the guild.
+
+        Returns
+        -------
+        `int`
+            The amount of members removed.
+        """
+        members = self._guilds.pop(int(guild_id), None)
+        return 0 if members is None else len(members)
+
+
+_EVENTS: dict[str, tuple[str, ...]] = {
+    "guild_create": ("guilds", "channels", "members", "users"),
+    "guild_update": ("guilds",),
+    "guild_delete": ("guilds", "channels", "members"),
+    "channel_create": ("channels",),
+    "channel_update": ("channels",),
+    "channel_delete": ("channels",),
+    "thread_create": ("channels",),
+    "thread_update": ("channels",),
+    "thread_delete": ("channels",),
+    "guild_member_add": ("members", "users"),
+    "guild_member_update": ("members", "users"),
+    "guild_member_remove": ("members",),
+    "guild_members_chunk": ("members", "users"),
+    "user_update": ("users",),
+}
+"""The events the cache is fed by, and the kinds of resources each one stores."""
+
+_GUILD_SPLIT = ("channels", "threads", "members", "presences", "voice_states")
+"""The fields of a guild stored apart from it, or not at all."""
+
+
+class Cache:
+    """
+    Represents a cache of resources, fed by events from the Gateway.
+
+    ---
+
+    Guilds, channels, members and users are stored as they are given
+    by Discord, and are looked up by their ID. Members are looked up
+    by the ID of their guild and user.
+
+    Resources are stored as the raw `dict` given by Discord, and are
+    given back as `Lazy` ones, and so their fields are only converted
+    once accessed. Channels are given back as the raw `dict` until
+    their resources are able to be imported. The channels and members
+    of a guild are stored apart from it, and are not kept twice.
+
+    Each kind of resource has a `CacheBackend` of its own, with its own
+    `CachePolicy`. Events only feeding disabled kinds are not received at
+    all, unless listened to. Workers of a `Cluster` may share their
+    resources through a `RedisBackend` or `SharedMemoryBackend`:
+    ```
+    cache = Cache(
+        guilds=SharedMemoryBackend("/dev/shm/retux-guilds", slot_size=65536, slots=4096),
+        channels=SharedMemoryBackend("/dev/shm/retux-channels"),
+        members=CachePolicy.lru(100_000),
+    )
+    ```
+
+    ---
+
+    Attributes
+    ----------
+    guilds : `CacheBackend`
+        The guilds stored, by their ID.
+    channels : `CacheBackend`
+        The channels and threads stored, by their ID.
+    members : `CacheBackend`
+        The members stored, by the ID of their guild and user.
+    users : `CacheBackend`
+        The users stored, by their ID.
+    """
+
+    __slots__ = ("guilds", "channels", "members", "users")
+    guilds: CacheBackend
+    """The guilds stored, by their ID."""
+    channels: CacheBackend
+    """The channels and threads stored, by their ID."""
+    members: CacheBackend
+    """The members stored, by the ID of their guild and user."""
+    users: CacheBackend
+    """The users stored, by their ID."""
+
+    def __init__(
+        self,
+        *,
+        guilds: CachePolicy | CacheBackend = CachePolicy(),
+        channels: CachePolicy | CacheBackend = CachePolicy(),
+        members: CachePolicy | CacheBackend = CachePolicy(),
+        users: CachePolicy | CacheBackend = CachePolicy(),
+    ):
+        """
+        Creates a new cache.
+
+        ---
+
+        Each kind of resource is given either a policy, which keeps it
+        inside of the process, or a backend of its own.
+
+        ---
+
+        Parameters
+        ----------
+        guilds : `CachePolicy`, `CacheBackend`, optional
+            The policy or backend of guilds. Defaults to unbounded.
+        channels : `CachePolicy`, `CacheBackend`, optional
+            The policy or backend of channels and threads. Defaults to unbounded.
+        members : `CachePolicy`, `CacheBackend`, optional
+            The policy or backend of members. Defaults to unbounded.
+        users : `CachePolicy`, `CacheBackend`, optional
+            The policy or backend of users. Defaults to unbounded.
+        """
+        self.guilds = MemoryBackend(guilds) if isinstance(guilds, CachePolicy) else guilds
+        self.channels = MemoryBackend(channels) if isinstance(channels, CachePolicy) else channels
+        self.members = MemoryBackend(members) if isinstance(members, CachePolicy) else members
+        self.users = MemoryBackend(users) if isinstance(users, CachePolicy) else users
+
+    async def get_guild(self, id: str | int | Snowflake) -> Guild | None:
+        """
+        Gets a guild from the cache.
+
+        Parameters
+        ----------
+        id : `str`, `int`, `Snowflake`
+            The ID of the guild.
+
+        Returns
+        -------
+        `Guild`, optional
+            The guild, if it is stored.
+        """
+        return None if (data := await self.guilds.get(Snowflake(id))) is None else Lazy(Guild, data)
+
+    async def get_channel(self, id: str | int | Snowflake) -> dict | None:
+        """
+        Gets a channel or thread from the cache.
+
+        Parameters
+        ----------
+        id : `str`, `int`, `Snowflake`
+            The ID of the channel.
+
+        Returns
+        -------
+        `dict`, optional
+            The channel, if it is stored.
+        """
+        return await self.channels.get(Snowflake(id))
+
+    async def get_member(
+        self, guild_id: str | int | Snowflake, user_id: str | int | Snowflake
+    ) -> Member | None:
+        """
+        Gets a member from the cache.
+
+        Parameters
+        ----------
+        guild_id : `str`, `int`, `Snowflake`
+            The ID of the member's guild.
+        user_id : `str`, `int`, `Snowflake`
+            The ID of the member's user.
+
+        Returns
+        -------
+        `Member`, optional
+            The member, if it is stored.
+        """
+        data = await self.members.get((Snowflake(guild_id), Snowflake(user_id)))
+        return None if data is None else Lazy(Member, data)
+
+    async def get_user(self, id: str | int | Snowflake) -> User | None:
+        """
+        Gets a user from the cache.
+
+        Parameters
+        ----------
+        id : `str`, `int`, `Snowflake`
+            The ID of the user.
+
+        Returns
+        -------
+        `User`, optional
+            The user, if it is stored.
+        """
+        return None if (data := await self.users.get(Snowflake(id))) is None else Lazy(User, data)
+
+    def _wants(self, name: str) -> bool:
+        """
+        Checks whether the cache is fed by an event.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event.
+
+        Returns
+        -------
+        `bool`
+            Whether any kind of resource the event stores is enabled or not.
+        """
+        return any(getattr(self, kind).policy.enabled for kind in _EVENTS.get(name, ()))
+
+    async def _update(self, name: str, data: Any):
+        """
+        Feeds the cache an event from the Gateway.
+
+        Parameters
+        ----------
+        name : `str`
+            The name of the event.
+        data : `typing.Any`
+            The data of the event. Only raw `dict` data is stored.
+        """
+        if name not in _EVENTS or not isinstance(data, dict):
+            return
+
+        try:
+            await getattr(self, f"_{name}")(data)
+        except (KeyError, TypeError, ValueError):
+            logger.exception(f"Could not update the cache from {name}.")
+
+    async def _put_guild(self, data: dict) -> Guild:
+        """
+        Stores a guild.
+
+        Parameters
+        ----------
+        data : `dict`
+            The guild.
+
+        Returns
+        -------
+        `Guild`
+            The guild stored.
+        """
+        await self.guilds.put(
+            Snowflake(data["id"]),
+            {key: value for key, value in data.items() if key not in _GUILD_SPLIT},
+        )
+        return Lazy(Guild, data)
+
+    async def _put_channel(self, data: dict) -> dict:
+        """
+        Stores a channel or thread.
+
+        Parameters
+        ----------
+        data : `dict`
+            The channel.
+
+        Returns
+        -------
+        `dict`
+            The channel stored.
+        """
+        await self.channels.put(Snowflake(data["id"]), data)
+        return data
+
+    async def _put_member(self, guild_id: Snowflake, data: dict) -> Member:
+        """
+        Stores a member, and their user.
+
+        ---
+
+        Members kept by a `MemberStore` keep their user alongside them,
+        which is then not stored again with the other users.
+
+        ---
+
+        Parameters
+        ----------
+        guild_id : `Snowflake`
+            The ID of the member's guild.
+        data : `dict`
+            The member.
+
+        Returns
+        -------
+        `Member`
+            The member stored.
+        """
+        if (user := data.get("user")) is not None:
+            await self.members.put((guild_id, Snowflake(user["id"])), data)
+
+            if not isinstance(self.members, MemberStore):
+                await self._put_user(user)
+
+        return Lazy(Member, data)
+
+    async def _put_user(self, data: dict) -> User:
+        """
+        Stores a user.
+
+        Parameters
+        ----------
+        data : `dict`
+            The user.
+
+        Returns
+        -------
+        `User`
+            The user stored.
+        """
+        await self.users.put(Snowflake(data["id"]), data)
+        return Lazy(User, data)
+
+    async def _guild_create(self, data: dict):
+        """Stores a guild, alongside its channels, threads and members."""
+        guild_id = Snowflake(data["id"])
+        await self._put_guild(data)
+
+        for channel in (*data.get("channels", ()), *data.get("threads", ())):
+            await self._put_channel({**channel, "guild_id": data["id"]})
+        for member in data.get("members", ()):
+            await self._put_member(guild_id, member)
+
+    async def _guild_update(self, data: dict):
+        """Replaces a guild."""
+        await self._put_guild(data)
+
+    async def _guild_delete(self, data: dict):
+        """Removes a guild, alongside its channels, threads and members."""
+        guild_id = Snowflake(data["id"])
+
+        # Guilds going unavailable during an outage are kept, as they
+        # are created again once they become available.
+        if data.get("unavailable"):
+            return
+
+        await self.guilds.pop(guild_id)
+
+        if isinstance(self.channels, RedisBackend):
+            await self.channels.discard_guild(guild_id)
+        else:
+            # IDs are strings over JSON, but integers over ETF.
+            await self.channels.discard(
+                lambda _, channel: "guild_id" in channel
+                and Snowflake(channel["guild_id"]) == guild_id
+            )
+
+        if isinstance(self.members, (MemberStore, RedisBackend)):
+            await self.members.discard_guild(guild_id)
+        else:
+            await self.members.discard(lambda key, _: key[0] == guild_id)
+
+    async def _channel_create(self, data: dict):
+        """Stores a channel or thread."""
+        await self._put_channel(data)
+
+    async def _channel_delete(self, data: dict):
+        """Removes a channel or thread."""
+        await self.channels.pop(Snowflake(data["id"]))
+
+    _channel_update = _thread_create = _thread_update = _channel_create
+    _thread_delete = _channel_delete
+
+    async def _guild_member_add(self, data: dict):
+        """Stores a member."""
+        await self._put_member(Snowflake(data["guild_id"]), data)
+
+    _guild_member_update = _guild_member_add
+
+    async def _guild_member_remove(self, data: dict):
+        """Removes a member. Their user is kept, as they may share other guilds."""
+        await self.members.pop((Snowflake(data["guild_id"]), Snowflake(data["user"]["id"])))
+
+    async def _guild_members_chunk(self, data: dict):
+        """Stores a chunk of members requested from a guild."""
+        guild_id = Snowflake(data["guild_id"])
+
+        for member in data["members"]:
+            await self._put_member(guild_id, member)
+
+    async def _user_update(self, data: dict):
+        """Replaces the bot's own user."""
+        await self._put_user(data)
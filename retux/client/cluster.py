@@ -0,0 +1,844 @@
+from logging import getLogger
+from multiprocessing import get_context
+from os import cpu_count, getpid, unlink
+from os.path import exists, join
+from socket import AF_UNIX, SOCK_STREAM
+from tempfile import gettempdir
+from typing import Any, AsyncContextManager, AsyncIterator, Callable, Coroutine
+from uuid import uuid4
+
+from trio import (
+    BrokenResourceError,
+    ClosedResourceError,
+    Event,
+    Lock,
+    Nursery,
+    SocketListener,
+    SocketStream,
+    current_time,
+    move_on_after,
+    open_nursery,
+    open_unix_socket,
+    run,
+    serve_listeners,
+    sleep,
+    sleep_until,
+    socket,
+    to_thread,
+)
+
+from ..api.codec import _Codec, get_codec
+from ..api.error import HTTPException
+from ..api.http import HTTPClient, _Route
+from ..const import MISSING, NotNeeded
+
+logger = getLogger(__name__)
+
+__all__ = ("Cluster", "ClusterClient")
+
+_IDENTIFY_INTERVAL = 5.0
+"""The time in seconds Discord requires in-between identifies of the same bucket."""
+
+_PIPE_ERRORS = (BrokenResourceError, ClosedResourceError)
+"""The errors of sending through a pipe whose other end has disconnected."""
+
+
+class _Pipe:
+    """
+    Represents one end of an IPC connection between processes of a cluster.
+
+    ---
+
+    Messages are sent as newline-delimited JSON through the fastest
+    codec installed.
+
+    ---
+
+    Attributes
+    ----------
+    _stream : `trio.SocketStream`
+        The stream of the connection.
+    _codec : `_Codec`
+        The codec used on messages.
+    _lock : `trio.Lock`
+        The lock held while a message is being sent.
+    """
+
+    __slots__ = ("_stream", "_codec", "_lock")
+    _stream: SocketStream
+    """The stream of the connection."""
+    _codec: _Codec
+    """The codec used on messages."""
+    _lock: Lock
+    """The lock held while a message is being sent."""
+
+    def __init__(self, stream: SocketStream, codec: _Codec):
+        self._stream = stream
+        self._codec = codec
+        self._lock = Lock()
+
+    async def send(self, message: dict):
+        """
+        Sends a message through the connection.
+
+        Parameters
+        ----------
+        message : `dict`
+            The message to send.
+        """
+        async with self._lock:
+            await self._stream.send_all(self._codec.dumpb(message) + b"\n")
+
+    async def __aiter__(self) -> AsyncIterator[dict]:
+        buffer = bytearray()
+
+        async for data in self._stream:
+            buffer += data
+
+            while (end := buffer.find(b"\n")) != -1:
+                line = bytes(buffer[:end])
+                del buffer[: end + 1]
+                yield self._codec.loads(line)
+
+    async def aclose(self):
+        """Closes the connection."""
+        await self._stream.aclose()
+
+
+class ClusterClient:
+    """
+    Represents a worker's connection to the other workers of its cluster.
+
+    ---
+
+    Workers are able to ask each other questions with `query()`, which
+    are answered by the `handler` of every worker asked. A worker's metrics
+    are also published to the cluster every so often, and every worker's
+    latest metrics can be retrieved with `metrics()`.
+
+    ---
+
+    Attributes
+    ----------
+    worker_id : `int`
+        The ID of the worker.
+    handler : `typing.Callable[[typing.Any], typing.Coroutine]`, optional
+        The coroutine answering queries made by other workers. It is given
+        the data of the query, and its return value is sent back as the answer.
+    _path : `str`
+        The path of the cluster's Unix socket.
+    _pipe : `_Pipe`
+        The connection to the cluster.
+    _waiting : `dict[str, list]`
+        The queries waiting on their answers, by their nonce.
+    _tasks : `typing.AsyncContextManager[trio.Nursery]`
+        The context of the tasks associated with the connection.
+    _nursery : `trio.Nursery`
+        The tasks associated with the connection, which receive and answer messages.
+    """
+
+    __slots__ = ("worker_id", "handler", "_path", "_pipe", "_waiting", "_tasks", "_nursery")
+    worker_id: int
+    """The ID of the worker."""
+    handler: Callable[[Any], Coroutine] | None
+    """The coroutine answering queries made by other workers."""
+    _path: str
+    """The path of the cluster's Unix socket."""
+    _pipe: _Pipe
+    """The connection to the cluster."""
+    _waiting: dict[str, list]
+    """The queries waiting on their answers, by their nonce."""
+    _tasks: AsyncContextManager[Nursery]
+    """The context of the tasks associated with the connection."""
+    _nursery: Nursery
+    """The tasks associated with the connection, which receive and answer messages."""
+
+    def __init__(self, path: str, worker_id: int):
+        """
+        Creates a new connection to a cluster.
+
+        Parameters
+        ----------
+        path : `str`
+            The path of the cluster's Unix socket.
+        worker_id : `int`
+            The ID of the worker.
+        """
+        self.worker_id = worker_id
+        self.handler = None
+        self._path = path
+        self._waiting = {}
+
+    async def __aenter__(self):
+        self._pipe = _Pipe(await open_unix_socket(self._path), get_codec())
+        await self._pipe.send({"op": "hello", "worker": self.worker_id})
+
+        self._tasks = open_nursery()
+        self._nursery = await self._tasks.__aenter__()
+        self._nursery.start_soon(self._receive)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._nursery.cancel_scope.cancel()
+
+        try:
+            return await self._tasks.__aexit__(*exc)
+        finally:
+            await self._pipe.aclose()
+
+    async def _request(self, message: dict, timeout: float = float("inf")) -> list:
+        """
+        Sends a message to the cluster and waits on every answer to it.
+
+        Parameters
+        ----------
+        message : `dict`
+            The message to send. A nonce is added to it.
+        timeout : `float`, optional
+            The time in seconds to wait on answers. Defaults to forever.
+
+        Returns
+        -------
+        `list`
+            The answers given back, which are only those given in time.
+        """
+        nonce = uuid4().hex
+        done = Event()
+        self._waiting[nonce] = [done, None, []]
+
+        try:
+            await self._pipe.send({**message, "nonce": nonce})
+
+            with move_on_after(timeout):
+                await done.wait()
+
+            return self._waiting[nonce][2]
+        finally:
+            del self._waiting[nonce]
+
+    async def _send(self, message: dict) -> bool:
+        """
+        Sends a message to the cluster, unless it has disconnected.
+
+        ---
+
+        The cluster disconnecting only cuts the worker off from the
+        others, and so is logged rather than raised. Otherwise, it
+        would take down the worker's shards along with it.
+
+        ---
+
+        Parameters
+        ----------
+        message : `dict`
+            The message to send.
+
+        Returns
+        -------
+        `bool`
+            Whether the message was sent or not.
+        """
+        try:
+            await self._pipe.send(message)
+        except _PIPE_ERRORS:
+            logger.warning(f"Could not send {message['op']} to the cluster, as it disconnected.")
+            return False
+
+        return True
+
+    async def _receive(self):
+        """Receives messages from the cluster."""
+        async for message in self._pipe:
+            match message["op"]:
+                case "query":
+                    self._nursery.start_soon(self._answer, message)
+                case "routed" | "reply" | "identified" | "metrics":
+                    self._resolve(message)
+
+    async def _answer(self, message: dict):
+        """
+        Answers a query made by another worker.
+
+        Parameters
+        ----------
+        message : `dict`
+            The query made.
+        """
+        reply = {
+            "op": "reply",
+            "nonce": message["nonce"],
+            "source": message["source"],
+            "worker": self.worker_id,
+            "data": None,
+        }
+
+        try:
+            if self.handler is not None:
+                reply["data"] = await self.handler(message["data"])
+
+            await self._send(reply)
+        except Exception as err:
+            # Answers unable to be encoded are given back as `None`, as
+            # errors of the handler are, so that the query is not left waiting.
+            logger.warning(f"The query {message['nonce']} could not be answered: {err!r}")
+            await self._send({**reply, "data": None})
+
+    def _resolve(self, message: dict):
+        """
+        Resolves a message answering one of our requests.
+
+        Parameters
+        ----------
+        message : `dict`
+            The message answering the request.
+        """
+        if (waiting := self._waiting.get(message["nonce"])) is None:
+            return
+
+        done, expected, answers = waiting
+
+        match message["op"]:
+            case "routed":
+                waiting[1] = expected = message["count"]
+            case "reply":
+                answers.append({"worker": message["worker"], "data": message["data"]})
+            case _:
+                answers.append(message.get("data"))
+                waiting[1] = expected = 1
+
+        if expected is not None and len(answers) >= expected:
+            done.set()
+
+    async def query(
+        self, data: Any, *, worker: NotNeeded[int] = MISSING, timeout: float = 10.0
+    ) -> dict[int, Any]:
+        """
+        Asks other workers of the cluster a question.
+
+        ---
+
+        Workers failing to answer are given back as answering `None`.
+        Workers not answering in time, such as those disconnecting from
+        the cluster, are left out of the answers.
+
+        ---
+
+        Parameters
+        ----------
+        data : `typing.Any`
+            The data of the query. This must be able to be encoded as JSON.
+        worker : `int`, optional
+            The ID of the worker to ask. Defaults to every other worker.
+        timeout : `float`, optional
+            The time in seconds to wait on answers. Defaults to `10.0`.
+
+        Returns
+        -------
+        `dict[int, typing.Any]`
+            The answers of each worker asked, by their ID.
+        """
+        answers = await self._request(
+            {"op": "query", "target": None if worker is MISSING else worker, "data": data},
+            timeout,
+        )
+        return {answer["worker"]: answer["data"] for answer in answers}
+
+    async def publish(self, metrics: dict):
+        """
+        Publishes the metrics of the worker to the cluster.
+
+        The metrics are dropped if the cluster has disconnected.
+
+        Parameters
+        ----------
+        metrics : `dict`
+            The metrics of the worker. These must be able to be encoded as JSON.
+        """
+        await self._send({"op": "publish", "worker": self.worker_id, "data": metrics})
+
+    async def metrics(self) -> dict[int, dict]:
+        """
+        Gets the latest metrics published by every worker of the cluster.
+
+        Returns
+        -------
+        `dict[int, dict]`
+            The metrics of each worker, by their ID.
+        """
+        (metrics,) = await self._request({"op": "metrics"})
+        return {int(worker): data for worker, data in metrics.items()}
+
+    async def wait_to_identify(self, shard_id: int):
+        """
+        Waits until a shard may identify with the Gateway.
+
+        ---
+
+        Identifies are handed out by the cluster, so that shards
+        of different workers sharing an identify bucket never
+        identify at the same time. Should the cluster have
+        disconnected, the shard waits out an identify interval
+        of its own instead.
+
+        ---
+
+        Parameters
+        ----------
+        shard_id : `int`
+            The ID of the shard identifying.
+        """
+        try:
+            await self._request({"op": "identify", "shard": shard_id})
+        except _PIPE_ERRORS:
+            logger.warning(
+                f"Shard {shard_id} could not ask the cluster to identify, as it disconnected."
+            )
+            await sleep(_IDENTIFY_INTERVAL)
+
+
+class Cluster:
+    """
+    Represents a cluster of worker processes, each running a portion of the shards.
+
+    ---
+
+    A single Python process is only able to make use of one core. A
+    cluster spreads a bot's shards across numerous worker processes,
+    each running its own `trio` loop and `Bot`.
+
+    Workers are connected to one another through a Unix socket hosted
+    by the process starting the cluster. This is used to share identifies
+    between shards, answer queries across workers and gather metrics.
+
+    ---
+
+    Examples
+    --------
+    The bot must be created by a function defined at the top level of a
+    module, as it is created again inside of each worker.
+    ```
+    def setup() -> retux.Bot:
+        bot = retux.Bot(retux.Intents.GUILDS)
+
+        @bot.on
+        async def ready(event):
+            print(f"Worker {bot.ipc.worker_id} is ready.")
+
+        return bot
+
+    if __name__ == "__main__":
+        retux.Cluster(setup).start("token")
+    ```
+
+    ---
+
+    Attributes
+    ----------
+    setup : `typing.Callable[[], Bot]`
+        The function creating the bot of each worker.
+    workers : `int`
+        The amount of worker processes to run.
+    shard_count : `int`, optional
+        The total amount of shards of the bot.
+    max_concurrency : `int`
+        The amount of shards allowed to identify at once.
+    ipc : `bool`
+        Whether workers are connected to one another or not. Without it,
+        the identifies of different workers are not coordinated, and so
+        `max_concurrency` is only followed within each worker.
+    metrics : `dict[int, dict]`
+        The latest metrics published by each worker, by their ID.
+    _path : `str`
+        The path of the cluster's Unix socket.
+    _pipes : `dict[int, _Pipe]`
+        The connections to each worker, by their ID.
+    _identify_locks : `dict[int, trio.Lock]`
+        The queues of shards waiting to identify, by their identify bucket.
+    _identified_at : `dict[int, float]`
+        The time on the `trio` clock of each identify bucket's last identify.
+    """
+
+    __slots__ = (
+        "setup",
+        "workers",
+        "shard_count",
+        "max_concurrency",
+        "ipc",
+        "metrics",
+        "_path",
+        "_pipes",
+        "_identify_locks",
+        "_identified_at",
+    )
+    setup: Callable[[], "Bot"]  # noqa
+    """The function creating the bot of each worker."""
+    workers: int
+    """The amount of worker processes to run."""
+    shard_count: NotNeeded[int]
+    """The total amount of shards of the bot."""
+    max_concurrency: int
+    """The amount of shards allowed to identify at once."""
+    ipc: bool
+    """Whether workers are connected to one another or not."""
+    metrics: dict[int, dict]
+    """The latest metrics published by each worker, by their ID."""
+    _path: str
+    """The path of the cluster's Unix socket."""
+    _pipes: dict[int, _Pipe]
+    """The connections to each worker, by their ID."""
+    _identify_locks: dict[int, Lock]
+    """The queues of shards waiting to identify, by their identify bucket."""
+    _identified_at: dict[int, float]
+    """The time on the `trio` clock of each identify bucket's last identify."""
+
+    def __init__(
+        self,
+        setup: Callable[[], "Bot"],  # noqa
+        *,
+        workers: NotNeeded[int] = MISSING,
+        shard_count: NotNeeded[int] = MISSING,
+        max_concurrency: int = 1,
+        ipc: bool = True,
+        path: NotNeeded[str] = MISSING,
+    ):
+        """
+        Creates a new cluster.
+
+        Parameters
+        ----------
+        setup : `typing.Callable[[], Bot]`
+            The function creating the bot of each worker. This must be
+            defined at the top level of a module.
+        workers : `int`, optional
+            The amount of worker processes to run. Defaults to the amount
+            of cores available.
+        shard_count : `int`, optional
+            The total amount of shards of the bot. Defaults to the amount
+            recommended by Discord.
+        max_concurrency : `int`, optional
+            The amount of shards allowed to identify at once. Defaults to `1`,
+            and is replaced by Discord's own when the shard count is fetched.
+        ipc : `bool`, optional
+            Whether to connect workers to one another or not. Defaults to `True`.
+            Without it, shards of different workers may identify at once past
+            `max_concurrency`, and so be rate limited by Discord.
+        path : `str`, optional
+            The path of the cluster's Unix socket. Defaults to one in the
+            temporary directory.
+        """
+        self.setup = setup
+        self.workers = (cpu_count() or 1) if workers is MISSING else workers
+        self.shard_count = shard_count
+        self.max_concurrency = max_concurrency
+        self.ipc = ipc
+        self.metrics = {}
+        self._path = join(gettempdir(), f"retux-{getpid()}.sock") if path is MISSING else path
+        self._pipes = {}
+        self._identify_locks = {}
+        self._identified_at = {}
+
+    def start(self, token: str):
+        """
+        Starts every worker of the cluster, and waits until they have all stopped.
+
+        Parameters
+        ----------
+        token : `str`
+            The token of the bot.
+        """
+        run(self._run, token)
+
+    async def _run(self, token: str):
+        """
+        Runs every worker of the cluster.
+
+        Parameters
+        ----------
+        token : `str`
+            The token of the bot.
+
+        Raises: `HTTPException`
+        """
+        if self.shard_count is MISSING:
+            async with HTTPClient(token) as http:
+                info = await http.request(_Route("GET", "/gateway/bot"), {})
+
+            if not isinstance(info, dict) or "shards" not in info:
+                raise HTTPException(
+                    {"code": 0, "message": "Could not fetch the recommended shard count."}
+                )
+
+            self.shard_count = info["shards"]
+            self.max_concurrency = info["session_start_limit"]["max_concurrency"]
+
+        workers = min(self.workers, self.shard_count)
+        ranges = [list(range(self.shard_count))[worker::workers] for worker in range(workers)]
+        logger.info(f"Running {self.shard_count} shards across {workers} workers.")
+
+        if not self.ipc and workers > 1:
+            logger.warning(
+                "The identifies of workers are not coordinated without IPC, "
+                f"and so may exceed a max concurrency of {self.max_concurrency}."
+            )
+
+        async with open_nursery() as nursery:
+            if self.ipc:
+                await nursery.start(self._serve)
+
+            async with open_nursery() as processes:
+                for worker_id, shard_ids in enumerate(ranges):
+                    processes.start_soon(self._spawn, token, worker_id, shard_ids)
+
+            nursery.cancel_scope.cancel()
+
+        if self.ipc and exists(self._path):
+            unlink(self._path)
+
+    async def _spawn(self, token: str, worker_id: int, shard_ids: list[int]):
+        """
+        Spawns a worker process, and waits until it has stopped.
+
+        Parameters
+        ----------
+        token : `str`
+            The token of the bot.
+        worker_id : `int`
+            The ID of the worker.
+        shard_ids : `list[int]`
+            The IDs of the shards ran by the worker.
+        """
+        process = get_context("spawn").Process(
+            target=_work,
+            args=(
+                self.setup,
+                token,
+                worker_id,
+                shard_ids,
+                self.shard_count,
+                self._path if self.ipc else None,
+            ),
+            name=f"retux-worker-{worker_id}",
+        )
+        process.start()
+        logger.debug(f"Started worker {worker_id} (pid {process.pid}) with shards {shard_ids}.")
+
+        await to_thread.run_sync(process.join)
+        logger.info(f"Worker {worker_id} has stopped with exit code {process.exitcode}.")
+
+    async def _serve(self, task_status):
+        """Serves the Unix socket workers connect to one another through."""
+        if exists(self._path):
+            unlink(self._path)
+
+        sock = socket.socket(AF_UNIX, SOCK_STREAM)
+        await sock.bind(self._path)
+        sock.listen()
+        logger.debug(f"Serving the cluster from {self._path}.")
+
+        await serve_listeners(self._connect, [SocketListener(sock)], task_status=task_status)
+
+    async def _connect(self, stream: SocketStream):
+        """
+        Handles the connection of a worker.
+
+        Parameters
+        ----------
+        stream : `trio.SocketStream`
+            The stream of the connection.
+        """
+        pipe = _Pipe(stream, get_codec())
+        worker_id = None
+
+        try:
+            async with open_nursery() as nursery:
+                async for message in pipe:
+                    match message["op"]:
+                        case "hello":
+                            worker_id = message["worker"]
+                            self._pipes[worker_id] = pipe
+                        case "publish":
+                            self.metrics[message["worker"]] = message["data"]
+                        case "metrics":
+                            metrics = {str(worker): data for worker, data in self.metrics.items()}
+                            await pipe.send(
+                                {"op": "metrics", "nonce": message["nonce"], "data": metrics}
+                            )
+                        case "identify":
+                            nursery.start_soon(self._identify, pipe, message)
+                        case "query":
+                            await self._route(worker_id, pipe, message)
+                        case "reply":
+                            await self._forward(message["source"], message)
+        except (BrokenResourceError, ClosedResourceError):
+            pass
+        finally:
+            if worker_id is not None and self._pipes.get(worker_id) is pipe:
+                del self._pipes[worker_id]
+
+    async def _route(self, worker_id: int, pipe: _Pipe, message: dict):
+        """
+        Routes a query of a worker to the workers it is asking.
+
+        Parameters
+        ----------
+        worker_id : `int`
+            The ID of the worker asking.
+        pipe : `_Pipe`
+            The connection to the worker asking.
+        message : `dict`
+            The query made.
+        """
+        targets = [
+            target
+            for target in list(self._pipes)
+            if target != worker_id and message["target"] in (None, target)
+        ]
+        count = 0
+
+        # Workers disconnecting midway are left out of the answers awaited.
+        for target in targets:
+            count += await self._forward(target, {**message, "source": worker_id})
+
+        await pipe.send({"op": "routed", "nonce": message["nonce"], "count": count})
+
+    async def _forward(self, worker_id: int, message: dict) -> bool:
+        """
+        Sends a message to a worker, if they are still connected.
+
+        Parameters
+        ----------
+        worker_id : `int`
+            The ID of the worker.
+        message : `dict`
+            The message to send.
+
+        Returns
+        -------
+        `bool`
+            Whether the message was sent or not.
+        """
+        if (pipe := self._pipes.get(worker_id)) is None:
+            return False
+
+        try:
+            await pipe.send(message)
+        except _PIPE_ERRORS:
+            logger.debug(f"Could not send {message['op']} to worker {worker_id}.")
+            return False
+
+        return True
+
+    async def _identify(self, pipe: _Pipe, message: dict):
+        """
+        Waits until a shard of a worker may identify with the Gateway.
+
+        Parameters
+        ----------
+        pipe : `_Pipe`
+            The connection to the worker of the shard.
+        message : `dict`
+            The request to identify.
+        """
+        bucket = message["shard"] % self.max_concurrency
+        lock = self._identify_locks.setdefault(bucket, Lock())
+
+        async with lock:
+            if bucket in self._identified_at:
+                await sleep_until(self._identified_at[bucket] + _IDENTIFY_INTERVAL)
+
+            self._identified_at[bucket] = current_time()
+            await pipe.send({"op": "identified", "nonce": message["nonce"]})
+
+
+def _work(
+    setup: Callable[[], "Bot"],  # noqa
+    token: str,
+    worker_id: int,
+    shard_ids: list[int],
+    shard_count: int,
+    ipc: str | None,
+):
+    """
+    Runs the bot of a worker process.
+
+    Parameters
+    ----------
+    setup : `typing.Callable[[], Bot]`
+        The function creating the bot of the worker.
+    token : `str`
+        The token of the bot.
+    worker_id : `int`
+        The ID of the worker.
+    shard_ids : `list[int]`
+        The IDs of the shards ran by the worker.
+    shard_count : `int`
+        The total amount of shards of the bot.
+    ipc : `str`, optional
+        The path of the cluster's Unix socket, if workers are connected.
+    """
+    bot = setup()
+    bot._shards = {"shard_count": shard_count, "shard_ids": shard_ids}
+    run(_serve_worker, bot, token, worker_id, ipc)
+
+
+async def _serve_worker(bot: "Bot", token: str, worker_id: int, ipc: str | None):  # noqa
+    """
+    Connects the bot of a worker process to Discord, and to the cluster if needed.
+
+    Parameters
+    ----------
+    bot : `Bot`
+        The bot of the worker.
+    token : `str`
+        The token of the bot.
+    worker_id : `int`
+        The ID of the worker.
+    ipc : `str`, optional
+        The path of the cluster's Unix socket, if workers are connected.
+    """
+    bot.http = HTTPClient(token)
+
+    if ipc is None:
+        await bot._connect(token)
+        return
+
+    async with ClusterClient(ipc, worker_id) as bot.ipc:
+        bot._shards["identify_gate"] = bot.ipc.wait_to_identify
+
+        async with open_nursery() as nursery:
+            nursery.start_soon(_publish, bot)
+            await bot._connect(token)
+            nursery.cancel_scope.cancel()
+
+
+async def _publish(bot: "Bot", interval: float = 15.0):  # noqa
+    """
+    Publishes the metrics of a worker's bot to the cluster every so often.
+
+    Parameters
+    ----------
+    bot : `Bot`
+        The bot of the worker.
+    interval : `float`, optional
+        The time in seconds in-between each publish. Defaults to `15.0`.
+    """
+    while True:
+        await sleep(interval)
+
+        if bot._gateway is MISSING:
+            continue
+
+        await bot.ipc.publish(
+            {
+                "shards": bot._shards["shard_ids"],
+                "latencies": {
+                    str(shard_id): latency
+                    for shard_id, latency in getattr(bot._gateway, "latencies", {}).items()
+                },
+                "gateway": {
+                    str(shard_id): metrics
+                    for shard_id, metrics in getattr(bot._gateway, "metrics", {}).items()
+                },
+                "offline": bot.offline,
+            }
+        )
@@ -1,13 +1,11 @@
 from datetime import datetime
-from typing import Union
 
 from attrs import define, field
 
 __all__ = ("Snowflake", "Partial", "Object", "Component")
 
 
-@define(repr=False, eq=False)
-class Snowflake:
+class Snowflake(int):
     """
     Represents an unique identifier for a Discord resource.
 
@@ -17,15 +15,13 @@ class Snowflake:
     (IDs). These IDs are guaranteed to be unique across all of Discord, except in some
     unique scenarios in which child objects share their parent's ID.
 
-    ---
+    Snowflakes are stored as integers, and so may be hashed, ordered and used as
+    the keys of a `dict`. Discord sends and expects them in string-form, which
+    is given by `str()`. Snowflakes are only equal to integers, and not to their
+    string-form, as they would otherwise not hash alike. Please convert strings
+    with `Snowflake()` before comparing them.
 
-    Attributes
-    ----------
-    _snowflake : `str`
-        The internally stored snowflake. Snowflakes are always in string-form.
-
-        This value should never need to be directly checked. Please use the
-        representation of the class itself to do this for identity comparisons.
+    ---
 
     Methods
     -------
@@ -45,24 +41,12 @@ class Snowflake:
         generated on this snowflake, e.g. a resource.
     """
 
-    _snowflake: str | int = field(converter=str)
-    """
-    The internally stored snowflake. Snowflakes are always in string-form.
-
-    The snowflake may only be `None` in the event that a given
-    field in a resource does not supply it. This should not be always
-    taken for granted as having a value. Please use the representation
-    of the class itself.
-    """
+    __slots__ = ()
 
-    def __repr__(self) -> str | None:
-        return self._snowflake
+    def __repr__(self) -> str:
+        return int.__repr__(self)
 
-    def __eq__(self, other: Union[str, int, "Snowflake"]) -> bool:
-        if type(other) == int:
-            return bool(int(self._snowflake) == other)
-        else:
-            return bool(self._snowflake == str(other))
+    __str__ = __repr__
 
     @property
     def timestamp(self) -> datetime:
@@ -72,18 +56,18 @@ class Snowflake:
         Timestamps are denoted as milliseconds since the Discord Epoch:
         the first second of 2015, or `1420070400000`.
         """
-        retrieval: int | float = (int(self._snowflake) >> 22) + 1420070400000
-        return datetime.utcfromtimestamp(retrieval)
+        retrieval: int | float = (self >> 22) + 1420070400000
+        return datetime.utcfromtimestamp(retrieval / 1000)
 
     @property
     def worker_id(self) -> int:
         """The internal worker ID of the snowflake."""
-        return (int(self._snowflake) & 0x3E0000) >> 17
+        return (self & 0x3E0000) >> 17
 
     @property
     def process_id(self) -> int:
         """The internal process ID of the snowflake."""
-        return (int(self._snowflake) & 0x1F000) >> 12
+        return (self & 0x1F000) >> 12
 
     @property
     def increment(self) -> int:
@@ -93,10 +77,10 @@ class Snowflake:
         This value will only increment when a process has been
         generated on this snowflake, e.g. a resource.
         """
-        return int(self._snowflake) & 0xFFF
+        return self & 0xFFF
 
 
-@define(init=False, slots=False)
+@define(weakref_slot=False)
 class Partial:
     """
     Represents partial information to a resource from Discord.
@@ -109,11 +93,11 @@ class Partial:
     the full set of information required for them. The `Partial`
     class lives to serve as a way to better typehint this incomplete
     data.
-    """
 
-    def __init__(self, payload: dict):
-        for attr in payload:
-            self.__setattr__(attr, payload[attr])
+    Partials are slotted like every other resource. The information
+    Discord may leave out is declared as fields defaulting to `None`,
+    rather than being set onto the object as it is given.
+    """
 
 
 @define(kw_only=True)
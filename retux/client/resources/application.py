@@ -1,7 +1,7 @@
 from attrs import define, field
 from enum import IntFlag
 
-from ...utils.converters import optional_c
+from ...utils.converters import dict_c, optional_c
 
 from .abc import Object, Partial, Snowflake
 
@@ -181,7 +181,7 @@ class Application(Object):
     tags: list[str] | None = field(default=None)
     """A maximum of 5 tags describing the content and functionality of the application."""
     install_params: dict | InstallParams | None = field(
-        converter=optional_c(InstallParams), default=None
+        converter=optional_c(dict_c(InstallParams)), default=None
     )
     """The settings for the application's default in-app authorization link."""
     custom_install_url: str | None = field(default=None)
@@ -2,6 +2,7 @@ from enum import IntEnum, IntFlag
 from attrs import define, field
 from retux.client.resources.abc import Snowflake, Object, Partial
 from retux.client.resources.user import User
+from retux.utils.converters import optional_c
 
 __all__ = (
     "Channel",
@@ -311,7 +312,7 @@ class MessageActivity:
 
     type: int | MessageActivityType = field(converter=MessageActivityType)
     """The type of message activity."""
-    party_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    party_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of a party from a rich presence event."""
 
 
@@ -444,7 +445,7 @@ class TextChannel(Partial, Object):
     """
     nsfw: bool | None = field(default=False)
     """Whether or not the channel is NSFW. Defaults to `False`."""
-    last_message_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    last_message_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the last message sent in this channel.
 
@@ -460,11 +461,11 @@ class TextChannel(Partial, Object):
     """The recipients of the dm."""
     icon: str | None = field(default=None)
     """The hash for the channel's icon."""
-    owner_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    owner_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the creator of the group dm or thread."""
-    application_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    application_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the application that created the dm if it is bot-created."""
-    parent_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    parent_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the parent of the channel
 
@@ -864,7 +865,7 @@ class VoiceChannel(Partial, Object):
     """
     nsfw: bool | None = field(default=False)
     """Whether or not the channel is NSFW. Defaults to `False`."""
-    last_message_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    last_message_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the last message sent in this channel.
 
@@ -882,11 +883,11 @@ class VoiceChannel(Partial, Object):
     """
     icon: str | None = field(default=None)
     """The hash for the channel's icon."""
-    owner_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    owner_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the creator of the group dm or thread."""
-    application_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    application_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the application that created the dm if it is bot-created."""
-    parent_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    parent_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the parent of the channel
 
@@ -1012,7 +1013,7 @@ class StageChannel(Partial, Object):
     """The bitrate of the voice channel."""
     icon: str | None = field(default=None)
     """The hash for the channel's icon."""
-    parent_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    parent_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the parent of the channel
 
@@ -1112,7 +1113,7 @@ class ThreadChannel(Partial, Object):
 
     A channel name is in-between 1-100 characters.
     """
-    last_message_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    last_message_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the last message sent in this channel.
 
@@ -1126,9 +1127,9 @@ class ThreadChannel(Partial, Object):
     """
     icon: str | None = field(default=None)
     """The hash for the channel's icon."""
-    owner_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    owner_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the creator of the group dm or thread."""
-    parent_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    parent_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the parent of the channel
 
@@ -1289,7 +1290,7 @@ class Channel(Object):
     """
     nsfw: bool | None = field(default=False)
     """Whether or not the channel is NSFW. Defaults to `False`."""
-    last_message_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    last_message_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the last message sent in this channel.
 
@@ -1309,11 +1310,11 @@ class Channel(Object):
     """The recipients of the dm."""
     icon: str | None = field(default=None)
     """The hash for the channel's icon."""
-    owner_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    owner_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the creator of the group dm or thread."""
-    application_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    application_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the application that created the dm if it is bot-created."""
-    parent_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    parent_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """
     The ID of the parent of the channel
 
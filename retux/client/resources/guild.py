@@ -8,7 +8,7 @@ from .user import User, UserFlags, UserPremiumType
 
 from .abc import Object, Partial, Snowflake
 
-from ...utils.converters import optional_c, list_c
+from ...utils.converters import dict_c, optional_c, list_c
 
 __all__ = (
     "Guild",
@@ -45,7 +45,7 @@ class WelcomeScreenChannel:
     """The ID of the channel shown."""
     description: str = field()
     """A description shown with the channel."""
-    emoji_id: str | Snowflake | None = field(converter=Snowflake, default=None)
+    emoji_id: str | Snowflake | None = field(converter=optional_c(Snowflake), default=None)
     """The ID of the emoji if it isn't a unicode."""
     emoji_name: str | None = field(default=None)
     """The name of the emoji, if present."""
@@ -79,7 +79,7 @@ class WelcomeScreen:
     description: str | None = field(default=None)
     """The description of the guild in the welcome screen."""
     welcome_channels: list[dict] | list[WelcomeScreenChannel] | None = field(
-        converter=optional_c(list_c(WelcomeScreenChannel)), default=None
+        converter=optional_c(list_c(dict_c(WelcomeScreenChannel))), default=None
     )
     """
     The channels show in the welcome screen. A maximum
@@ -413,7 +413,7 @@ class Guild(Object):
     approximate_presence_count: int | None = field(default=None)
     """The approxiated amount of presences in the guild."""
     welcome_screen: dict | WelcomeScreen | None = field(
-        converter=optional_c(WelcomeScreen), default=None
+        converter=optional_c(dict_c(WelcomeScreen)), default=None
     )
     """The welcome screen of the guild, if present."""
     # TODO: implement Sticker object.
@@ -588,8 +588,6 @@ class Member(Partial):
         The ID of the user, if present.
     discriminator : `str`, optional
         The discriminator (4-digit tag) of the user, if present.
-    avatar : `str`, optional
-        The hash of the user's avatar, if present.
     bot : `bool`, optional
         Whether the user is a bot or not, if present.
     system : `bool`, optional
@@ -616,7 +614,7 @@ class Member(Partial):
         The type of Nitro subscription the user has, if present.
     """
 
-    user: dict | User | None = field(converter=optional_c(User), default=None)
+    user: dict | User | None = field(converter=optional_c(dict_c(User)), default=None)
     """
     The user representation of the member in the guild. This is only `None` when
     provided in a `MESSAGE_CREATE` or `MESSAGE_UPDATE` Gateway event.
@@ -714,11 +712,6 @@ class Member(Partial):
         """The discriminator (4-digit tag) of the user, if present."""
         return self.exists(self.user, self.user.discriminator)
 
-    @property
-    def avatar(self) -> str | None:
-        """The hash of the user's avatar, if present."""
-        return self.exists(self.user, self.user.avatar)
-
     @property
     def bot(self) -> bool | None:
         """Whether the user is a bot or not, if present."""
@@ -1 +1,2 @@
 from .converters import *  # noqa
+from .lazy import *  # noqa
@@ -1,5 +1,7 @@
 from typing import Any, Callable
 
+from attrs import fields
+
 
 def optional_c(converter: Callable) -> Callable[..., Any]:
     """
@@ -62,3 +64,36 @@ def list_c(func: Any) -> list[Any]:
             return [func(_) for _ in val]
 
     return inner
+
+
+def dict_c(cls: type) -> Callable[..., Any]:
+    """
+    Handles conversion for values given as a `dict` into an `attrs`-based class.
+
+    ---
+
+    Discord may send keys that the class does not know about yet,
+    which are left out rather than failing the conversion. The keys
+    known to the class are worked out once, ahead of time. Values
+    that are not a `dict` are given back untouched.
+
+    ---
+
+    Attributes
+    ----------
+    cls : `type`
+        The `attrs`-based class to convert to.
+
+    Returns
+    -------
+    `typing.Callable[..., typing.Any]`
+        The converter, giving back an instance of `cls`.
+    """
+    names = frozenset(attr.alias for attr in fields(cls) if attr.init)
+
+    def inner(val):
+        if not isinstance(val, dict):
+            return val
+        return cls(**{key: value for key, value in val.items() if key in names})
+
+    return inner
@@ -0,0 +1,232 @@
+from types import MemberDescriptorType
+from typing import Any
+
+from attrs import NOTHING, Attribute, Factory, fields
+
+__all__ = ("Lazy", "lazy_c", "materialize")
+
+_FIELDS: dict[type, dict[str, Attribute]] = {}
+"""The fields of each class made lazy, by their name."""
+
+
+def _fields(cls: type) -> dict[str, Attribute]:
+    """
+    Looks up the fields of a class, working them out once.
+
+    Parameters
+    ----------
+    cls : `type`
+        The `attrs`-based class.
+
+    Returns
+    -------
+    `dict[str, attrs.Attribute]`
+        The fields of the class, by their name.
+    """
+    if (found := _FIELDS.get(cls)) is None:
+        found = _FIELDS[cls] = {attr.name: attr for attr in fields(cls)}
+
+    return found
+
+
+class Lazy:
+    """
+    Represents a resource from Discord with its fields converted on access.
+
+    ---
+
+    Resources convert every one of their fields when created, which for
+    large payloads such as a guild with thousands of members, results in
+    a great deal of objects that may never be used. A lazy resource holds
+    onto the raw data instead, and only converts a field the first time
+    it is accessed. The converted value is kept for any later access.
+
+    Lazy resources have the same attributes, properties and methods as the
+    class they stand in for, and pass `isinstance()` checks for it as well.
+    They compare, hash, print and test as true or false as it does too,
+    which converts every field they look at. Please use `materialize()`
+    when a real instance of the class is needed.
+
+    ---
+
+    Attributes
+    ----------
+    __cls : `type`
+        The `attrs`-based class stood in for.
+    __data : `dict`
+        The raw data given by Discord.
+    __values : `dict[str, typing.Any]`
+        The fields converted so far, by their name.
+    """
+
+    __slots__ = ("__cls", "__data", "__values")
+    __cls: type
+    """The `attrs`-based class stood in for."""
+    __data: dict
+    """The raw data given by Discord."""
+    __values: dict[str, Any]
+    """The fields converted so far, by their name."""
+
+    def __init__(self, cls: type, data: dict, **values):
+        """
+        Creates a new lazy resource.
+
+        Parameters
+        ----------
+        cls : `type`
+            The `attrs`-based class to stand in for.
+        data : `dict`
+            The raw data given by Discord.
+        **values
+            Any fields already known, by their name. These are not converted.
+        """
+        object.__setattr__(self, "_Lazy__cls", cls)
+        object.__setattr__(self, "_Lazy__data", data)
+        object.__setattr__(self, "_Lazy__values", values)
+
+    @property
+    def __class__(self) -> type:
+        return self.__cls
+
+    def __getattr__(self, name: str) -> Any:
+        values = self.__values
+
+        if name in values:
+            return values[name]
+        if (attr := _fields(self.__cls).get(name)) is None:
+            # Anything else, such as a property or method, is bound to us
+            # so that the fields it looks at are converted lazily as well.
+            # Slots are only ever set on instances, and so are left alone.
+            member = getattr(self.__cls, name)
+
+            if isinstance(member, MemberDescriptorType):
+                raise AttributeError(f"{self.__cls.__name__} has no value for {name}.")
+
+            return member.__get__(self, self.__cls) if hasattr(member, "__get__") else member
+
+        # Fields that are not initialised are never given by Discord,
+        # and so only ever take their default, as with the class.
+        if attr.init and attr.alias in self.__data:
+            value = self.__data[attr.alias]
+        elif attr.default is NOTHING:
+            raise AttributeError(f"{self.__cls.__name__} was not given {attr.alias}.")
+        elif isinstance(attr.default, Factory):
+            value = (
+                attr.default.factory(self) if attr.default.takes_self else attr.default.factory()
+            )
+        else:
+            value = attr.default
+
+        if attr.converter is not None:
+            value = attr.converter(value)
+
+        values[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any):
+        self.__values[name] = value
+
+    # Special methods are looked up on the type rather than the instance,
+    # and so are never reached through `__getattr__`. These are forwarded
+    # to the class stood in for, bound to us as every other method is.
+
+    def __eq__(self, other: Any) -> bool:
+        return self.__cls.__eq__(self, other)
+
+    def __ne__(self, other: Any) -> bool:
+        return self.__cls.__ne__(self, other)
+
+    def __hash__(self) -> int:
+        if self.__cls.__hash__ is None:
+            raise TypeError(f"unhashable type: '{self.__cls.__name__}'")
+
+        return self.__cls.__hash__(self)
+
+    def __str__(self) -> str:
+        return self.__cls.__str__(self)
+
+    def __repr__(self) -> str:
+        return self.__cls.__repr__(self)
+
+    def __bool__(self) -> bool:
+        if (method := getattr(self.__cls, "__bool__", None)) is not None:
+            return method(self)
+        if (method := getattr(self.__cls, "__len__", None)) is not None:
+            return method(self) != 0
+
+        return True
+
+
+def materialize(resource: Any) -> Any:
+    """
+    Creates a real instance of the class a lazy resource stands in for.
+
+    ---
+
+    Every field not yet accessed is converted all at once. Resources
+    that are not lazy are given back untouched.
+
+    ---
+
+    Parameters
+    ----------
+    resource : `typing.Any`
+        The resource to materialize.
+
+    Returns
+    -------
+    `typing.Any`
+        The instance of the resource's class.
+    """
+    if type(resource) is not Lazy:
+        return resource
+
+    cls = resource.__class__
+    data = resource._Lazy__data
+    values = resource._Lazy__values
+
+    for name, attr in _fields(cls).items():
+        if name not in values and (
+            (attr.init and attr.alias in data) or attr.default is not NOTHING
+        ):
+            getattr(resource, name)
+
+    # The fields are already converted, and so are set directly rather than
+    # through the class's initialiser, which would convert them once more.
+    instance = object.__new__(cls)
+
+    for name, value in values.items():
+        object.__setattr__(instance, name, value)
+
+    return instance
+
+
+def lazy_c(cls: type) -> Any:
+    """
+    Handles conversion for values given as a `dict` into a lazy resource.
+
+    ---
+
+    This converter may be used in place of a class-based one on fields
+    holding large or rarely accessed resources, and can be layered
+    inside of `optional_c` and `list_c`.
+
+    ---
+
+    Attributes
+    ----------
+    cls : `type`
+        The `attrs`-based class to stand in for.
+
+    Returns
+    -------
+    `typing.Callable[..., typing.Any]`
+        The converter, giving back a `Lazy` resource of `cls`.
+    """
+
+    def inner(val):
+        if not isinstance(val, dict):
+            return val
+        return Lazy(cls, val)
+
+    return inner
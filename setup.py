@@ -31,6 +31,7 @@ setup(
     packages=find_packages(),
     include_package_data=True,
     install_requires=["attrs", "cattrs", "httpx", "trio", "trio_websocket"],
+    extras_require={"http2": ["httpx[http2]"], "speedups": ["orjson"]},
     python_requires=">=3.10.0",
     classifiers=[
         "Intended Audience :: Developers",
@@ -0,0 +1,216 @@
+"""Fakes of Discord shared by the tests, such as a local Gateway."""
+
+import json
+from functools import partial
+from time import time
+
+import httpx
+from trio import Event, serve_tcp
+from trio_websocket import serve_websocket
+
+from retux.api.gateway import GatewayClient
+from retux.api.http import HTTPClient
+from retux.client.cache import Cache
+from retux.client.flags import Intents
+from retux.const import MISSING
+
+
+async def serve(nursery, handler) -> str:
+    """
+    Serves a fake Gateway on a local port.
+
+    Parameters
+    ----------
+    nursery : `trio.Nursery`
+        The nursery to serve inside of.
+    handler : `typing.Callable[[trio_websocket.WebSocketConnection], typing.Awaitable]`
+        Ran with every connection accepted.
+
+    Returns
+    -------
+    `str`
+        The URL of the fake Gateway.
+    """
+
+    async def accept(request):
+        await handler(await request.accept())
+
+    server = await nursery.start(serve_websocket, accept, "127.0.0.1", 0, None)
+    return f"ws://127.0.0.1:{server.port}"
+
+
+async def send(ws, payload: dict):
+    """Sends a JSON payload to the client."""
+    await ws.send_message(json.dumps(payload))
+
+
+async def receive(ws, op: int) -> dict:
+    """Receives the next JSON payload of an opcode from the client, skipping any others."""
+    while (payload := json.loads(await ws.get_message()))["op"] != op:
+        pass
+
+    return payload
+
+
+class RecordingBot:
+    """A stand-in for a bot hooked into a Gateway, recording the events it is triggered with."""
+
+    def __init__(self, *names: str):
+        self.names = set(names)
+        self.events = []
+        # Events recorded count as having a callback, so they are built into their class.
+        self._calls = {name: [self._trigger] for name in self.names}
+        self.cache = Cache()
+        self._triggered = Event()
+
+    def _listens(self, name: str) -> bool:
+        return name in self.names or self.cache._wants(name)
+
+    async def _trigger(self, name: str, *args):
+        self.events.append((name, args[0] if args else MISSING))
+        self._triggered.set()
+
+    async def wait(self, name: str):
+        """Waits until the bot has been triggered with an event, giving back its data."""
+        while True:
+            for event, data in self.events:
+                if event == name:
+                    return data
+
+            self._triggered = Event()
+            await self._triggered.wait()
+
+
+def resuming_client(url: str, *names: str, **kwargs) -> tuple[GatewayClient, RecordingBot]:
+    """Creates a client with a session to resume on a fake Gateway, hooked into a recording bot."""
+    gateway = GatewayClient("token", Intents(0), **kwargs)
+    gateway._meta.session_id = "session"
+    gateway._meta.seq = 42
+    gateway._meta.resume_gateway_url = url
+    bot = RecordingBot(*names)
+    gateway._bots.append(bot)
+    return gateway, bot
+
+
+def mock_client(handler, **kwargs) -> HTTPClient:
+    """Creates an HTTP client whose requests are answered by a handler, rather than Discord."""
+    client = HTTPClient("token", http2=False, **kwargs)
+    client._client = httpx.AsyncClient(
+        transport=httpx.MockTransport(handler), headers=client._headers
+    )
+    return client
+
+
+class FakeRedis:
+    """A stand-in for a Redis server on a local port, knowing only the commands the cache uses."""
+
+    def __init__(self):
+        self.values = {}
+        self.index = {}
+        self.sets = {}
+        self.commands = []
+        self.connections = 0
+
+    async def serve(self, nursery) -> int:
+        """Serves the fake server, giving back its port."""
+        listeners = await nursery.start(partial(serve_tcp, self._handle, 0, host="127.0.0.1"))
+        return listeners[0].socket.getsockname()[1]
+
+    async def _handle(self, stream):
+        self.connections += 1
+        buffer = bytearray()
+        queued = None
+
+        async def line():
+            nonlocal buffer
+            while (end := buffer.find(b"\r\n")) == -1:
+                if not (data := await stream.receive_some()):
+                    raise EOFError
+                buffer += data
+            result = bytes(buffer[:end])
+            del buffer[: end + 2]
+            return result
+
+        try:
+            while True:
+                count = int((await line())[1:])
+                args = []
+                for _ in range(count):
+                    size = int((await line())[1:])
+                    while len(buffer) < size + 2:
+                        buffer += await stream.receive_some()
+                    args.append(bytes(buffer[:size]))
+                    del buffer[: size + 2]
+
+                name = args[0].decode().upper()
+                self.commands.append(name)
+
+                if name == "MULTI":
+                    queued = []
+                    reply = "OK"
+                elif name == "EXEC":
+                    reply, queued = [self._run(*command) for command in queued], None
+                elif queued is not None:
+                    queued.append((name, args[1:]))
+                    reply = "QUEUED"
+                else:
+                    reply = self._run(name, args[1:])
+
+                await stream.send_all(self._encode(reply))
+        except EOFError:
+            pass
+
+    def _run(self, name, args):
+        match name:
+            case "AUTH" | "SELECT":
+                return "OK"
+            case "GET":
+                return self.values.get(args[0])
+            case "MGET":
+                return [self.values.get(key) for key in args]
+            case "SET":
+                self.values[args[0]] = args[1]
+                return "OK"
+            case "DEL":
+                return sum(
+                    self.values.pop(key, None) is not None or self.sets.pop(key, None) is not None
+                    for key in args
+                )
+            case "ZADD":
+                self.index[args[2]] = float(args[1])
+                return 1
+            case "ZREM":
+                return sum(self.index.pop(key, None) is not None for key in args[1:])
+            case "ZRANGE":
+                return sorted(self.index, key=self.index.get)
+            case "SADD":
+                members = self.sets.setdefault(args[0], set())
+                added = set(args[1:]) - members
+                members |= added
+                return len(added)
+            case "SMEMBERS":
+                return sorted(self.sets.get(args[0], ()))
+            case "ZCARD":
+                return len(self.index)
+            case "ZREMRANGEBYSCORE":
+                now = time()
+                expired = [key for key, score in self.index.items() if score < now]
+                for key in expired:
+                    del self.index[key]
+                return len(expired)
+
+        return ValueError(f"ERR unknown command '{name}'")
+
+    def _encode(self, reply) -> bytes:
+        if reply is None:
+            return b"$-1\r\n"
+        if isinstance(reply, ValueError):
+            return b"-%s\r\n" % str(reply).encode()
+        if isinstance(reply, str):
+            return b"+%s\r\n" % reply.encode()
+        if isinstance(reply, int):
+            return b":%d\r\n" % reply
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+        return b"*%d\r\n" % len(reply) + b"".join(map(self._encode, reply))
@@ -0,0 +1,101 @@
+import httpx
+import pytest
+import trio
+from trio.testing import MockClock
+
+from retux.api.error import HTTPException
+from retux.client.bot import Bot
+from retux.client.flags import Intents
+
+from fakes import mock_client
+
+GUILD = {"id": "1", "name": "guild", "owner_id": "2", "roles": [], "emojis": []}
+MEMBER = {
+    "user": {"id": "2", "username": "user", "discriminator": "0001"},
+    "roles": [],
+    "joined_at": "2021-01-01T00:00:00+00:00",
+}
+
+
+def discord(request):
+    match request.url.path.removeprefix("/api/v10"):
+        case "/guilds/1":
+            return httpx.Response(200, json=GUILD)
+        case "/guilds/1/members/2":
+            return httpx.Response(200, json=MEMBER)
+        case "/guilds/9":
+            return httpx.Response(404, json={"message": "Unknown Guild", "code": 10004})
+        case "/guilds/1/members/9":
+            return httpx.Response(404, json={"message": "Unknown Member", "code": 10007})
+        case _:
+            return httpx.Response(500, json={"message": "Internal Server Error", "code": 0})
+
+
+def run_bot(test):
+    async def main():
+        bot = Bot(Intents(0))
+
+        async with mock_client(discord) as bot.http:
+            await test(bot)
+
+    trio.run(main)
+
+
+def test_getters_fetch_and_cache():
+    async def test(bot):
+        guild = await bot.get_guild(1)
+        member = await bot.get_member(1, 2)
+
+        assert guild.name == "guild"
+        assert member.user.username == "user"
+        assert await bot.cache.get_guild(1) is not None
+        assert await bot.cache.get_member(1, 2) is not None
+        assert await bot.cache.get_user(2) is not None
+
+    run_bot(test)
+
+
+def test_getters_give_none_for_unknown_resources():
+    async def test(bot):
+        assert await bot.get_guild(9) is None
+        assert await bot.get_member(1, 9) is None
+        assert await bot.cache.guilds.size() == await bot.cache.members.size() == 0
+
+    run_bot(test)
+
+
+def test_getters_raise_other_errors():
+    async def test(bot):
+        with pytest.raises(HTTPException) as err:
+            await bot.get_user(3)
+
+        assert err.value.status == 500
+        assert await bot.cache.users.size() == 0
+
+    run_bot(test)
+
+
+def test_connection_events_never_wait_on_callbacks():
+    async def main():
+        bot = Bot(Intents(0), max_in_flight=1)
+        bot._calls = {}
+        acked = trio.Event()
+
+        @bot.on
+        async def message_create(event):
+            await trio.sleep_forever()
+
+        @bot.on
+        async def heartbeat_ack(event):
+            acked.set()
+
+        async with trio.open_nursery() as bot._handlers:
+            await bot._trigger("message_create", {})
+
+            with trio.fail_after(1):
+                await bot._trigger("heartbeat_ack", {})
+                await acked.wait()
+
+            bot._handlers.cancel_scope.cancel()
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
@@ -0,0 +1,77 @@
+import pytest
+import trio
+from trio.testing import MockClock
+
+from retux.api.gateway import _EventBuffer
+
+
+def run(main):
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+
+async def drain(buffer: _EventBuffer) -> list[str]:
+    buffer.close()
+    names = []
+
+    while (event := await buffer.get()) is not None:
+        names.append(event[0])
+
+    return names
+
+
+def test_block_waits_for_room():
+    async def main():
+        buffer = _EventBuffer(2, "block")
+        await buffer.put("A", {})
+        await buffer.put("B", {})
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(buffer.put, "C", {})
+            await trio.sleep(1)
+
+            assert buffer.depth == 2 and buffer.blocked == 1
+            assert (await buffer.get())[0] == "A"
+
+        assert await drain(buffer) == ["B", "C"]
+        assert buffer.dropped == buffer.spilled == 0
+
+    run(main)
+
+
+def test_drop_removes_low_priority_events_first():
+    async def main():
+        buffer = _EventBuffer(2, "drop")
+        await buffer.put("TYPING_START", {})
+        await buffer.put("MESSAGE_CREATE", {})
+        await buffer.put("MESSAGE_UPDATE", {})
+
+        # Low-priority events are dropped themselves once nothing else can be.
+        await buffer.put("PRESENCE_UPDATE", {})
+
+        assert buffer.dropped == 2
+        assert await drain(buffer) == ["MESSAGE_CREATE", "MESSAGE_UPDATE"]
+
+    run(main)
+
+
+def test_spill_keeps_every_event_in_order():
+    async def main():
+        buffer = _EventBuffer(2, "spill")
+
+        for index in range(10):
+            await buffer.put(f"EVENT_{index}", {"index": index})
+
+        assert buffer.spilled == 8 and buffer.depth == 10
+        assert (await buffer.get()) == ("EVENT_0", {"index": 0})
+
+        await buffer.put("EVENT_10", {"index": 10})
+
+        assert await drain(buffer) == [f"EVENT_{index}" for index in range(1, 11)]
+        assert buffer.peak == 2 and buffer.depth == 0
+
+    run(main)
+
+
+def test_unknown_policies_are_rejected():
+    with pytest.raises(ValueError):
+        _EventBuffer(2, "ignore")
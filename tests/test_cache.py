@@ -0,0 +1,255 @@
+import tracemalloc
+from fcntl import LOCK_EX, LOCK_UN, flock
+from functools import partial
+
+import trio
+
+from retux.client.cache import Cache, MemberStore, RedisBackend, SharedMemoryBackend
+from retux.client.resources.abc import Snowflake
+
+from fakes import FakeRedis
+
+GUILD = Snowflake(1)
+
+
+def run_redis(test):
+    async def main():
+        redis = FakeRedis()
+
+        async with trio.open_nursery() as nursery:
+            port = await redis.serve(nursery)
+            await test(redis, RedisBackend("retux:members", port=port, host="127.0.0.1"))
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+def test_redis_round_trip_without_getdel():
+    async def test(redis, backend):
+        await backend.put((GUILD, Snowflake(2)), {"nick": "two"})
+
+        assert await backend.get((GUILD, Snowflake(2))) == {"nick": "two"}
+        assert await backend.size() == 1
+        assert await backend.pop((GUILD, Snowflake(2))) == {"nick": "two"}
+        assert await backend.get((GUILD, Snowflake(2))) is None
+        assert await backend.size() == 0
+        assert "GETDEL" not in redis.commands
+
+    run_redis(test)
+
+
+def test_redis_discard_goes_through_the_index():
+    async def test(redis, backend):
+        for user_id in range(2, 6):
+            await backend.put((GUILD, Snowflake(user_id)), {"nick": str(user_id)})
+
+        # Keys of other namespaces are never looked at.
+        redis.values[b"retux:guilds:1"] = b"j{}"
+
+        assert await backend.discard(lambda key, member: int(member["nick"]) % 2 == 0) == 2
+        assert await backend.size() == 2
+        assert await backend.get((GUILD, Snowflake(3))) == {"nick": "3"}
+        assert b"retux:guilds:1" in redis.values
+        assert "SCAN" not in redis.commands and "KEYS" not in redis.commands
+
+    run_redis(test)
+
+
+def test_redis_guild_delete_only_goes_through_the_guild():
+    async def main():
+        redis = FakeRedis()
+
+        async with trio.open_nursery() as nursery:
+            port = await redis.serve(nursery)
+            cache = Cache(
+                channels=RedisBackend("retux:channels", port=port, host="127.0.0.1"),
+                members=RedisBackend("retux:members", port=port, host="127.0.0.1"),
+            )
+
+            for guild_id in (1, 2):
+                await cache._update(
+                    "guild_create",
+                    {
+                        "id": guild_id,
+                        "name": "guild",
+                        "channels": [{"id": guild_id * 10, "type": 0}],
+                        "members": chunk(guild_id * 10, 2)["members"],
+                    },
+                )
+
+            redis.commands.clear()
+            await cache._update("guild_delete", {"id": 1})
+
+            assert await cache.get_channel(10) is None
+            assert await cache.get_member(1, 10) is None
+            assert await cache.get_channel(20) is not None
+            assert await cache.get_member(2, 21) is not None
+            assert "ZRANGE" not in redis.commands and "MGET" not in redis.commands
+            assert b"retux:members:guild:1" not in redis.sets
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+def test_redis_backs_off_while_unreachable():
+    async def main():
+        connections = 0
+
+        async def refuse(stream):
+            nonlocal connections
+            connections += 1
+            await stream.aclose()
+
+        async with trio.open_nursery() as nursery:
+            listeners = await nursery.start(partial(trio.serve_tcp, refuse, 0, host="127.0.0.1"))
+            port = listeners[0].socket.getsockname()[1]
+            backend = RedisBackend("retux:guilds", port=port, host="127.0.0.1")
+
+            for _ in range(100):
+                assert await backend.get(GUILD) is None
+
+            assert connections == 1
+
+            await trio.sleep(0.6)
+            assert await backend.get(GUILD) is None
+            assert connections == 2
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+def test_redis_never_blocks_other_tasks():
+    async def main():
+        ticks = 0
+
+        async def silent(stream):
+            await trio.sleep_forever()
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await trio.sleep(0.01)
+                ticks += 1
+
+        async with trio.open_nursery() as nursery:
+            listeners = await nursery.start(partial(trio.serve_tcp, silent, 0, host="127.0.0.1"))
+            port = listeners[0].socket.getsockname()[1]
+            backend = RedisBackend("retux:guilds", port=port, host="127.0.0.1", timeout=0.2)
+            nursery.start_soon(tick)
+
+            assert await backend.get(GUILD) is None
+            assert ticks >= 5
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+def chunk(start: int, count: int) -> dict:
+    return {
+        "guild_id": "1",
+        "members": [
+            {
+                "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0001"},
+                "roles": ["123456789012345678"],
+                "joined_at": "2021-01-01T00:00:00+00:00",
+                "deaf": False,
+                "mute": False,
+            }
+            for user_id in range(start, start + count)
+        ],
+    }
+
+
+def test_member_store_keeps_users_compactly():
+    async def main():
+        cache = Cache(members=MemberStore())
+        tracemalloc.start()
+
+        try:
+            for start in range(10**17, 10**17 + 20_000, 1000):
+                await cache._update("guild_members_chunk", chunk(start, 1000))
+
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        member = await cache.get_member(1, 10**17 + 5)
+
+        assert member.user.username == f"user{10**17 + 5}"
+        assert await cache.members.size() == 20_000
+        assert await cache.users.size() == 0
+        assert size < 20_000 * 200
+
+    trio.run(main)
+
+
+def test_guild_delete_removes_its_channels_and_members():
+    async def main():
+        cache = Cache()
+        await cache._update(
+            "guild_create",
+            {
+                "id": "1",
+                "name": "guild",
+                "channels": [{"id": "2", "type": 0}],
+                "members": chunk(3, 1)["members"],
+            },
+        )
+        await cache._update("channel_create", {"id": "4", "type": 0, "guild_id": "5"})
+        await cache._update("guild_delete", {"id": "1"})
+
+        assert await cache.get_guild(1) is None
+        assert await cache.get_channel(2) is None
+        assert await cache.get_channel(4) is not None
+        assert await cache.get_member(1, 3) is None
+
+    trio.run(main)
+
+
+def test_guild_delete_removes_its_channels_with_integer_ids():
+    async def main():
+        cache = Cache()
+        await cache._update(
+            "guild_create", {"id": 1, "name": "guild", "channels": [{"id": 2, "type": 0}]}
+        )
+        await cache._update("channel_create", {"id": 3, "type": 0, "guild_id": 1})
+        await cache._update("channel_create", {"id": 4, "type": 0, "guild_id": 5})
+        await cache._update("guild_delete", {"id": 1})
+
+        assert await cache.get_channel(2) is None
+        assert await cache.get_channel(3) is None
+        assert await cache.get_channel(4) is not None
+
+    trio.run(main)
+
+
+def test_shared_memory_lock_never_blocks_other_tasks(tmp_path):
+    async def main():
+        path = str(tmp_path / "guilds")
+        backend = SharedMemoryBackend(path, slots=16)
+        await backend.put(GUILD, {"id": "1"})
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await trio.sleep(0.01)
+                ticks += 1
+
+        # Another process holding onto the lock, such as while discarding a guild.
+        with open(path, "rb") as other:
+            flock(other.fileno(), LOCK_EX)
+
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(tick)
+                nursery.start_soon(backend.get, GUILD)
+                await trio.sleep(0.2)
+                flock(other.fileno(), LOCK_UN)
+
+                assert ticks >= 5
+                assert await backend.get(GUILD) == {"id": "1"}
+                nursery.cancel_scope.cancel()
+
+        backend.close()
+
+    trio.run(main)
@@ -0,0 +1,97 @@
+from contextlib import AsyncExitStack
+
+import trio
+from trio.testing import MockClock
+
+from retux.client.cluster import Cluster, ClusterClient
+
+
+class BrokenPipe:
+    async def send(self, message: dict):
+        raise trio.BrokenResourceError
+
+
+def run_cluster(test, tmp_path, workers: int = 2):
+    async def main():
+        cluster = Cluster(None, path=str(tmp_path / "cluster.sock"))
+
+        async with trio.open_nursery() as nursery:
+            await nursery.start(cluster._serve)
+
+            async with AsyncExitStack() as stack:
+                clients = [
+                    await stack.enter_async_context(ClusterClient(cluster._path, worker_id))
+                    for worker_id in range(workers)
+                ]
+
+                while len(cluster._pipes) < workers:
+                    await trio.sleep(0.01)
+
+                await test(cluster, clients)
+
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+async def echo(data):
+    return data
+
+
+def test_query_skips_disconnected_workers(tmp_path):
+    async def test(cluster, clients):
+        clients[1].handler = echo
+        cluster._pipes[5] = BrokenPipe()
+
+        assert await clients[0].query("ping") == {1: "ping"}
+        # The worker asking is still connected after a target failed.
+        assert await clients[0].query("again", worker=1) == {1: "again"}
+        assert await clients[0].query("nobody", worker=7) == {}
+
+    run_cluster(test, tmp_path)
+
+
+def test_query_times_out(tmp_path):
+    async def test(cluster, clients):
+        async def stall(data):
+            await trio.sleep_forever()
+
+        clients[1].handler = stall
+        clients[2].handler = echo
+
+        with trio.fail_after(2):
+            assert await clients[0].query("ping", timeout=0.2) == {2: "ping"}
+
+    run_cluster(test, tmp_path, workers=3)
+
+
+def test_unencodable_answers_are_given_back_as_none(tmp_path):
+    async def test(cluster, clients):
+        async def unencodable(data):
+            return object()
+
+        clients[1].handler = unencodable
+
+        assert await clients[0].query("ping") == {1: None}
+        clients[1].handler = echo
+        assert await clients[0].query("ping") == {1: "ping"}
+
+    run_cluster(test, tmp_path)
+
+
+def test_disconnected_cluster_never_takes_down_the_worker():
+    client = ClusterClient("cluster.sock", 0)
+    client._pipe = BrokenPipe()
+    client.handler = echo
+
+    async def main():
+        with trio.fail_after(60):
+            await client._answer({"op": "query", "nonce": "1", "source": 1, "data": "ping"})
+            await client.publish({"shards": [0]})
+
+            # Identifies are no longer handed out, and so are waited on alone.
+            start = trio.current_time()
+            await client.wait_to_identify(0)
+            assert trio.current_time() - start >= 5
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
@@ -0,0 +1,33 @@
+import pytest
+
+from retux.api.codec import JSONCodec
+from retux.api.etf import ETFCodec
+
+PAYLOAD = {
+    "op": 0,
+    "t": "GUILD_CREATE",
+    "s": 5,
+    "d": {
+        "id": "123456789012345678",
+        "name": "gùild ✨",
+        "large": True,
+        "icon": None,
+        "counts": [0, -1, 255, 256, 2**31, -(2**31) - 1, 2**64, -(2**70)],
+        "ratio": 1.5,
+        "roles": [{"id": "1", "tags": {}}],
+        "features": [],
+    },
+}
+
+
+def test_etf_round_trip():
+    etf = ETFCodec()
+    data = etf.dumps(PAYLOAD)
+
+    assert isinstance(data, bytes) and data == etf.dumpb(PAYLOAD)
+    assert etf.loads(data) == PAYLOAD
+
+
+def test_etf_rejects_unknown_versions():
+    with pytest.raises(ValueError):
+        ETFCodec().loads(JSONCodec().dumpb(PAYLOAD))
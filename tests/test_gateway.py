@@ -0,0 +1,311 @@
+import json
+from zlib import Z_SYNC_FLUSH, compressobj
+
+import trio
+from trio.testing import MockClock
+
+from retux.api.etf import ETFCodec
+from retux.api.events.connection import Resumed
+from retux.api.gateway import GatewayClient, _GatewayPayload, _SendPriority, _SendQueue
+from retux.api.shard import ShardManager
+from retux.client.flags import Intents
+
+from fakes import receive, resuming_client, send, serve
+
+
+def test_resume_with_discord_shaped_resumed():
+    resumes = []
+
+    async def handler(ws):
+        await send(ws, {"op": 10, "d": {"heartbeat_interval": 45000}})
+        resumes.append(await receive(ws, 6))
+        await send(ws, {"op": 0, "t": "RESUMED", "s": 43, "d": None})
+        await trio.sleep_forever()
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            gateway, bot = resuming_client(await serve(nursery, handler), "resumed")
+
+            async with gateway:
+                with trio.fail_after(5):
+                    event = await bot.wait("resumed")
+
+                nursery.cancel_scope.cancel()
+
+        assert resumes[0]["d"] == {"token": "token", "session_id": "session", "seq": 42}
+        assert isinstance(event, Resumed)
+        assert (event.session_id, event.seq) == ("session", 43)
+        assert gateway.metrics["resumes"] == 1
+        assert gateway._sends.ready
+
+    trio.run(main)
+
+
+def test_client_dispatches_events_after_restarting():
+    async def handler(ws):
+        await send(ws, {"op": 10, "d": {"heartbeat_interval": 45000}})
+        await receive(ws, 6)
+        await send(ws, {"op": 0, "t": "RESUMED", "s": 43, "d": None})
+        await send(ws, {"op": 0, "t": "MESSAGE_CREATE", "s": 44, "d": {"id": "1"}})
+        await trio.sleep_forever()
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            gateway, bot = resuming_client(await serve(nursery, handler), "message_create")
+
+            for _ in range(2):
+                bot.events.clear()
+
+                with trio.fail_after(5), trio.CancelScope() as scope:
+                    async with gateway:
+                        assert await bot.wait("message_create") == {"id": "1"}
+                        scope.cancel()
+
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+
+def test_etf_payloads_are_sent_in_binary_frames():
+    etf = ETFCodec()
+    frames = []
+
+    async def handler(ws):
+        await ws.send_message(etf.dumps({"op": 10, "d": {"heartbeat_interval": 45000}}))
+        frames.append(await ws.get_message())
+        await ws.send_message(etf.dumps({"op": 0, "t": "RESUMED", "s": 43, "d": None}))
+        await ws.send_message(
+            etf.dumps({"op": 0, "t": "MESSAGE_CREATE", "s": 44, "d": {"id": "1", "nonce": 2**64}})
+        )
+        await trio.sleep_forever()
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            url = await serve(nursery, handler)
+            gateway, bot = resuming_client(url, "message_create", encoding="etf")
+
+            async with gateway:
+                with trio.fail_after(5):
+                    assert await bot.wait("message_create") == {"id": "1", "nonce": 2**64}
+
+                nursery.cancel_scope.cancel()
+
+    trio.run(main)
+
+    assert isinstance(frames[0], bytes)
+    assert etf.loads(frames[0]) == {
+        "op": 6,
+        "d": {"token": "token", "session_id": "session", "seq": 42},
+        "s": None,
+        "t": None,
+    }
+
+
+def test_zlib_stream_payloads_split_across_messages():
+    deflate = compressobj()
+
+    async def send_compressed(ws, payload: dict, parts: int = 1):
+        data = deflate.compress(json.dumps(payload).encode()) + deflate.flush(Z_SYNC_FLUSH)
+        size = -(-len(data) // parts)
+
+        for start in range(0, len(data), size):
+            await ws.send_message(data[start : start + size])
+
+    async def handler(ws):
+        await send_compressed(ws, {"op": 10, "d": {"heartbeat_interval": 45000}})
+        await receive(ws, 6)
+        await send_compressed(ws, {"op": 0, "t": "RESUMED", "s": 43, "d": None}, parts=2)
+        await send_compressed(
+            ws, {"op": 0, "t": "MESSAGE_CREATE", "s": 44, "d": {"id": "1", "content": "a" * 5000}}
+        )
+        await trio.sleep_forever()
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            url = await serve(nursery, handler)
+            gateway, bot = resuming_client(url, "message_create", compress="zlib-stream")
+
+            async with gateway:
+                with trio.fail_after(5):
+                    event = await bot.wait("message_create")
+
+                nursery.cancel_scope.cancel()
+
+        assert event == {"id": "1", "content": "a" * 5000}
+        assert gateway._meta.seq == 44
+
+    trio.run(main)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.sent = []
+        self.closed = None
+
+    async def send_message(self, data):
+        self.sent.append((trio.current_time(), data))
+
+    async def aclose(self, code=1000):
+        self.closed = code
+
+
+def most_in_any_window(times: list[float], per: float) -> int:
+    return max(sum(start <= time < start + per for time in times) for start in times)
+
+
+def test_send_queue_never_exceeds_limit_in_any_window():
+    conn = FakeConnection()
+
+    async def main():
+        queue = _SendQueue()
+        queue.open()
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(queue.run, conn)
+
+            for index in range(300):
+                nursery.start_soon(queue.put, f"request {index}", _SendPriority.REQUEST)
+
+            await trio.sleep(60 * 3 + 1)
+            nursery.cancel_scope.cancel()
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+    times = [time for time, _ in conn.sent]
+
+    assert len(times) == 300
+    assert most_in_any_window(times, 60) <= 120 - 5
+    assert sum(time < 60 for time in times) == 115
+
+
+def test_send_queue_reserves_room_for_heartbeats():
+    conn = FakeConnection()
+
+    async def main():
+        queue = _SendQueue()
+        queue.open()
+
+        async with trio.open_nursery() as nursery:
+            nursery.start_soon(queue.run, conn)
+
+            for index in range(200):
+                nursery.start_soon(queue.put, f"request {index}", _SendPriority.REQUEST)
+
+            await trio.sleep(10)
+
+            for index in range(5):
+                with trio.fail_after(0.1):
+                    await queue.put(f"heartbeat {index}", _SendPriority.CONNECTION)
+
+            nursery.cancel_scope.cancel()
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+    times = [time for time, _ in conn.sent]
+
+    assert most_in_any_window(times, 60) <= 120
+    assert [data for _, data in conn.sent[-5:]] == [f"heartbeat {index}" for index in range(5)]
+
+
+def test_requested_heartbeat_keeps_the_time_to_acknowledge():
+    conn = FakeConnection()
+    gateway = GatewayClient("token", Intents(0))
+
+    async def main():
+        gateway._conn = conn
+        gateway._meta.heartbeat_interval = 10.0
+        gateway._sends.open()
+
+        with trio.fail_after(60):
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(gateway._sends.run, conn)
+                nursery.start_soon(gateway._heartbeat, conn)
+
+                while not conn.sent:
+                    await trio.sleep(0.01)
+
+                first = conn.sent[0][0]
+                await gateway._track(_GatewayPayload(op=11))
+
+                # The Gateway asks for a beat right before the next one is due,
+                # which is acknowledged only after that one has been sent.
+                await trio.sleep_until(first + 9.9)
+                await gateway._track(_GatewayPayload(op=1))
+                await trio.sleep(0.5)
+                await gateway._track(_GatewayPayload(op=11))
+
+                await trio.sleep_until(first + 20.5)
+                nursery.cancel_scope.cancel()
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+    assert conn.closed is None
+    assert len(conn.sent) == 4
+
+
+def test_unacknowledged_heartbeat_closes_the_zombie_connection():
+    conn = FakeConnection()
+    gateway = GatewayClient("token", Intents(0))
+
+    async def main():
+        gateway._conn = conn
+        gateway._meta.heartbeat_interval = 10.0
+        gateway._sends.open()
+
+        with trio.fail_after(60):
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(gateway._sends.run, conn)
+                nursery.start_soon(gateway._heartbeat, conn)
+
+                while not conn.sent:
+                    await trio.sleep(0.01)
+
+                await gateway._track(_GatewayPayload(op=1))
+                await trio.sleep(10.5)
+                nursery.cancel_scope.cancel()
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+    assert conn.closed == 4000
+
+
+def test_shards_waiting_to_identify_keep_acknowledging_heartbeats():
+    manager = ShardManager("token", Intents(0), shard_count=6, max_concurrency=1)
+    conns = [FakeConnection() for _ in range(6)]
+
+    async def read(shard: GatewayClient, conn: FakeConnection):
+        # Stands in for the reader, acknowledging every heartbeat it sees sent.
+        await shard._track(_GatewayPayload(op=10, d={"heartbeat_interval": 10000}))
+        acked = 0
+
+        while True:
+            beats = [data for _, data in conn.sent if json.loads(data)["op"] == 1]
+            for _ in beats[acked:]:
+                await shard._track(_GatewayPayload(op=11))
+            acked = len(beats)
+            await trio.sleep(0.1)
+
+    async def main():
+        with trio.fail_after(60):
+            async with trio.open_nursery() as nursery:
+                for shard_id, conn in enumerate(conns):
+                    shard = GatewayClient("token", Intents(0), shard=(shard_id, 6))
+                    shard._identify_gate = manager._wait_to_identify
+                    shard._conn = conn
+                    shard._beats = nursery
+                    shard._sends.open()
+                    nursery.start_soon(shard._sends.run, conn)
+                    nursery.start_soon(read, shard, conn)
+
+                # The last shard identifies after two heartbeat intervals.
+                await trio.sleep(40)
+                nursery.cancel_scope.cancel()
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+    for conn in conns:
+        assert conn.closed is None
+        assert [json.loads(data)["op"] for _, data in conn.sent].count(2) == 1
+
+    identified = sorted(
+        time for conn in conns for time, data in conn.sent if json.loads(data)["op"] == 2
+    )
+    assert all(later - earlier >= 5 for earlier, later in zip(identified, identified[1:]))
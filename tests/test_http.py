@@ -0,0 +1,149 @@
+import httpx
+import pytest
+import trio
+from trio.testing import MockClock
+
+from retux.api.error import HTTPException
+from retux.api.http import _RateLimiter, _Route
+
+from fakes import mock_client
+
+
+def most_in_any_window(times: list[float], per: float) -> int:
+    return max(sum(start <= time < start + per for time in times) for start in times)
+
+
+def test_global_gate_never_exceeds_limit_in_any_second():
+    limiter = _RateLimiter(global_limit=50)
+    times = []
+
+    async def request(index: int):
+        async with limiter.acquire(_Route("GET", "/channels/0", channel_id=str(index))):
+            times.append(trio.current_time())
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            for index in range(200):
+                nursery.start_soon(request, index)
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+    assert len(times) == 200
+    assert most_in_any_window(times, 1) == 50
+    assert max(times) >= 3
+
+
+def test_max_rate_limit_wait_is_raised():
+    def handler(request):
+        return httpx.Response(
+            429,
+            json={"message": "You are being rate limited.", "retry_after": 10, "global": False},
+            headers={"X-RateLimit-Bucket": "bucket"},
+        )
+
+    async def main():
+        async with mock_client(handler, max_rate_limit_wait=1) as client:
+            with pytest.raises(HTTPException) as err:
+                await client.request(_Route("GET", "/users/@me"), {})
+
+        assert err.value.code == 429
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+
+def test_endless_rate_limits_are_given_up_on():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(
+            429,
+            json={"message": "You are being rate limited.", "retry_after": 1, "global": False},
+            headers={"X-RateLimit-Bucket": "bucket"},
+        )
+
+    async def main():
+        async with mock_client(handler) as client:
+            with trio.fail_after(60):
+                with pytest.raises(HTTPException) as err:
+                    await client.request(_Route("GET", "/users/@me"), {})
+
+        assert err.value.code == 429
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+    assert len(requests) == 5
+
+
+def test_error_body_is_raised():
+    def handler(request):
+        errors = {"content": {"_errors": [{"code": "BASE_TYPE_REQUIRED"}]}}
+        return httpx.Response(
+            400, json={"code": 50035, "message": "Invalid Form Body", "errors": errors}
+        )
+
+    async def main():
+        async with mock_client(handler) as client:
+            with pytest.raises(HTTPException) as err:
+                await client.request(_Route("POST", "/channels/1/messages"), {"content": ""})
+
+        assert err.value.code == 50035
+
+    trio.run(main)
+
+
+def test_concurrent_gets_are_coalesced():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await trio.sleep(1)
+        return httpx.Response(200, json={"id": "1", "name": "guild"})
+
+    async def main():
+        results = []
+
+        async def get():
+            results.append(await client.request(_Route("GET", "/guilds/1", guild_id="1"), {}))
+
+        async with mock_client(handler) as client:
+            async with trio.open_nursery() as nursery:
+                for _ in range(500):
+                    nursery.start_soon(get)
+
+        assert len(calls) == 1
+        assert results == [{"id": "1", "name": "guild"}] * 500
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
+
+
+def test_cancelled_leader_hands_the_get_to_a_waiter():
+    calls = []
+
+    async def handler(request):
+        calls.append(request.url.path)
+        await trio.sleep(1)
+        return httpx.Response(200, json={"id": "1"})
+
+    async def main():
+        results = []
+
+        async def get():
+            results.append(await client.request(_Route("GET", "/users/1"), {}))
+
+        async def leader():
+            with trio.move_on_after(0.5):
+                await get()
+
+        async with mock_client(handler) as client:
+            async with trio.open_nursery() as nursery:
+                nursery.start_soon(leader)
+                await trio.sleep(0.1)
+
+                for _ in range(3):
+                    nursery.start_soon(get)
+
+        assert len(calls) == 2
+        assert results == [{"id": "1"}] * 3
+
+    trio.run(main, clock=MockClock(autojump_threshold=0))
@@ -0,0 +1,139 @@
+import pytest
+import trio
+
+from retux.api import gateway as gateway_module
+from retux.api.error import GatewayException
+from retux.client.resources.abc import Snowflake
+
+from fakes import receive, resuming_client, send, serve
+
+
+def member(user_id: int) -> dict:
+    return {
+        "user": {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0001"},
+        "roles": [],
+        "joined_at": "2021-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+    }
+
+
+def chunk(nonce: str, index: int, count: int, size: int = 2) -> dict:
+    members = [member(index * size + offset) for offset in range(size)]
+    data = {"guild_id": "1", "members": members, "chunk_index": index, "chunk_count": count}
+    return {"op": 0, "t": "GUILD_MEMBERS_CHUNK", "s": 44 + index, "d": {**data, "nonce": nonce}}
+
+
+def run_members(answer, test):
+    requests = []
+
+    async def handler(ws):
+        await send(ws, {"op": 10, "d": {"heartbeat_interval": 45000}})
+        await receive(ws, 6)
+        await send(ws, {"op": 0, "t": "RESUMED", "s": 43, "d": None})
+
+        while True:
+            requests.append(request := await receive(ws, 8))
+            await answer(ws, request["d"]["nonce"])
+
+    async def main():
+        async with trio.open_nursery() as nursery:
+            gateway, bot = resuming_client(await serve(nursery, handler), "message_create")
+
+            async with gateway:
+                with trio.fail_after(5):
+                    await test(gateway, bot)
+
+                nursery.cancel_scope.cancel()
+
+    trio.run(main)
+    return requests
+
+
+def test_stream_gives_every_chunk_of_its_own_request():
+    async def answer(ws, nonce):
+        # Chunks of another request are never mixed into the stream.
+        await send(ws, chunk("other", 0, 1))
+
+        for index in range(3):
+            await send(ws, chunk(nonce, index, 3))
+
+    async def test(gateway, bot):
+        ids = []
+
+        async for part in gateway.stream_guild_members(Snowflake(1), limit=0):
+            ids += [part_member.user.id for part_member in part.members]
+
+        assert ids == list(range(6))
+        assert not gateway._chunks
+
+    requests = run_members(answer, test)
+
+    assert requests[0]["d"]["guild_id"] == "1"
+    assert requests[0]["d"]["limit"] == 0 and requests[0]["d"]["query"] == ""
+
+
+def test_stream_falling_behind_never_holds_up_the_gateway(monkeypatch):
+    monkeypatch.setattr(gateway_module, "_CHUNK_STALL", 0.1)
+
+    async def answer(ws, nonce):
+        for index in range(4):
+            await send(ws, chunk(nonce, index, 4))
+
+        await send(ws, {"op": 0, "t": "MESSAGE_CREATE", "s": 50, "d": {"id": "1"}})
+
+    async def test(gateway, bot):
+        stream = gateway.stream_guild_members(Snowflake(1), buffer=1)
+        await stream.__anext__()
+
+        # Events read after the stalled chunks are still dispatched.
+        assert await bot.wait("message_create") == {"id": "1"}
+
+        with pytest.raises(GatewayException):
+            async for _ in stream:
+                pass
+
+        assert not gateway._chunks
+
+    run_members(answer, test)
+
+
+def test_stream_times_out_waiting_on_chunks():
+    async def answer(ws, nonce):
+        pass
+
+    async def test(gateway, bot):
+        with pytest.raises(GatewayException):
+            async for _ in gateway.stream_guild_members(Snowflake(1), timeout=0.2):
+                pass
+
+        assert not gateway._chunks
+
+    run_members(answer, test)
+
+
+def test_chunks_are_built_once_for_the_stream_and_never_for_the_cache(monkeypatch):
+    built = []
+    deserialize = gateway_module._EventTable.deserialize
+
+    def counting(resource, name, *args, **kwargs):
+        built.append(name)
+        return deserialize(resource, name, *args, **kwargs)
+
+    monkeypatch.setattr(gateway_module._EventTable, "deserialize", counting)
+
+    async def answer(ws, nonce):
+        for index in range(3):
+            await send(ws, chunk(nonce, index, 3))
+
+    async def test(gateway, bot):
+        async for _ in gateway.stream_guild_members(Snowflake(1)):
+            pass
+
+        # The cache is fed from the raw chunks, without waiting on the stream.
+        while await bot.cache.get_member(1, 5) is None:
+            await trio.sleep(0.01)
+
+        assert built == ["guild_members_chunk"] * 3
+
+    run_members(answer, test)
@@ -0,0 +1,48 @@
+import pytest
+from attrs import define, field
+
+from retux.client.resources.abc import Snowflake
+from retux.client.resources.user import User
+from retux.utils.lazy import Lazy, materialize
+
+
+def test_snowflake_equality_agrees_with_hashing():
+    ids = {Snowflake(1), Snowflake("2")}
+
+    assert Snowflake("1") == 1 and hash(Snowflake("1")) == hash(1)
+    assert Snowflake(1) != "1"
+    assert 1 in ids and 2 in ids and "1" not in ids
+    assert str(Snowflake(1)) == repr(Snowflake(1)) == "1"
+
+
+USER = {"id": "2", "username": "user", "discriminator": "0001"}
+
+
+def test_lazy_resources_compare_and_print_as_their_class():
+    lazy = Lazy(User, USER)
+    user = materialize(Lazy(User, USER))
+
+    assert lazy == user and user == lazy
+    assert lazy == Lazy(User, USER)
+    assert lazy != Lazy(User, {**USER, "username": "other"})
+    assert repr(lazy) == repr(user) and str(lazy) == str(user)
+    assert bool(lazy)
+
+    with pytest.raises(TypeError):
+        hash(lazy)
+
+
+@define(kw_only=True)
+class Counted:
+    id: Snowflake = field(converter=Snowflake)
+    count: int = field(init=False, default="3", converter=int)
+    seen: list = field(init=False, factory=list)
+
+
+def test_lazy_resources_give_fields_that_are_not_initialised():
+    lazy = Lazy(Counted, {"id": "1", "count": 5})
+    counted = materialize(Lazy(Counted, {"id": "1"}))
+
+    assert lazy.id == 1 and lazy.count == 3 and lazy.seen == []
+    assert counted.count == 3 and counted.seen == []
+    assert lazy == Counted(id="1") == counted